@@ -2,30 +2,43 @@
 # Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
 
 import argparse
+import copy
 import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
+from typing import Any, Callable
 
+import datasets
 import numpy as np
 import pandas as pd
 from argmaxtools.utils import get_fastest_device, get_logger
 from datasets import load_dataset
 from huggingface_hub import upload_folder
-from pyannote.core import Segment
+from pyannote.core.segment import SEGMENT_PRECISION
+from pydantic import BaseModel, Field
 from tqdm import tqdm
 from transformers import WhisperForConditionalGeneration, WhisperProcessor
 
 from openbench.dataset import DiarizationDataset, DiarizationSample
+from openbench.dataset.dataset_utils import atomic_write
 
 
 logger = get_logger(__name__)
 
+# Seconds per frame of the speaker activity used to compute speaker congestion
+SPEAKER_ACTIVITY_RESOLUTION = 0.1
+
+STATISTICS_CACHE_DIRNAME = "openbench_statistics"
+
 
 def get_overlap_duration(sample: DiarizationSample) -> float:
-    return sample.annotation.get_overlap().duration()
+    return sample.reference.get_overlap().duration()
 
 
 def get_total_speech_duration(sample: DiarizationSample) -> float:
-    return sample.annotation.get_timeline().support().duration()
+    return sample.reference.get_timeline().support().duration()
 
 
 class LanguageDetector:
@@ -37,13 +50,46 @@ class LanguageDetector:
         self.model.to(self.device)
         self.processor = WhisperProcessor.from_pretrained(model_name)
 
+    def crop(self, waveform: np.ndarray, sample_rate: int) -> np.ndarray:
+        return np.asarray(waveform[: int(self.max_duration * sample_rate)], dtype=np.float32)
+
+    def detect_batch(self, waveforms: list[np.ndarray], sample_rate: int) -> list[str]:
+        """Detect the language of several waveforms with a single forward pass.
+
+        The processor pads every crop to the 30 seconds Whisper expects so they stack into one
+        `input_features` batch.
+        """
+        waveforms = [self.crop(waveform, sample_rate) for waveform in waveforms]
+        inputs = self.processor(audio=waveforms, sampling_rate=sample_rate, return_tensors="pt").to(self.device)
+        language_tokens = self.model.detect_language(inputs["input_features"])
+        return [language.strip("<|").strip("|>") for language in self.processor.batch_decode(language_tokens[:, None])]
+
     def __call__(self, sample: DiarizationSample) -> str:
-        sample_rate = sample.sample_rate
-        waveform = sample.waveform
-        waveform = waveform[: int(self.max_duration * sample_rate)]
-        inputs = self.processor(audio=waveform, sampling_rate=sample_rate, return_tensors="pt").to(self.device)
-        language_token = self.model.detect_language(inputs["input_features"])
-        return self.processor.decode(language_token).strip("<|").strip("|>")
+        return self.detect_batch([sample.waveform], sample.sample_rate)[0]
+
+
+def get_speaker_activity(sample: DiarizationSample, resolution: float = SPEAKER_ACTIVITY_RESOLUTION) -> np.ndarray:
+    """Discretize the annotation of a sample into frames of `resolution` seconds.
+
+    Returns a boolean matrix of shape (num_speakers, num_frames) where a frame is active for a speaker
+    if one of its segments overlaps it by more than `SEGMENT_PRECISION`, as `Annotation.crop` does.
+    """
+    labels = sample.reference.labels()
+    tracks = list(sample.reference.itertracks(yield_label=True))
+    starts = np.array([segment.start for segment, _, _ in tracks], dtype=np.float64)
+    ends = np.array([segment.end for segment, _, _ in tracks], dtype=np.float64)
+    speakers = np.array([labels.index(label) for _, _, label in tracks], dtype=np.int64)
+
+    num_frames = math.ceil(max(sample.get_audio_duration(), ends.max(initial=0.0)) / resolution)
+    first_frames = np.clip(np.floor((starts + SEGMENT_PRECISION) / resolution), 0, num_frames).astype(np.int64)
+    last_frames = np.clip(np.ceil((ends - SEGMENT_PRECISION) / resolution), 0, num_frames).astype(np.int64)
+    valid = last_frames > first_frames
+
+    # Difference array: +1 where a segment starts and -1 where it ends, active where the running sum is positive
+    boundaries = np.zeros((len(labels), num_frames + 1), dtype=np.int64)
+    np.add.at(boundaries, (speakers[valid], first_frames[valid]), 1)
+    np.add.at(boundaries, (speakers[valid], last_frames[valid]), -1)
+    return np.cumsum(boundaries[:, :-1], axis=1) > 0
 
 
 def compute_speaker_congestion(
@@ -51,25 +97,34 @@ def compute_speaker_congestion(
     stride: int = 1,
     window_size: int = 10,
     max_speakers: int = 3,
+    speaker_activity: np.ndarray | None = None,
+    resolution: float = SPEAKER_ACTIVITY_RESOLUTION,
 ) -> tuple[float, int, int]:
     """Speaker congestion is defined as the percentage of sliding windows
     of size `window_size` and offset `stride` where the number of active speakers
     is greater than `max_local_speakers`. The higher this number is the harder should be
     the dataset to diarize based on the `max_local_speakers`.
+
+    The number of speakers of every window is obtained at once from cumulative sums of the speaker activity
+    returned by `get_speaker_activity`, which can be given to share it across strides. Results are exact as long
+    as `stride` and `window_size` are multiples of `resolution`.
     """
+    if speaker_activity is None:
+        speaker_activity = get_speaker_activity(sample, resolution)
+
     audio_duration = sample.get_audio_duration()
     padded_audio_duration = math.ceil(audio_duration / stride) * stride
-    num_windows = (padded_audio_duration - window_size) // stride - 1
-    is_congest = np.zeros(num_windows)
-    num_speakers = np.zeros(num_windows)
-
-    for window_idx in range(num_windows):
-        window_timestamp_start = window_idx * stride
-        window_timestamp_end = window_timestamp_start + window_size
-        segment = Segment(window_timestamp_start, window_timestamp_end)
-        num_speakers_window = len(sample.annotation.crop(segment).labels())
-        num_speakers[window_idx] = num_speakers_window
-        is_congest[window_idx] = num_speakers_window > max_speakers
+    num_windows = max((padded_audio_duration - window_size) // stride - 1, 0)
+
+    window_starts = np.rint(np.arange(num_windows) * stride / resolution).astype(np.int64)
+    window_ends = window_starts + round(window_size / resolution)
+    # Number of active frames of each speaker before each frame, windows past the annotation have no activity
+    active_frames = np.cumsum(speaker_activity, axis=1)
+    active_frames = np.concatenate([np.zeros((len(active_frames), 1), dtype=np.int64), active_frames], axis=1)
+    window_starts = np.minimum(window_starts, active_frames.shape[1] - 1)
+    window_ends = np.minimum(window_ends, active_frames.shape[1] - 1)
+    num_speakers = (active_frames[:, window_ends] > active_frames[:, window_starts]).sum(axis=0)
+    is_congest = num_speakers > max_speakers
 
     active_mask = num_speakers > 0
     return (
@@ -79,50 +134,185 @@ def compute_speaker_congestion(
     )
 
 
-def get_sample_info(sample: DiarizationSample, language_detector: LanguageDetector | None = None) -> dict[str, float]:
+def get_speech_info(sample: DiarizationSample) -> dict[str, Any]:
     audio_duration = sample.get_audio_duration()
-    overlap_duration = get_overlap_duration(sample)
     total_speech_duration_without_overlap = get_total_speech_duration(sample)
+    return {
+        "audio_name": sample.audio_name,
+        "overlap_duration": get_overlap_duration(sample),
+        "total_speech_duration": total_speech_duration_without_overlap,
+        "silence_duration": max(0, audio_duration - total_speech_duration_without_overlap),
+        "audio_duration": audio_duration,
+        "num_speakers": len(sample.reference.labels()),
+    }
+
+
+def get_speaker_congestion_info(sample: DiarizationSample) -> dict[str, Any]:
+    # Discretized once and shared by all strides
+    speaker_activity = get_speaker_activity(sample)
     (
         speaker_congestion,
         num_windows,
         median_num_speakers_per_window,
-    ) = compute_speaker_congestion(sample=sample)
-    speaker_congestion_stride_2, _, _ = compute_speaker_congestion(sample=sample, stride=2)
-    speaker_congestion_stride_4, _, _ = compute_speaker_congestion(sample=sample, stride=4)
-    speaker_congestion_stride_5, _, _ = compute_speaker_congestion(sample=sample, stride=5)
-    speaker_congestion_stride_10, _, _ = compute_speaker_congestion(sample=sample, stride=10)
+    ) = compute_speaker_congestion(sample=sample, speaker_activity=speaker_activity)
     info = {
-        "audio_name": sample.audio_name,
-        "overlap_duration": overlap_duration,
-        "total_speech_duration": total_speech_duration_without_overlap,
-        "silence_duration": max(0, audio_duration - total_speech_duration_without_overlap),
-        "audio_duration": audio_duration,
-        "num_speakers": len(sample.annotation.labels()),
         "speaker_congestion": speaker_congestion,
         "speaker_congestion_windows": num_windows,
         "median_num_speakers_per_window": median_num_speakers_per_window,
-        "speaker_congestion_stride_2": speaker_congestion_stride_2,
-        "speaker_congestion_stride_4": speaker_congestion_stride_4,
-        "speaker_congestion_stride_5": speaker_congestion_stride_5,
-        "speaker_congestion_stride_10": speaker_congestion_stride_10,
     }
+    for stride in [2, 4, 5, 10]:
+        info[f"speaker_congestion_stride_{stride}"], _, _ = compute_speaker_congestion(
+            sample=sample, stride=stride, speaker_activity=speaker_activity
+        )
+    return info
+
+
+class SampleStatistic(BaseModel):
+    columns: list[str] = Field(..., description="The columns returned by `compute`")
+    compute: Callable[[DiarizationSample], dict[str, Any]] = Field(
+        ..., description="Function computing the statistic columns of a sample"
+    )
+
+
+# Statistics computed for every sample, in the order of the columns of the dataset info. Adding an entry only
+# computes its columns for datasets whose other statistics are already cached.
+SAMPLE_STATISTICS: dict[str, SampleStatistic] = {
+    "speech": SampleStatistic(
+        columns=[
+            "audio_name",
+            "overlap_duration",
+            "total_speech_duration",
+            "silence_duration",
+            "audio_duration",
+            "num_speakers",
+        ],
+        compute=get_speech_info,
+    ),
+    "speaker_congestion": SampleStatistic(
+        columns=[
+            "speaker_congestion",
+            "speaker_congestion_windows",
+            "median_num_speakers_per_window",
+            "speaker_congestion_stride_2",
+            "speaker_congestion_stride_4",
+            "speaker_congestion_stride_5",
+            "speaker_congestion_stride_10",
+        ],
+        compute=get_speaker_congestion_info,
+    ),
+}
+
+
+def get_sample_info(sample: DiarizationSample, language_detector: LanguageDetector | None = None) -> dict[str, float]:
+    info = {}
+    for statistic in SAMPLE_STATISTICS.values():
+        info.update(statistic.compute(sample))
     if language_detector is not None:
         info["language"] = language_detector(sample)
     return info
 
 
-def get_dataset_info(dataset: DiarizationDataset, language_detector: LanguageDetector | None = None) -> pd.DataFrame:
-    return (
-        pd.DataFrame(
-            [
-                get_sample_info(sample, language_detector)
-                for sample in tqdm(dataset, desc="Getting dataset info", total=len(dataset))
-            ]
-        )
-        .reset_index()
-        .rename(columns={"index": "sample_id"})
-    )
+def get_statistics_cache_path(fingerprint: str) -> Path:
+    """Path of the per-sample statistics of a dataset, next to the HuggingFace datasets cache.
+
+    The fingerprint of the underlying HuggingFace dataset makes sure statistics are never reused for a
+    different version of the data.
+    """
+    return Path(datasets.config.HF_DATASETS_CACHE) / STATISTICS_CACHE_DIRNAME / f"{fingerprint}.parquet"
+
+
+# Dataset of the worker processes, set once per process by `_init_worker` instead of being sent with every task
+_worker_dataset: DiarizationDataset | None = None
+
+
+def _init_worker(dataset: DiarizationDataset) -> None:
+    global _worker_dataset
+    # Samples hold a `LazyWaveform`: statistics only need the reference, read without the audio as in
+    # `get_reference`, and the duration, read from the audio header as in `get_audio_duration`
+    _worker_dataset = copy.copy(dataset)
+    _worker_dataset.lazy_audio = True
+
+
+def _compute_sample_info(
+    idx: int, statistic_names: list[str], language_crop_duration: float | None
+) -> tuple[dict[str, Any], np.ndarray | None, int]:
+    """Compute the given statistics of a sample of the worker dataset.
+
+    The start of the waveform is returned as well if `language_crop_duration` is set so that language
+    detection can be batched in the main process. Only this start is decoded, the rest of the audio never is.
+    """
+    sample = _worker_dataset[idx]
+    info = {}
+    for name in statistic_names:
+        info.update(SAMPLE_STATISTICS[name].compute(sample))
+    crop = None
+    if language_crop_duration is not None:
+        crop = np.asarray(sample.waveform[: int(language_crop_duration * sample.sample_rate)], dtype=np.float32)
+    return info, crop, sample.sample_rate
+
+
+def get_dataset_info(
+    dataset: DiarizationDataset,
+    language_detector: LanguageDetector | None = None,
+    num_workers: int | None = None,
+    batch_size: int = 16,
+    use_cache: bool = True,
+) -> pd.DataFrame:
+    """Compute the statistics of every sample of a dataset across `num_workers` processes.
+
+    Statistics are cached per dataset fingerprint so that only the statistics missing from the cache,
+    e.g. a newly added entry of `SAMPLE_STATISTICS`, are computed when running again. Languages are
+    detected in batches of `batch_size` samples.
+    """
+    cache_path = get_statistics_cache_path(dataset.ds._fingerprint)
+    if use_cache and cache_path.exists():
+        dataset_info = pd.read_parquet(cache_path)
+        logger.info(f"Loaded cached statistics with columns {dataset_info.columns.tolist()} from {cache_path}")
+    else:
+        dataset_info = pd.DataFrame({"sample_id": range(len(dataset))})
+
+    missing_statistics = [
+        name
+        for name, statistic in SAMPLE_STATISTICS.items()
+        if not set(statistic.columns).issubset(dataset_info.columns)
+    ]
+    detect_language = language_detector is not None and "language" not in dataset_info.columns
+    if missing_statistics or detect_language:
+        logger.info(f"Computing statistics {missing_statistics} (language detection: {detect_language})")
+        crop_duration = language_detector.max_duration if detect_language else None
+        task = partial(_compute_sample_info, statistic_names=missing_statistics, language_crop_duration=crop_duration)
+        num_workers = max(1, min(num_workers or os.cpu_count() or 1, len(dataset)))
+
+        rows, languages, crops = [], [], []
+        batch_sample_rate = None
+        with ProcessPoolExecutor(num_workers, initializer=_init_worker, initargs=(dataset,)) as executor:
+            results = executor.map(task, range(len(dataset)), chunksize=max(1, len(dataset) // (4 * num_workers)))
+            for info, crop, sample_rate in tqdm(results, desc="Getting dataset info", total=len(dataset)):
+                rows.append(info)
+                if crop is None:
+                    continue
+                # A batch holds crops of a single sample rate since they are featurized together
+                if crops and (len(crops) == batch_size or sample_rate != batch_sample_rate):
+                    languages.extend(language_detector.detect_batch(crops, batch_sample_rate))
+                    crops = []
+                crops.append(crop)
+                batch_sample_rate = sample_rate
+        if crops:
+            languages.extend(language_detector.detect_batch(crops, batch_sample_rate))
+
+        dataset_info = dataset_info.assign(**pd.DataFrame(rows, index=dataset_info.index))
+        if detect_language:
+            dataset_info["language"] = languages
+
+    columns = ["sample_id"] + [column for statistic in SAMPLE_STATISTICS.values() for column in statistic.columns]
+    columns += [column for column in dataset_info.columns if column not in columns]
+    dataset_info = dataset_info[columns]
+    if use_cache:
+        atomic_write(cache_path, lambda tmp_path: dataset_info.to_parquet(tmp_path, index=False))
+
+    if language_detector is None:
+        return dataset_info.drop(columns=["language"], errors="ignore")
+    return dataset_info
 
 
 def aggregate_dataset_info(dataset_info: pd.DataFrame) -> pd.DataFrame:
@@ -133,9 +323,11 @@ def aggregate_dataset_info(dataset_info: pd.DataFrame) -> pd.DataFrame:
         .assign(
             overlap_duration=lambda df: 100 * df["overlap_duration"] / df["audio_duration"].sum(),
             silence_duration=lambda df: 100 * df["silence_duration"] / df["audio_duration"].sum(),
-            speaker_congestion=lambda df: 100
-            * (df["speaker_congestion"] * df["speaker_congestion_windows"])
-            / df["speaker_congestion_windows"].sum(),
+            speaker_congestion=lambda df: (
+                100
+                * (df["speaker_congestion"] * df["speaker_congestion_windows"])
+                / df["speaker_congestion_windows"].sum()
+            ),
             has_congestion=lambda df: 100 * df["speaker_congestion"].gt(0).div(len(df)),
         )
         .pipe(lambda df: df.join(pd.get_dummies(df["language"]).astype(int)))
@@ -194,6 +386,8 @@ def main(
     subset: str | None = None,
     output_dir: str = "dataset_statistics",
     repo_id: str = "argmaxinc/interspeech-artifacts",
+    num_workers: int | None = None,
+    batch_size: int = 16,
 ) -> None:
     output_dir = Path(output_dir)
     agg_data_dir = output_dir / "agg_info"
@@ -219,7 +413,7 @@ def main(
             dataset = DiarizationDataset(raw_dataset[split])
             logger.info(f"Dataset loaded with {len(dataset)} samples")
 
-            dataset_info = get_dataset_info(dataset, language_detector)
+            dataset_info = get_dataset_info(dataset, language_detector, num_workers=num_workers, batch_size=batch_size)
             logger.info(f"Dataset info collected with {len(dataset_info)} samples")
             dataset_agg_info = aggregate_dataset_info(dataset_info)
             logger.info(f"Dataset agg info collected with {len(dataset_agg_info)} samples")
@@ -244,6 +438,8 @@ if __name__ == "__main__":
     parser.add_argument("--subset", type=str, required=False, default=None)
     parser.add_argument("--output-dir", type=str, required=False, default="dataset_statistics")
     parser.add_argument("--repo-id", type=str, required=False, default="argmaxinc/interspeech-artifacts")
+    parser.add_argument("--num-workers", type=int, required=False, default=None)
+    parser.add_argument("--batch-size", type=int, required=False, default=16)
 
     args = parser.parse_args()
     main(
@@ -251,4 +447,6 @@ if __name__ == "__main__":
         subset=args.subset,
         output_dir=args.output_dir,
         repo_id=args.repo_id,
+        num_workers=args.num_workers,
+        batch_size=args.batch_size,
     )
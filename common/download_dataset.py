@@ -2,21 +2,25 @@
 # Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
 
 import argparse
+import hashlib
 import json
 import os
 import shutil
 import subprocess
 import tarfile
+import threading
 import time
 import warnings
 import zipfile
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from functools import wraps
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 import datasets
 import gdown  # Used for MSDWild dataset
+import numpy as np
 import pandas as pd
 import requests
 from argmaxtools.utils import get_logger
@@ -30,6 +34,8 @@ from scipy.io import wavfile
 from textgrid import TextGrid
 from tqdm import tqdm
 
+from openbench.dataset.dataset_utils import atomic_write
+
 
 logger = get_logger(__name__)
 
@@ -118,30 +124,150 @@ def retry(max_retries: int = 5, backoff_factor: int = 2, exceptions: tuple = (Ex
     return decorator
 
 
+MANIFEST_FILENAME = "download_manifest.json"
+MAX_DOWNLOAD_WORKERS = 8
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+
+def compute_sha256(path: str | Path) -> str:
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(DOWNLOAD_CHUNK_SIZE):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+class DownloadManifest:
+    """Record of the completed downloads of a dataset, persisted as JSON after every completed file.
+
+    Each entry maps the output path to the source url, the size and the sha256 of the downloaded file,
+    so that a restarted download skips the files that were fully downloaded and verified.
+    """
+
+    def __init__(self, path: str | Path = MANIFEST_FILENAME) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.entries: dict[str, dict[str, Any]] = load_json(self.path) if self.path.exists() else {}
+
+    def is_complete(self, output_filename: str, expected_sha256: str | None = None) -> bool:
+        """Whether the file was downloaded and still has the recorded size and, if given, the expected sha256."""
+        entry = self.entries.get(str(output_filename))
+        output_path = Path(output_filename)
+        if entry is None or not output_path.exists() or output_path.stat().st_size != entry["size"]:
+            return False
+        return expected_sha256 is None or entry["sha256"] == expected_sha256
+
+    def add(self, url: str, output_filename: str, sha256: str) -> None:
+        with self._lock:
+            self.entries[str(output_filename)] = {
+                "url": url,
+                "size": Path(output_filename).stat().st_size,
+                "sha256": sha256,
+            }
+            # An interrupted write never corrupts the manifest
+            atomic_write(self.path, lambda tmp_path: tmp_path.write_text(json.dumps(self.entries, indent=2)))
+
+
+class DownloadTask(BaseModel):
+    url: str = Field(..., description="The url to download from")
+    output_filename: str = Field(..., description="The path to download to")
+    sha256: str | None = Field(None, description="The expected sha256 of the file, verified after download")
+
+
 @retry()
-def download_file(url: str, output_filename: str) -> None:
-    # First check if file already exists
-    if Path(output_filename).exists():
+def download_file(
+    url: str,
+    output_filename: str,
+    expected_sha256: str | None = None,
+    manifest: DownloadManifest | None = None,
+    show_progress: bool = True,
+) -> None:
+    """Download a file, resuming a previous partial download with an HTTP range request if possible.
+
+    The data is written to `<output_filename>.part` and moved to `output_filename` only once complete and
+    verified against `expected_sha256` if given. Completed downloads are recorded in `manifest` if given.
+    """
+    output_path = Path(output_filename)
+    if manifest is not None and manifest.is_complete(output_filename, expected_sha256):
+        logger.info(f"File {output_filename} already downloaded, skipping download...")
+        return
+    # Files downloaded before the manifest existed are trusted as is
+    if output_path.exists() and (manifest is None or str(output_filename) not in manifest.entries):
         logger.info(f"File {output_filename} already exists, skipping download...")
+        if manifest is not None:
+            manifest.add(url, output_filename, compute_sha256(output_path))
         return
 
-    response = requests.get(url, stream=True)
-    response.raise_for_status()
-    total_mb = int(response.headers.get("content-length", 0)) / 1024 / 1024
-    chunk_size = 8192
-    chunk_size_mb = chunk_size / 1024 / 1024
-    logger.info(f"Downloading {output_filename} from {url} ({total_mb:.2f} MB)")
-    with tqdm(
-        total=total_mb,
-        unit="MB",
-        desc=f"Downloading {output_filename}",
-        unit_scale=True,
-        unit_divisor=1024,
-    ) as pbar:
-        with open(output_filename, "wb") as f:
-            for chunk in response.iter_content(chunk_size=chunk_size):
-                f.write(chunk)
-                pbar.update(chunk_size_mb)
+    part_path = output_path.with_name(output_path.name + ".part")
+    resume_from = part_path.stat().st_size if part_path.exists() else 0
+    headers = {"Range": f"bytes={resume_from}-"} if resume_from else {}
+    response = requests.get(url, stream=True, headers=headers, timeout=60)
+    if response.status_code == 416:
+        # The partial file is already complete
+        response.close()
+    else:
+        response.raise_for_status()
+        if resume_from and response.status_code != 206:
+            logger.info(f"Server does not support resuming {url}, restarting download of {output_filename}")
+            resume_from = 0
+        total_mb = (int(response.headers.get("content-length", 0)) + resume_from) / 1024 / 1024
+        logger.info(f"Downloading {output_filename} from {url} ({total_mb:.2f} MB, resuming at {resume_from} bytes)")
+        with tqdm(
+            total=total_mb,
+            initial=resume_from / 1024 / 1024,
+            unit="MB",
+            desc=f"Downloading {output_filename}",
+            unit_scale=True,
+            unit_divisor=1024,
+            disable=not show_progress,
+        ) as pbar:
+            with open(part_path, "ab" if resume_from else "wb") as f:
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+                    pbar.update(len(chunk) / 1024 / 1024)
+
+    sha256 = compute_sha256(part_path)
+    if expected_sha256 is not None and sha256 != expected_sha256:
+        # Start over on the next attempt as the partial data cannot be trusted
+        part_path.unlink()
+        raise ValueError(f"Checksum mismatch for {output_filename}: expected {expected_sha256}, got {sha256}")
+    part_path.replace(output_path)
+    if manifest is not None:
+        manifest.add(url, output_filename, sha256)
+
+
+def download_files(
+    tasks: list[DownloadTask],
+    max_workers: int = MAX_DOWNLOAD_WORKERS,
+    manifest: DownloadManifest | None = None,
+) -> list[DownloadTask]:
+    """Download files concurrently with at most `max_workers` downloads in flight.
+
+    Each file is downloaded with `download_file` so it is retried, resumed and verified independently.
+    A manifest in the current directory is used by default so an interrupted run restarts where it stopped.
+
+    Returns:
+        The tasks that failed after exhausting their retries
+    """
+    manifest = manifest or DownloadManifest()
+    failed = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                download_file, task.url, task.output_filename, task.sha256, manifest, show_progress=False
+            ): task
+            for task in tasks
+        }
+        for future in tqdm(as_completed(futures), total=len(futures), desc="Downloading files"):
+            task = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"Failed to download {task.url} to {task.output_filename}: {e}")
+                failed.append(task)
+    if failed:
+        logger.error(f"{len(failed)} out of {len(tasks)} downloads failed, run again to resume them")
+    return failed
 
 
 def load_json(path: str) -> dict:
@@ -225,6 +351,80 @@ class AwsProfileInfo(BaseModel):
         self.write_config()
 
 
+# Segments shorter than this are considered empty and dropped, as done by `pyannote.core.Segment`
+SEGMENT_PRECISION = 1e-6
+
+# Optional columns of `SpeakerDiarizationData` given per sample rather than parsed from files
+IN_MEMORY_COLUMNS = ["transcript", "word_speakers", "word_timestamps"]
+
+
+def parse_rttm_file(rttm_file: str) -> tuple[list[float], list[float], list[str]]:
+    """Parse the speaker turns of an RTTM file with a single recording.
+
+    Equivalent to iterating over the annotation returned by `pyannote.database.util.load_rttm` but parses the
+    file in a single vectorized pass instead of building the annotation turn by turn. Turns are sorted by
+    (start, end) with ties broken by the string of their line number as in `Annotation.itertracks`.
+    """
+    # RTTM fields: type, uri, channel, start, duration, ortho, stype, speaker, conf, slat
+    table = np.loadtxt(rttm_file, dtype=str, usecols=(0, 1, 3, 4, 7), ndmin=2, comments=None)
+    kinds, uris, starts, durations, speakers = table.T
+    if len(np.unique(uris)) != 1:
+        raise ValueError(f"RTTM file {rttm_file} has more than one or no annotations")
+
+    line_numbers = np.flatnonzero(kinds == "SPEAKER")
+    starts = starts[line_numbers].astype(np.float64)
+    ends = starts + durations[line_numbers].astype(np.float64)
+    speakers = speakers[line_numbers]
+
+    keep = ends - starts > SEGMENT_PRECISION
+    line_numbers, starts, ends, speakers = line_numbers[keep], starts[keep], ends[keep], speakers[keep]
+    order = np.lexsort((line_numbers.astype(str), ends, starts))
+    return starts[order].tolist(), ends[order].tolist(), speakers[order].tolist()
+
+
+def parse_uem_file(uem_file: str) -> list[tuple[float, float]]:
+    """Parse the scored regions of a UEM file with a single recording.
+
+    Equivalent to iterating over the timeline returned by `pyannote.database.util.load_uem`: regions are
+    deduplicated, empty regions are dropped and the rest are sorted by (start, end).
+    """
+    # UEM fields: uri, channel, start, end
+    table = np.loadtxt(uem_file, dtype=str, usecols=(0, 2, 3), ndmin=2, comments=None)
+    uris, starts, ends = table.T
+    if len(np.unique(uris)) != 1:
+        raise ValueError(f"UEM file {uem_file} has more than one or no annotations")
+
+    regions = np.unique(np.stack([starts.astype(np.float64), ends.astype(np.float64)], axis=1), axis=0)
+    regions = regions[regions[:, 1] - regions[:, 0] > SEGMENT_PRECISION]
+    return [(start, end) for start, end in regions.tolist()]
+
+
+def generate_diarization_samples(shards: list[list[dict[str, Any]]]) -> Iterator[dict[str, Any]]:
+    """Generate the samples of a diarization dataset, parsing their annotations on the fly.
+
+    Used as a `datasets.Dataset.from_generator` generator so that each worker process parses and writes
+    its own shards without ever holding the whole dataset in memory.
+    """
+    for shard in shards:
+        for row in shard:
+            row = dict(row)
+            rttm_path = row.pop("rttm_path")
+            uem_path = row.pop("uem_path")
+            # Only used to invalidate the cached dataset when the annotations change
+            row.pop("annotation_stats")
+            timestamps_start, timestamps_end, speakers = parse_rttm_file(rttm_path)
+            sample = {
+                "audio": row.pop("audio"),
+                "timestamps_start": timestamps_start,
+                "timestamps_end": timestamps_end,
+                "speakers": speakers,
+                **row,
+            }
+            if uem_path is not None:
+                sample["uem_timestamps"] = parse_uem_file(uem_path)
+            yield sample
+
+
 class SpeakerDiarizationData(BaseModel):
     split: str = Field(..., description="The split of the dataset")
     split: str = Field(..., description="The split of the dataset")
@@ -325,6 +525,8 @@ class SpeakerDiarizationData(BaseModel):
 
 class SpeakerDiarizationDataset(ABC):
     sample_rate: int = 16_000
+    max_download_workers: int = MAX_DOWNLOAD_WORKERS
+    num_build_workers: int = os.cpu_count() or 1
 
     def __init__(self, org_name: str = "argmaxinc") -> None:
         self.org_name = org_name
@@ -353,70 +555,64 @@ class SpeakerDiarizationDataset(ABC):
         """
         pass
 
-    def process_rttm_file(self, rttm_file: str) -> tuple[list[float], list[float], list[str | int]]:
-        logger.info(f"Processing RTTM file {rttm_file}")
-        rttm_data: dict[str, Annotation] = load_rttm(rttm_file)
-        if len(rttm_data) > 1 or len(rttm_data) == 0:
-            raise ValueError(f"RTTM file {rttm_file} has more than one or no annotations")
-        annotation_uri = list(rttm_data.keys())[0]
-        annotation: Annotation = rttm_data[annotation_uri]
-        timestamps_start = []
-        timestamps_end = []
-        speakers = []
-        for segment, _, label in annotation.itertracks(yield_label=True):
-            timestamps_start.append(segment.start)
-            timestamps_end.append(segment.end)
-            speakers.append(label)
-        return timestamps_start, timestamps_end, speakers
-
-    def process_uem_file(self, uem_file: str) -> list[tuple[float, float]]:
-        logger.info(f"Processing UEM file {uem_file}")
-        uem_data: dict[str, Timeline] = load_uem(uem_file)
-        uem_timestamps: list[tuple[float, float]] = []
-        if len(uem_data) > 1 or len(uem_data) == 0:
-            raise ValueError(f"UMEM file {uem_file} has more than one or no annotations")
-        uem_uri = list(uem_data.keys())[0]
-        uem: Timeline = uem_data[uem_uri]
-        for segment in uem:
-            uem_timestamps.append((segment.start, segment.end))
-
-        return uem_timestamps
+    def get_split_features(self, split_data: SpeakerDiarizationData) -> datasets.Features:
+        features = datasets.Features(
+            audio=datasets.Audio(sampling_rate=self.sample_rate),
+            timestamps_start=datasets.Sequence(datasets.Value("float64")),
+            timestamps_end=datasets.Sequence(datasets.Value("float64")),
+            speakers=datasets.Sequence(datasets.Value("string")),
+        )
+        # The types of the columns provided in memory are inferred the same way `Dataset.from_dict` does
+        for column, values in (split_data.metadata or {}).items():
+            features[column] = datasets.Dataset.from_dict({column: values}).features[column]
+        if split_data.uem_paths is not None:
+            features["uem_timestamps"] = datasets.Sequence(datasets.Sequence(datasets.Value("float64")))
+        for column in IN_MEMORY_COLUMNS:
+            if getattr(split_data, column) is not None:
+                values = getattr(split_data, column)
+                features[column] = datasets.Dataset.from_dict({column: values}).features[column]
+        return features
 
     def build_dataset(self, data: dict[str, SpeakerDiarizationData]) -> datasets.DatasetDict:
+        """Build the dataset by parsing the annotations across `num_build_workers` processes.
+
+        Each process parses a subset of the shards of a split and writes them to Arrow incrementally, so memory
+        stays flat regardless of the number of recordings.
+        """
         dataset_dict = {}
         for split, split_data in data.items():
-            audio_paths = split_data.audio_paths
-            timestamps_start, timestamps_end, speakers = [], [], []
-            for rttm_file in split_data.annotation_paths:
-                _timestamps_start, _timestamps_end, _speakers = self.process_rttm_file(rttm_file)
-                timestamps_start.append(_timestamps_start)
-                timestamps_end.append(_timestamps_end)
-                speakers.append(_speakers)
-
-            metadata = split_data.metadata or {}
-            dataset_entry = dict(
-                audio=audio_paths,
-                timestamps_start=timestamps_start,
-                timestamps_end=timestamps_end,
-                speakers=speakers,
-                **metadata,
-            )
-
-            if split_data.uem_paths is not None:
-                uem_timestamps = [self.process_uem_file(uem_path) for uem_path in split_data.uem_paths]
-                dataset_entry["uem_timestamps"] = uem_timestamps
-
-            if split_data.transcript is not None:
-                dataset_entry["transcript"] = split_data.transcript
-
-            if split_data.word_speakers is not None:
-                dataset_entry["word_speakers"] = split_data.word_speakers
-
-            if split_data.word_timestamps is not None:
-                dataset_entry["word_timestamps"] = split_data.word_timestamps
-
-            dataset_dict[split] = datasets.Dataset.from_dict(dataset_entry).cast_column(
-                "audio", datasets.Audio(sampling_rate=self.sample_rate)
+            num_samples = len(split_data.audio_paths)
+            uem_paths = split_data.uem_paths or [None] * num_samples
+            rows = []
+            for idx, (audio_path, rttm_path, uem_path) in enumerate(
+                zip(split_data.audio_paths, split_data.annotation_paths, uem_paths)
+            ):
+                row = {
+                    "audio": audio_path,
+                    "rttm_path": rttm_path,
+                    "uem_path": uem_path,
+                    "annotation_stats": [
+                        (os.stat(path).st_mtime_ns, os.stat(path).st_size) for path in [rttm_path, uem_path] if path
+                    ],
+                }
+                row.update({column: values[idx] for column, values in (split_data.metadata or {}).items()})
+                for column in IN_MEMORY_COLUMNS:
+                    if getattr(split_data, column) is not None:
+                        row[column] = getattr(split_data, column)[idx]
+                rows.append(row)
+
+            # Several shards per worker so that workers stay busy when recordings differ in length
+            num_workers = max(1, min(self.num_build_workers, num_samples))
+            num_shards = max(1, min(num_samples, 4 * num_workers))
+            # Contiguous shards so that the samples keep their order once the shards are concatenated
+            shard_bounds = np.linspace(0, num_samples, num_shards + 1).astype(int)
+            shards = [rows[start:end] for start, end in zip(shard_bounds[:-1], shard_bounds[1:])]
+            logger.info(f"Building {split} split with {num_samples} samples across {num_workers} workers")
+            dataset_dict[split] = datasets.Dataset.from_generator(
+                generate_diarization_samples,
+                features=self.get_split_features(split_data),
+                gen_kwargs={"shards": shards},
+                num_proc=num_workers if num_workers > 1 else None,
             )
 
         return datasets.DatasetDict(dataset_dict)
@@ -888,14 +1084,18 @@ class AmericanLifeDataset(SpeakerDiarizationDataset):
     def _download_audio(self) -> None:
         audio_dir = Path("audio")
         audio_dir.mkdir(parents=True, exist_ok=True)
-        episodes = self._get_episode_to_download()
-        for episode in episodes:
-            audio_url = self._get_audio_url(episode)
+        episodes = sorted(self._get_episode_to_download())
+        # Resolving the audio urls requires fetching each episode page so it is done concurrently as well
+        with ThreadPoolExecutor(max_workers=self.max_download_workers) as executor:
+            audio_urls = list(executor.map(self._get_audio_url, episodes))
+
+        tasks = []
+        for episode, audio_url in zip(episodes, audio_urls):
             if audio_url is None:
                 logger.info(f"No download link found for episode {episode}...")
                 continue
-            audio_file_path = audio_dir / f"episode_{episode}.mp3"
-            download_file(audio_url, str(audio_file_path))
+            tasks.append(DownloadTask(url=audio_url, output_filename=str(audio_dir / f"episode_{episode}.mp3")))
+        download_files(tasks, max_workers=self.max_download_workers)
 
     def _download_annotations(self) -> None:
         annot_dir = Path("kaggle_annotations")
@@ -995,10 +1195,14 @@ class AVAAvdDataset(SpeakerDiarizationDataset):
         videos_dir.mkdir(parents=True, exist_ok=True)
         video_ids = load_list(str(self.splits_dir / "video.list"))
 
-        for i, video in enumerate(video_ids):
-            logger.info(f"Downloading {video}[{i + 1}]/[{len(video_ids)}]")
-            cmd = f"wget -P {str(videos_dir)} https://s3.amazonaws.com/ava-dataset/trainval/{video.strip()}"
-            subprocess.call(cmd, shell=True)
+        tasks = [
+            DownloadTask(
+                url=f"https://s3.amazonaws.com/ava-dataset/trainval/{video.strip()}",
+                output_filename=str(videos_dir / video.strip()),
+            )
+            for video in video_ids
+        ]
+        download_files(tasks, max_workers=self.max_download_workers)
 
     # Adapted from https://github.com/showlab/AVA-AVD/blob/main/dataset/scripts/download.py#L13
     def _download_annotations(self) -> None:
@@ -1495,7 +1699,9 @@ class Ego4dDataset(SpeakerDiarizationDataset):
         return data
 
 
-def main(dataset_name: str, generate_only: bool, hf_repo_owner: str) -> None:
+def main(
+    dataset_name: str, generate_only: bool, hf_repo_owner: str, max_download_workers: int = MAX_DOWNLOAD_WORKERS
+) -> None:
     if dataset_name == "earnings21":
         ds = Earnings21Dataset(hf_repo_owner)
     elif dataset_name == "msdwild":
@@ -1519,6 +1725,7 @@ def main(dataset_name: str, generate_only: bool, hf_repo_owner: str) -> None:
     else:
         raise ValueError(f"Unknown dataset name: {dataset_name}")
 
+    ds.max_download_workers = max_download_workers
     if generate_only:
         ds.generate()
     else:
@@ -1552,5 +1759,12 @@ if __name__ == "__main__":
         default="argmaxinc",
         help="The organization to push the dataset to",
     )
+    parser.add_argument(
+        "--max-download-workers",
+        type=int,
+        required=False,
+        default=MAX_DOWNLOAD_WORKERS,
+        help="The maximum number of files downloaded concurrently",
+    )
     args = parser.parse_args()
-    main(args.dataset_name, args.generate_only, args.hf_repo_owner)
+    main(args.dataset_name, args.generate_only, args.hf_repo_owner, args.max_download_workers)
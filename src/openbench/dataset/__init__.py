@@ -2,8 +2,11 @@
 # Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
 
 # ruff: noqa
+from .audio_input import AudioInputSpec
 from .dataset_base import BaseDataset, BaseSample, DatasetConfig
 from .dataset_diarization import DiarizationDataset, DiarizationSample
+from .dataset_index import DatasetIndex
+from .lazy_audio import LazyWaveform, iter_audio_chunks
 from .dataset_orchestration import OrchestrationDataset, OrchestrationSample
 from .dataset_registry import DatasetRegistry
 from .dataset_streaming_transcription import StreamingDataset, StreamingSample
@@ -19,6 +22,7 @@ __all__ = [
     "BaseSample",
     "BaseDataset",
     "DatasetConfig",
+    "DatasetIndex",
     # Dataset implementations
     "DiarizationDataset",
     "TranscriptionDataset",
@@ -31,4 +35,8 @@ __all__ = [
     "OrchestrationSample",
     # Registry
     "DatasetRegistry",
+    # Audio
+    "AudioInputSpec",
+    "LazyWaveform",
+    "iter_audio_chunks",
 ]
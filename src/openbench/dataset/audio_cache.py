@@ -0,0 +1,99 @@
+# For licensing see accompanying LICENSE.md file.
+# Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
+
+"""Content-addressed cache of audio files for pipelines that take a file path as input."""
+
+import hashlib
+import os
+import shutil
+from pathlib import Path
+
+import datasets
+import numpy as np
+import soundfile as sf
+from argmaxtools.utils import get_logger
+
+from .dataset_utils import atomic_write
+from .lazy_audio import LazyWaveform, iter_audio_chunks
+
+
+logger = get_logger(__name__)
+
+AUDIO_CACHE_DIRNAME = "openbench_audio"
+
+# Size of the blocks read when hashing an encoded audio file
+HASH_BLOCK_SIZE = 1 << 20
+
+
+def get_audio_cache_dir() -> Path:
+    """Directory where cached audio files are stored, next to the HuggingFace datasets cache."""
+    return Path(datasets.config.HF_DATASETS_CACHE) / AUDIO_CACHE_DIRNAME
+
+
+def hash_waveform(waveform: np.ndarray | LazyWaveform, sample_rate: int) -> str:
+    """Hash the content of a waveform along with its sample rate.
+
+    Lazy waveforms are hashed from their encoded source so that they are never decoded.
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(f"{sample_rate}".encode())
+    if isinstance(waveform, LazyWaveform):
+        hasher.update(b"encoded")
+        if isinstance(waveform.source, bytes):
+            hasher.update(waveform.source)
+        else:
+            with open(waveform.source, "rb") as f:
+                while block := f.read(HASH_BLOCK_SIZE):
+                    hasher.update(block)
+    else:
+        waveform = np.ascontiguousarray(waveform)
+        hasher.update(f"{waveform.dtype.str}{waveform.shape}".encode())
+        hasher.update(memoryview(waveform).cast("B"))
+    return hasher.hexdigest()
+
+
+def get_source_wav_path(waveform: np.ndarray | LazyWaveform, sample_rate: int) -> Path | None:
+    """Get the path of the file a waveform is read from if it can be used as is i.e. a mono WAV file."""
+    if not isinstance(waveform, LazyWaveform) or not isinstance(waveform.source, str):
+        return None
+    info = sf.info(waveform.source)
+    if info.format == "WAV" and info.channels == 1 and info.samplerate == sample_rate:
+        return Path(waveform.source)
+    return None
+
+
+def get_cached_audio_file(waveform: np.ndarray | LazyWaveform, sample_rate: int) -> Path:
+    """Get a WAV file with the given audio, writing it to the cache only if it is not there yet."""
+    cache_path = get_audio_cache_dir() / f"{hash_waveform(waveform, sample_rate)}.wav"
+    if cache_path.exists():
+        return cache_path
+
+    def write(tmp_path: Path) -> None:
+        if isinstance(waveform, LazyWaveform):
+            # Write chunk by chunk so the whole waveform is never decoded at once
+            with sf.SoundFile(tmp_path, mode="w", samplerate=sample_rate, channels=1, format="WAV") as f:
+                for chunk in iter_audio_chunks(waveform, waveform.chunk_size):
+                    f.write(chunk)
+        else:
+            sf.write(tmp_path, waveform, sample_rate, format="WAV")
+
+    atomic_write(cache_path, write)
+    logger.debug(f"Cached audio file at {cache_path}")
+    return cache_path
+
+
+def link_audio_file(source_path: Path, output_path: Path) -> Path:
+    """Make `source_path` available at `output_path` without copying it if possible.
+
+    A hardlink is tried first, then a symlink (e.g. across filesystems) and finally a copy. Either way
+    `output_path` can be deleted without affecting `source_path`.
+    """
+    output_path.unlink(missing_ok=True)
+    try:
+        os.link(source_path, output_path)
+    except OSError:
+        try:
+            output_path.symlink_to(source_path.resolve())
+        except OSError:
+            shutil.copyfile(source_path, output_path)
+    return output_path
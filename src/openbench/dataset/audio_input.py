@@ -0,0 +1,105 @@
+# For licensing see accompanying LICENSE.md file.
+# Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
+
+"""Audio format required by a pipeline and conversion of dataset audio to that format."""
+
+from math import gcd
+from pathlib import Path
+from typing import Literal
+
+import datasets
+import numpy as np
+from argmaxtools.utils import get_logger
+from pydantic import BaseModel, Field
+from scipy.signal import resample_poly
+
+from .dataset_utils import atomic_write
+
+
+logger = get_logger(__name__)
+
+RESAMPLE_CACHE_DIRNAME = "openbench_resampled"
+
+
+class AudioInputSpec(BaseModel):
+    """Audio format a pipeline expects its input waveform in."""
+
+    sample_rate: int | None = Field(None, description="Sample rate in Hz. If None, the native rate is kept")
+    channels: int = Field(1, description="Number of channels, mono audio is duplicated across channels")
+    dtype: Literal["float32", "int16"] = Field(
+        "float32", description="Data type of the waveform, int16 is 16-bit PCM scaled to the full int16 range"
+    )
+
+
+def resample_audio(waveform: np.ndarray, orig_sample_rate: int, target_sample_rate: int) -> np.ndarray:
+    """Resample a waveform with a polyphase filter.
+
+    The up and down factors are reduced by their greatest common divisor, e.g. 44.1 kHz to 16 kHz is
+    an upsampling by 160 followed by a downsampling by 441 done in a single filtering pass.
+    """
+    if orig_sample_rate == target_sample_rate:
+        return waveform
+    divisor = gcd(orig_sample_rate, target_sample_rate)
+    up, down = target_sample_rate // divisor, orig_sample_rate // divisor
+    return resample_poly(waveform, up, down, axis=0).astype(np.float32, copy=False)
+
+
+def get_resample_cache_dir() -> Path:
+    """Directory where resampled waveforms are persisted, next to the HuggingFace datasets cache."""
+    return Path(datasets.config.HF_DATASETS_CACHE) / RESAMPLE_CACHE_DIRNAME
+
+
+def get_resampled_path(fingerprint: str, idx: int, sample_rate: int) -> Path:
+    return get_resample_cache_dir() / fingerprint / f"{idx}_{sample_rate}.npy"
+
+
+def load_or_resample(
+    waveform: np.ndarray, orig_sample_rate: int, target_sample_rate: int, cache_path: Path | None = None
+) -> np.ndarray:
+    """Resample a waveform, reusing the result persisted at `cache_path` by a previous call if any.
+
+    Cached waveforms are memory-mapped so that they do not need to fit in memory at once. The mapping is
+    copy-on-write so that the waveform is writable, e.g. by `torch.from_numpy`, without modifying the cache.
+    """
+    if cache_path is not None and cache_path.exists():
+        return np.load(cache_path, mmap_mode="c")
+
+    resampled = resample_audio(np.asarray(waveform, dtype=np.float32), orig_sample_rate, target_sample_rate)
+    if cache_path is None:
+        return resampled
+
+    def write(tmp_path: Path) -> None:
+        with open(tmp_path, "wb") as f:
+            np.save(f, resampled)
+
+    atomic_write(cache_path, write)
+    logger.debug(f"Cached waveform resampled from {orig_sample_rate}Hz to {target_sample_rate}Hz at {cache_path}")
+    return resampled
+
+
+def conform_audio(
+    waveform: np.ndarray,
+    sample_rate: int,
+    spec: AudioInputSpec,
+    cache_path: Path | None = None,
+) -> tuple[np.ndarray, int]:
+    """Convert a mono float waveform to the sample rate, channels and dtype of `spec`.
+
+    Args:
+        waveform: Mono waveform with shape (n_samples,)
+        sample_rate: Sample rate of `waveform`
+        spec: The audio format to convert to
+        cache_path: Where to persist the resampled waveform, if resampling is needed
+
+    Returns:
+        tuple: (waveform, sample_rate) where waveform has shape (n_samples,) for mono audio and
+               (n_samples, channels) otherwise
+    """
+    target_sample_rate = spec.sample_rate or sample_rate
+    if target_sample_rate != sample_rate:
+        waveform = load_or_resample(waveform, sample_rate, target_sample_rate, cache_path=cache_path)
+    if spec.dtype == "int16":
+        waveform = (np.clip(np.asarray(waveform), -1.0, 1.0) * 32767).astype(np.int16)
+    if spec.channels > 1:
+        waveform = np.repeat(np.asarray(waveform)[:, None], spec.channels, axis=1)
+    return waveform, target_sample_rate
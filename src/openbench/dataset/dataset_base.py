@@ -1,19 +1,26 @@
 # For licensing see accompanying LICENSE.md file.
 # Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
 
+import io
+import os
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any, Generic, TypeVar
+from typing import Any, Generic, Iterator, Literal, TypeVar
 
 import numpy as np
 import soundfile as sf
+import tqdm
 from argmaxtools.utils import get_logger
+from datasets import Audio, load_dataset
 from datasets import Dataset as HfDataset
-from datasets import load_dataset
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 from ..types import PredictionProtocol
+from .audio_cache import get_cached_audio_file, get_source_wav_path, link_audio_file
+from .audio_input import AudioInputSpec, conform_audio, get_resampled_path
+from .dataset_index import DatasetIndex, get_index_path
 from .dataset_utils import validate_hf_dataset_schema
+from .lazy_audio import LazyWaveform
 
 
 logger = get_logger(__name__)
@@ -30,22 +37,93 @@ class DatasetConfig(BaseModel):
     subset: str | None = Field(None, description="Subset of the dataset. Ex. 'eng' for the English subset.")
     split: str | None = Field(None, description="Split of the dataset")
     num_samples: int | None = Field(
-        None, description="Number of samples to take from the dataset. If None, take all samples."
+        None,
+        description="Number of samples to take from the dataset. If None, take all samples. "
+        "When filters or sorting are set, the samples are taken after filtering and sorting.",
     )
+    max_duration: float | None = Field(None, description="Keep only samples at most this long in seconds")
+    duration_range: tuple[float, float] | None = Field(
+        None, description="Keep only samples whose duration in seconds is within (min, max), bounds included"
+    )
+    min_speakers: int | None = Field(None, description="Keep only samples with at least this many reference speakers")
+    max_speakers: int | None = Field(None, description="Keep only samples with at most this many reference speakers")
+    sort_by: (
+        Literal["audio_duration", "sample_rate", "num_speakers", "overlap_ratio", "num_words", "file_size"] | None
+    ) = Field(None, description="Sort the samples by this column of the dataset index")
+    sort_descending: bool = Field(False, description="Whether to sort the samples in descending order")
+    subset_strategy: Literal["first", "stratified"] = Field(
+        "first",
+        description="How to pick a subset of the samples. 'first' takes the first `num_samples` samples, "
+        "'stratified' draws samples at random within duration, number of speakers and overlap ratio bins "
+        "under the `audio_hours_budget`.",
+    )
+    audio_hours_budget: float | None = Field(
+        None, description="Total hours of audio of the subset, required by the 'stratified' subset strategy"
+    )
+    seed: int = Field(0, description="Seed of the random draw of the 'stratified' subset strategy")
+    lazy_audio: bool = Field(
+        False,
+        description="Whether samples hold a `LazyWaveform` decoded chunk by chunk on demand instead of the "
+        "fully decoded waveform. Recommended for long recordings to bound memory usage.",
+    )
+
+    @model_validator(mode="after")
+    def validate_subset_strategy(self) -> "DatasetConfig":
+        if self.subset_strategy == "stratified" and self.audio_hours_budget is None:
+            raise ValueError("The 'stratified' subset strategy requires `audio_hours_budget` to be set")
+        return self
+
+    @property
+    def requires_index(self) -> bool:
+        """Whether selecting the samples needs the dataset index rather than just the first `num_samples`."""
+        return (
+            any(
+                value is not None
+                for value in (
+                    self.max_duration,
+                    self.duration_range,
+                    self.min_speakers,
+                    self.max_speakers,
+                    self.sort_by,
+                )
+            )
+            or self.subset_strategy != "first"
+        )
 
     def load(self) -> HfDataset:
         # TODO: Add support for streaming datasets
         ds = load_dataset(self.dataset_id, self.subset, split=self.split)
-        if self.num_samples is not None:
+        # With filters or sorting `num_samples` is applied on the index by `BaseDataset.from_config`
+        if self.num_samples is not None and not self.requires_index:
             ds = ds.take(self.num_samples)
         return ds
 
+    def select(self, index: DatasetIndex) -> DatasetIndex:
+        """Apply the filters, subset strategy, sorting and `num_samples` of this config to a dataset index."""
+        index = index.filter(
+            max_duration=self.max_duration,
+            duration_range=self.duration_range,
+            min_speakers=self.min_speakers,
+            max_speakers=self.max_speakers,
+        )
+        if self.subset_strategy == "stratified":
+            index = index.stratified_sample(budget=self.audio_hours_budget * 3600, seed=self.seed)
+        if self.sort_by is not None:
+            index = index.sort(self.sort_by, descending=self.sort_descending)
+        if self.num_samples is not None:
+            index = index.head(self.num_samples)
+        return index
+
 
 class BaseSample(BaseModel, Generic[ReferenceType, ExtraInfoType]):
     """Base class for all sample types with common audio-related functionality."""
 
     audio_name: str = Field(..., description="The name of the audio file")
-    waveform: np.ndarray = Field(..., description="The audio waveform as a numpy array with shape (n_samples,)")
+    waveform: np.ndarray | LazyWaveform = Field(
+        ...,
+        description="The audio waveform as a numpy array with shape (n_samples,) or as a `LazyWaveform` "
+        "which is decoded on demand. Use `np.asarray` or `iter_audio_chunks` to handle both",
+    )
     sample_rate: int = Field(..., description="The sample rate of the audio waveform")
     reference: ReferenceType = Field(..., description="The ground truth object conforming to PredictionProtocol")
     extra_info: ExtraInfoType = Field(default_factory=dict, description="Additional dataset-specific information")
@@ -55,14 +133,21 @@ class BaseSample(BaseModel, Generic[ReferenceType, ExtraInfoType]):
         return len(self.waveform) / self.sample_rate
 
     def save_audio(self, output_dir: str | Path) -> Path:
-        """Save audio waveform to file."""
+        """Save audio waveform to file.
+
+        The file is a link into a content-addressed cache of WAV files so the same audio is written to disk
+        only once across samples, runs and pipelines. If the waveform is lazily read from a mono WAV file
+        at the right sample rate, that file is linked directly. Deleting the returned file is safe.
+        """
         if not isinstance(output_dir, Path):
             output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
         output_path = output_dir / f"{self.audio_name}.wav"
-        logger.info(f"Saving audio to {output_path}")
-        sf.write(output_path, self.waveform, self.sample_rate)
-        return output_path
+        source_path = get_source_wav_path(self.waveform, self.sample_rate)
+        if source_path is None:
+            source_path = get_cached_audio_file(self.waveform, self.sample_rate)
+        logger.info(f"Saving audio to {output_path} (linked from {source_path})")
+        return link_audio_file(source_path, output_path)
 
     class Config:
         arbitrary_types_allowed = True
@@ -84,13 +169,21 @@ class BaseDataset(ABC, Generic[SampleType]):
         if cls._sample_class is None:
             raise ValueError(f"Dataset {cls.__name__} must define _sample_class class attribute")
 
-    def __init__(self, ds: HfDataset) -> None:
+    def __init__(self, ds: HfDataset, lazy_audio: bool = False) -> None:
         if self._expected_columns is None:
             raise ValueError(f"Dataset {self.__class__.__name__} must define _expected_columns class attribute")
         if self._sample_class is None:
             raise ValueError(f"Dataset {self.__class__.__name__} must define _sample_class class attribute")
         validate_hf_dataset_schema(ds, self._expected_columns)
         self.ds = ds
+        self.lazy_audio = lazy_audio
+        # Audio format samples are converted to, see `set_input_spec`
+        self.input_spec: AudioInputSpec | None = None
+        # Lazily built views of `ds` used by the reference-only access path
+        self._reference_ds: HfDataset | None = None
+        self._encoded_audio_ds: HfDataset | None = None
+        # Per-sample metadata, only available if built or loaded with `build_index`/`load_index`
+        self.index: DatasetIndex | None = None
 
     def __len__(self) -> int:
         return len(self.ds)
@@ -100,8 +193,14 @@ class BaseDataset(ABC, Generic[SampleType]):
 
     def __getitem__(self, idx: int) -> SampleType:
         """Get a sample by index - concrete implementation using prepare_sample."""
-        row = self.ds[idx]
-        audio_name, waveform, sample_rate = self._extract_audio_info(row)
+        if self.lazy_audio:
+            row = self.reference_ds[idx]
+            audio_name, waveform, sample_rate = self._extract_lazy_audio_info(idx, row)
+        else:
+            row = self.ds[idx]
+            audio_name, waveform, sample_rate = self._extract_audio_info(row)
+        if self.input_spec is not None:
+            waveform, sample_rate = self._conform_audio(idx, waveform, sample_rate)
         reference, extra_info = self.prepare_sample(row)
 
         return self._create_sample(
@@ -112,6 +211,147 @@ class BaseDataset(ABC, Generic[SampleType]):
             extra_info=extra_info,
         )
 
+    def set_input_spec(self, input_spec: AudioInputSpec | None) -> None:
+        """Convert the audio of every sample to the given format, e.g. the one declared by a pipeline.
+
+        Resampled waveforms are persisted next to the HuggingFace datasets cache per sample and target
+        sample rate, so each sample is resampled at most once across runs.
+        """
+        self.input_spec = input_spec
+
+    def _conform_audio(
+        self, idx: int, waveform: np.ndarray | LazyWaveform, sample_rate: int
+    ) -> tuple[np.ndarray | LazyWaveform, int]:
+        spec = self.input_spec
+        if spec.sample_rate in (None, sample_rate) and spec.channels == 1 and spec.dtype == "float32":
+            # Nothing to convert, keep lazy waveforms lazy
+            return waveform, sample_rate
+        cache_path = None
+        if spec.sample_rate is not None:
+            cache_path = get_resampled_path(self.ds._fingerprint, idx, spec.sample_rate)
+        return conform_audio(waveform, sample_rate, spec, cache_path=cache_path)
+
+    @property
+    def reference_ds(self) -> HfDataset:
+        """View of the dataset projected on the annotation columns i.e. every column but `audio`.
+
+        Selecting columns on an Arrow backed dataset does not copy nor decode anything, rows read
+        from this view only materialize the annotation columns.
+        """
+        if self._reference_ds is None:
+            columns = [col for col in self.ds.column_names if col != "audio"]
+            self._reference_ds = self.ds.select_columns(columns)
+        return self._reference_ds
+
+    @property
+    def encoded_audio_ds(self) -> HfDataset:
+        """View of the `audio` column with decoding disabled, rows contain the raw `bytes` and `path`."""
+        if self._encoded_audio_ds is None:
+            self._encoded_audio_ds = self.ds.select_columns(["audio"]).cast_column("audio", Audio(decode=False))
+        return self._encoded_audio_ds
+
+    def get_reference(self, idx: int) -> tuple[ReferenceType, ExtraInfoType]:
+        """Get the reference and extra info of a sample without decoding its audio."""
+        return self.prepare_sample(self.reference_ds[idx])
+
+    def iter_references(self) -> Iterator[tuple[ReferenceType, ExtraInfoType]]:
+        """Iterate over the references and extra info of all samples without decoding any audio."""
+        for row in self.reference_ds:
+            yield self.prepare_sample(row)
+
+    def get_audio_info(self, idx: int) -> tuple[float, int, int]:
+        """Get the duration in seconds, sample rate and encoded size in bytes of a sample's audio.
+
+        Only the audio container header is read, falling back to decoding the waveform if the
+        container format is not supported by `soundfile`.
+        """
+        audio = self.encoded_audio_ds[idx]["audio"]
+        if audio.get("bytes") is not None:
+            source = io.BytesIO(audio["bytes"])
+            file_size = len(audio["bytes"])
+        else:
+            source = audio["path"]
+            file_size = os.path.getsize(audio["path"])
+        try:
+            info = sf.info(source)
+            return info.duration, info.samplerate, file_size
+        except (sf.LibsndfileError, RuntimeError) as e:
+            logger.warning(f"Could not read audio header for sample {idx} ({e}), decoding the waveform instead")
+            decoded = self.ds[idx]["audio"]
+            return len(decoded["array"]) / decoded["sampling_rate"], decoded["sampling_rate"], file_size
+
+    def get_audio_duration(self, idx: int) -> float:
+        """Get the audio duration in seconds of a sample by reading only the audio container header."""
+        if self.index is not None:
+            return float(self.index.durations[idx])
+        duration, _, _ = self.get_audio_info(idx)
+        return duration
+
+    def get_audio_durations(self) -> np.ndarray:
+        """Get the audio duration in seconds of every sample, from the index if available."""
+        if self.index is not None:
+            return self.index.durations
+        return np.array([self.get_audio_info(idx)[0] for idx in range(len(self))])
+
+    def get_reference_stats(self, reference: ReferenceType) -> dict[str, float]:
+        """Compute statistics of a reference to store in the dataset index.
+
+        Subclasses should override this to return the `num_speakers`, `overlap_ratio` and `num_words`
+        keys that apply to their reference type, missing keys are stored as NaN.
+        """
+        return {}
+
+    def build_index(self) -> DatasetIndex:
+        """Compute the metadata of every sample from the annotation columns and audio headers only."""
+        records = []
+        for idx, (reference, _) in enumerate(
+            tqdm.tqdm(self.iter_references(), total=len(self), desc="Building dataset index")
+        ):
+            duration, sample_rate, file_size = self.get_audio_info(idx)
+            records.append(
+                dict(
+                    sample_id=idx,
+                    audio_duration=duration,
+                    sample_rate=sample_rate,
+                    file_size=file_size,
+                    **self.get_reference_stats(reference),
+                )
+            )
+        return DatasetIndex.from_records(records)
+
+    def get_index_path(self, config: DatasetConfig) -> Path:
+        return get_index_path(
+            dataset_id=config.dataset_id,
+            subset=config.subset,
+            split=config.split,
+            dataset_type=self.__class__.__name__,
+            fingerprint=self.ds._fingerprint,
+        )
+
+    def load_index(self, config: DatasetConfig, overwrite: bool = False) -> DatasetIndex:
+        """Load the persisted index of this dataset, building and saving it first if needed.
+
+        Args:
+            config: Config the dataset was loaded with, used to locate the index file
+            overwrite: Whether to rebuild the index even if it was already persisted
+        """
+        path = self.get_index_path(config)
+        if path.exists() and not overwrite:
+            logger.info(f"Loading dataset index from {path}")
+            index = DatasetIndex.load(path)
+        else:
+            index = self.build_index()
+            index.save(path)
+        self.index = index
+        return index
+
+    def select(self, index: DatasetIndex) -> "BaseDataset":
+        """Create a dataset with the samples of `index` in the order they appear in it."""
+        dataset = self.__class__(self.ds.select(index.sample_ids), lazy_audio=self.lazy_audio)
+        dataset.set_input_spec(self.input_spec)
+        dataset.index = index.take(list(range(len(index))))
+        return dataset
+
     @abstractmethod
     def prepare_sample(self, row: dict) -> tuple[ReferenceType, ExtraInfoType]:
         """Prepare the reference and extra_info from dataset row.
@@ -147,6 +387,28 @@ class BaseDataset(ABC, Generic[SampleType]):
             audio_name = Path(audio["path"]).stem
         return audio_name, audio["array"], audio["sampling_rate"]
 
+    def _extract_lazy_audio_info(self, idx: int, row: dict) -> tuple[str, np.ndarray | LazyWaveform, int]:
+        """Extract audio information of a sample with a `LazyWaveform` instead of the decoded waveform.
+
+        Falls back to the decoded waveform if `soundfile` cannot read the audio or if the dataset
+        resamples the audio on decoding, which a `LazyWaveform` does not do.
+        """
+        audio = self.encoded_audio_ds[idx]["audio"]
+        audio_name = f"sample_{row.get('idx', 0)}"
+        if audio.get("path") is not None:
+            audio_name = Path(audio["path"]).stem
+        try:
+            waveform = LazyWaveform.from_audio(audio)
+        except (sf.LibsndfileError, RuntimeError) as e:
+            logger.warning(f"Could not lazily read audio of sample {idx} ({e}), decoding the waveform instead")
+            return self._extract_audio_info(self.ds[idx])
+
+        target_sample_rate = self.ds.features["audio"].sampling_rate
+        if target_sample_rate is not None and target_sample_rate != waveform.sample_rate:
+            logger.debug(f"Sample {idx} is resampled on decoding, decoding the waveform instead of lazy reading")
+            return self._extract_audio_info(self.ds[idx])
+        return audio_name, waveform, waveform.sample_rate
+
     # Shared properties
     @property
     def dataset_name(self) -> str:
@@ -168,6 +430,15 @@ class BaseDataset(ABC, Generic[SampleType]):
 
     @classmethod
     def from_config(cls, config: DatasetConfig) -> "BaseDataset":
-        """Create dataset from configuration."""
+        """Create dataset from configuration.
+
+        If the config filters or sorts the samples, the dataset index is loaded (and built if it was
+        never persisted) to select the samples without decoding any audio.
+        """
         ds = config.load()
-        return cls(ds)
+        dataset = cls(ds, lazy_audio=config.lazy_audio)
+        if not config.requires_index:
+            return dataset
+        index = config.select(dataset.load_index(config))
+        logger.info(f"Selected {len(index)} out of {len(dataset)} samples ({index.total_duration:.1f}s of audio)")
+        return dataset.select(index)
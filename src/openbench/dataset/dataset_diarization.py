@@ -52,3 +52,12 @@ class DiarizationDataset(BaseDataset[DiarizationSample]):
             extra_info["uem"] = uem
 
         return annotation, extra_info
+
+    def get_reference_stats(self, reference: DiarizationAnnotation) -> dict[str, float]:
+        """Number of speakers and ratio of the speech duration where more than one speaker is active."""
+        speech_duration = reference.get_timeline().support().duration()
+        overlap_duration = reference.get_overlap().duration()
+        return {
+            "num_speakers": len(reference.labels()),
+            "overlap_ratio": overlap_duration / speech_duration if speech_duration > 0 else 0.0,
+        }
@@ -0,0 +1,264 @@
+# For licensing see accompanying LICENSE.md file.
+# Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
+
+"""Per-sample metadata index of a dataset used for filtering, sorting and scheduling."""
+
+from pathlib import Path
+from typing import Any, Iterable
+
+import datasets
+import numpy as np
+import pandas as pd
+from argmaxtools.utils import get_logger
+from scipy import stats
+
+from .dataset_utils import atomic_write
+
+
+logger = get_logger(__name__)
+
+INDEX_CACHE_DIRNAME = "openbench_index"
+
+INDEX_COLUMNS = [
+    "sample_id",
+    "audio_duration",
+    "sample_rate",
+    "num_speakers",
+    "overlap_ratio",
+    "num_words",
+    "file_size",
+]
+
+# Columns added to the index of a stratified subset, see `DatasetIndex.stratified_sample`
+STRATUM_COLUMNS = ["stratum", "stratum_weight", "stratum_size"]
+
+# Bins used to stratify samples by number of speakers and overlap ratio, unknown values get their own bin.
+# The last speaker bin groups every sample with 4 or more speakers.
+SPEAKER_BIN_EDGES = [0, 1, 2, 3, np.inf]
+OVERLAP_BIN_EDGES = [-np.inf, 0.0, 0.1, 0.25, 1.0]
+NUM_DURATION_BINS = 3
+
+
+def get_index_cache_dir() -> Path:
+    """Directory where dataset indexes are persisted, next to the HuggingFace datasets cache."""
+    return Path(datasets.config.HF_DATASETS_CACHE) / INDEX_CACHE_DIRNAME
+
+
+def get_index_path(
+    dataset_id: str,
+    subset: str | None,
+    split: str | None,
+    dataset_type: str,
+    fingerprint: str,
+) -> Path:
+    """Get the path of the index file of a dataset.
+
+    The fingerprint of the underlying HuggingFace dataset is part of the filename so that an index
+    is never reused for a different version of the data. The dataset type is also part of it since
+    the reference statistics depend on how the rows are parsed.
+    """
+    filename = f"{subset or 'default'}-{split or 'all'}-{dataset_type}-{fingerprint}.parquet"
+    return get_index_cache_dir() / dataset_id.replace("/", "___") / filename
+
+
+class DatasetIndex:
+    """Metadata of every sample of a dataset computed without decoding any audio.
+
+    Each row holds the `sample_id` (position of the sample in the dataset) along with the audio
+    duration in seconds, the sample rate, the number of reference speakers, the ratio of speech
+    where more than one speaker is active, the number of reference words and the size in bytes
+    of the encoded audio. Statistics that do not apply to a dataset type are stored as NaN.
+    """
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        missing_columns = [col for col in INDEX_COLUMNS if col not in df.columns]
+        if missing_columns:
+            raise ValueError(f"Dataset index is missing columns: {missing_columns}")
+        extra_columns = [col for col in STRATUM_COLUMNS if col in df.columns]
+        self.df = df[INDEX_COLUMNS + extra_columns].reset_index(drop=True)
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict[str, Any]]) -> "DatasetIndex":
+        return cls(pd.DataFrame.from_records(list(records), columns=INDEX_COLUMNS))
+
+    @classmethod
+    def load(cls, path: str | Path) -> "DatasetIndex":
+        return cls(pd.read_parquet(path))
+
+    def save(self, path: str | Path) -> Path:
+        path = atomic_write(Path(path), lambda tmp_path: self.df.to_parquet(tmp_path, index=False))
+        logger.info(f"Saved dataset index with {len(self)} samples to {path}")
+        return path
+
+    @property
+    def sample_ids(self) -> list[int]:
+        return self.df["sample_id"].astype(int).tolist()
+
+    @property
+    def durations(self) -> np.ndarray:
+        return self.df["audio_duration"].to_numpy(dtype=float)
+
+    @property
+    def total_duration(self) -> float:
+        return float(self.df["audio_duration"].sum())
+
+    def take(self, positions: list[int]) -> "DatasetIndex":
+        """Get the index rows at the given positions, with `sample_id` renumbered to the new positions."""
+        df = self.df.iloc[positions].copy()
+        df["sample_id"] = np.arange(len(df))
+        return DatasetIndex(df)
+
+    def filter(
+        self,
+        max_duration: float | None = None,
+        duration_range: tuple[float, float] | None = None,
+        min_speakers: int | None = None,
+        max_speakers: int | None = None,
+    ) -> "DatasetIndex":
+        """Keep the samples matching all the given criteria.
+
+        Samples for which a statistic is unknown (NaN) are dropped by any filter on that statistic.
+        The `sample_id` column is left untouched so it still refers to the unfiltered dataset.
+        """
+        mask = pd.Series(True, index=self.df.index)
+        if max_duration is not None:
+            mask &= self.df["audio_duration"] <= max_duration
+        if duration_range is not None:
+            min_duration, max_duration = duration_range
+            mask &= self.df["audio_duration"].between(min_duration, max_duration)
+        if min_speakers is not None:
+            mask &= self.df["num_speakers"] >= min_speakers
+        if max_speakers is not None:
+            mask &= self.df["num_speakers"] <= max_speakers
+        return DatasetIndex(self.df[mask])
+
+    def sort(self, by: str, descending: bool = False) -> "DatasetIndex":
+        if by not in INDEX_COLUMNS:
+            raise ValueError(f"Cannot sort dataset index by {by}. Available columns: {INDEX_COLUMNS}")
+        # Stable sort so that ties keep the original dataset order
+        return DatasetIndex(self.df.sort_values(by, ascending=not descending, kind="stable", na_position="last"))
+
+    def head(self, n: int) -> "DatasetIndex":
+        return DatasetIndex(self.df.head(n))
+
+    @property
+    def is_stratified(self) -> bool:
+        return all(col in self.df.columns for col in STRATUM_COLUMNS)
+
+    def get_strata(self) -> pd.Series:
+        """Label every sample with its stratum i.e. its duration, number of speakers and overlap ratio bins.
+
+        Duration bins are tertiles of the durations of this index, speaker and overlap bins are fixed.
+        """
+        if self.df["audio_duration"].nunique() > 1:
+            duration_bin = pd.qcut(self.df["audio_duration"], q=NUM_DURATION_BINS, labels=False, duplicates="drop")
+        else:
+            duration_bin = pd.Series(0, index=self.df.index)
+        speaker_bin = pd.cut(self.df["num_speakers"], bins=SPEAKER_BIN_EDGES, labels=False)
+        overlap_bin = pd.cut(self.df["overlap_ratio"], bins=OVERLAP_BIN_EDGES, labels=False)
+        bins = pd.concat([duration_bin, speaker_bin, overlap_bin], axis=1).fillna(-1).astype(int)
+        return bins.astype(str).agg("-".join, axis=1)
+
+    def stratified_sample(self, budget: float, seed: int = 0) -> "DatasetIndex":
+        """Draw a random subset of at most `budget` seconds of audio, stratified with `get_strata`.
+
+        Every stratum is allocated a share of the budget proportional to its share of the total audio
+        duration. Samples are drawn at random within strata, each time from the stratum furthest below
+        its allocation whose next sample still fits in the budget, until no sample fits anymore.
+
+        The returned index is in the original dataset order and has the stratum of each sample, the
+        stratum share of the total number of samples and the stratum number of samples, which are used by
+        `estimate_confidence_width`.
+        """
+        if budget >= self.total_duration:
+            logger.warning(f"Budget of {budget:.1f}s is larger than the whole dataset, taking all samples")
+
+        df = self.df.copy()
+        df["stratum"] = self.get_strata()
+        total_duration = self.total_duration
+        rng = np.random.default_rng(seed)
+
+        strata = df.groupby("stratum", sort=True)
+        stratum_durations = strata["audio_duration"].sum()
+        stratum_sizes = strata.size()
+        df["stratum_weight"] = df["stratum"].map(stratum_sizes / len(df))
+        df["stratum_size"] = df["stratum"].map(stratum_sizes)
+
+        # Queue of shuffled positions in `df` per stratum and duration still to allocate to each stratum
+        queues = {stratum: list(rng.permutation(stratum_df.index)) for stratum, stratum_df in strata}
+        deficits = {stratum: budget * duration / total_duration for stratum, duration in stratum_durations.items()}
+        durations = df["audio_duration"].to_numpy()
+
+        selected = []
+        remaining_budget = budget
+        while True:
+            candidates = [
+                stratum for stratum, queue in queues.items() if queue and durations[queue[0]] <= remaining_budget
+            ]
+            if not candidates:
+                break
+            stratum = max(candidates, key=lambda s: deficits[s])
+            position = queues[stratum].pop(0)
+            selected.append(position)
+            deficits[stratum] -= durations[position]
+            remaining_budget -= durations[position]
+
+        subset = DatasetIndex(df.loc[sorted(selected)])
+        logger.info(
+            f"Stratified subset: {len(subset)} out of {len(self)} samples, {subset.total_duration:.1f}s out of "
+            f"{total_duration:.1f}s of audio (budget {budget:.1f}s), "
+            f"{subset.df['stratum'].nunique()} out of {len(queues)} strata"
+        )
+        return subset
+
+    def estimate_confidence_width(self, values: list[float] | np.ndarray, alpha: float = 0.9) -> float:
+        """Estimate the width of the confidence interval of a metric evaluated on a stratified subset.
+
+        `values` are the per-sample results of the metric in the order of this index. The mean of the
+        per-sample results over the whole dataset is estimated by weighting each stratum mean by the
+        stratum share of the total number of samples, even though the budget is allocated to strata by
+        audio duration. Its variance is the sum of the within-stratum variances of the stratum means, with
+        finite population correction. Strata that were not sampled or samples without result are left out
+        and the weights renormalized.
+
+        The variance of a stratum with a single sample cannot be estimated, it is replaced by the pooled
+        variance of the strata with several samples or, if there is none, by the variance of all the samples,
+        so that splitting strata down to single samples does not make the interval narrower. The width is NaN
+        with fewer than two results.
+
+        Args:
+            values: Per-sample metric results, NaN for samples without result
+            alpha: Confidence level of the interval
+        """
+        if not self.is_stratified:
+            raise ValueError("Confidence width can only be estimated on an index built by `stratified_sample`")
+
+        df = self.df.assign(value=np.asarray(values, dtype=float)).dropna(subset=["value"])
+        if len(df) < 2:
+            return float("nan")
+
+        strata = df.groupby("stratum")
+        sizes = strata.size()
+        sample_variances = strata["value"].var(ddof=1)
+        degrees_of_freedom = (sizes - 1).sum()
+        if degrees_of_freedom > 0:
+            pooled_variance = ((sizes - 1) * sample_variances.fillna(0.0)).sum() / degrees_of_freedom
+        else:
+            pooled_variance = df["value"].var(ddof=1)
+        sample_variances = sample_variances.where(sizes > 1, pooled_variance)
+
+        variance = 0.0
+        weights = 0.0
+        for stratum, stratum_df in strata:
+            n = sizes[stratum]
+            weight = stratum_df["stratum_weight"].iloc[0]
+            population_size = stratum_df["stratum_size"].iloc[0]
+            finite_population_correction = 1 - n / population_size
+            variance += weight**2 * finite_population_correction * sample_variances[stratum] / n
+            weights += weight
+
+        standard_error = np.sqrt(variance) / weights
+        return float(2 * stats.norm.ppf((1 + alpha) / 2) * standard_error)
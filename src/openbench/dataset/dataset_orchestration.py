@@ -7,6 +7,7 @@ from pydantic import model_validator
 
 from ..pipeline_prediction import Transcript
 from .dataset_base import BaseDataset, BaseSample
+from .dataset_utils import get_transcript_stats
 
 
 class OrchestrationSample(BaseSample[Transcript, dict[str, Any]]):
@@ -42,3 +43,6 @@ class OrchestrationDataset(BaseDataset[OrchestrationSample]):
         )
         extra_info: dict[str, Any] = {}
         return reference, extra_info
+
+    def get_reference_stats(self, reference: Transcript) -> dict[str, float]:
+        return get_transcript_stats(reference)
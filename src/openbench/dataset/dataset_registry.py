@@ -7,6 +7,7 @@ from typing import ClassVar
 from ..types import PipelineType
 from .dataset_base import BaseDataset, DatasetConfig
 from .dataset_diarization import DiarizationDataset
+from .dataset_index import DatasetIndex
 from .dataset_orchestration import OrchestrationDataset
 from .dataset_streaming_transcription import StreamingDataset
 from .dataset_transcription import TranscriptionDataset
@@ -101,6 +102,30 @@ class DatasetRegistry:
             raise ValueError(f"Unknown dataset alias: {alias}")
         return cls._aliases[alias]
 
+    @classmethod
+    def get_alias_index(
+        cls, alias: str, pipeline_type: PipelineType | None = None, overwrite: bool = False
+    ) -> DatasetIndex:
+        """Get the index of all the samples of a dataset alias, building and persisting it if needed.
+
+        The index covers the whole split regardless of `num_samples` or filters of the alias config.
+
+        Args:
+            alias: The dataset alias
+            pipeline_type: Pipeline type whose dataset class parses the references. Defaults to the
+                first pipeline type supported by the alias, sorted by name for reproducibility.
+            overwrite: Whether to rebuild the index even if it was already persisted
+        """
+        info = cls.get_alias_info(alias)
+        if pipeline_type is None:
+            pipeline_type = sorted(info.supported_pipeline_types, key=lambda t: t.value)[0]
+        else:
+            cls.validate_alias_pipeline_compatibility(alias, pipeline_type)
+
+        config = DatasetConfig(dataset_id=info.config.dataset_id, subset=info.config.subset, split=info.config.split)
+        dataset = cls._datasets[pipeline_type](config.load())
+        return dataset.load_index(config, overwrite=overwrite)
+
     @classmethod
     def has_alias(cls, alias: str) -> bool:
         """Check if a dataset alias exists."""
@@ -5,6 +5,7 @@ from typing import Any
 
 from ..pipeline_prediction import Transcript
 from .dataset_base import BaseDataset, BaseSample
+from .dataset_utils import get_transcript_stats
 
 
 DEFAULT_SAMPLE_RATE = 16000
@@ -43,3 +44,6 @@ class StreamingDataset(BaseDataset[StreamingSample]):
             words=transcript_text, start=word_timestamps_start, end=word_timestamps_end, speaker=None
         )
         return reference, extra_info
+
+    def get_reference_stats(self, reference: Transcript) -> dict[str, float]:
+        return get_transcript_stats(reference)
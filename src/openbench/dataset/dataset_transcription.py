@@ -5,6 +5,7 @@ from typing import Any
 
 from ..pipeline_prediction import Transcript
 from .dataset_base import BaseDataset, BaseSample
+from .dataset_utils import get_transcript_stats
 
 
 class TranscriptionSample(BaseSample[Transcript, dict[str, Any]]):
@@ -30,3 +31,6 @@ class TranscriptionDataset(BaseDataset[TranscriptionSample]):
         )
         extra_info: dict[str, Any] = {}
         return reference, extra_info
+
+    def get_reference_stats(self, reference: Transcript) -> dict[str, float]:
+        return get_transcript_stats(reference)
@@ -1,11 +1,42 @@
 # For licensing see accompanying LICENSE.md file.
 # Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
 
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable
+
 from datasets import Dataset as HfDataset
 
+from ..pipeline_prediction import Transcript
+
 
 def validate_hf_dataset_schema(ds: HfDataset, expected_columns: list[str]) -> None:
     """Validate that the dataset has the expected columns."""
     for col in expected_columns:
         if col not in ds.column_names:
             raise ValueError(f"Dataset is missing expected column: {col}")
+
+
+def get_transcript_stats(transcript: Transcript) -> dict[str, float]:
+    """Statistics of a reference transcript stored in the dataset index."""
+    stats = {"num_words": len(transcript.words)}
+    if transcript.has_speakers:
+        stats["num_speakers"] = len({word.speaker for word in transcript.words if word.speaker is not None})
+    return stats
+
+
+def atomic_write(path: Path, writer: Callable[[Path], Any]) -> Path:
+    """Write `path` with `writer` so that readers never see a partially written file.
+
+    `writer` writes to a temporary file next to `path`, named after the calling process and thread so that
+    concurrent writers of the same file never share it, which then replaces `path` in a single rename.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        writer(tmp_path)
+        tmp_path.replace(path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return path
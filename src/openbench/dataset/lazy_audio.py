@@ -0,0 +1,109 @@
+# For licensing see accompanying LICENSE.md file.
+# Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
+
+"""Lazily decoded audio that can be read chunk by chunk without materializing the whole signal."""
+
+import io
+from typing import Iterator
+
+import numpy as np
+import soundfile as sf
+
+
+# 30 seconds at 16 kHz, i.e. ~1.9 MB per chunk in float32
+DEFAULT_CHUNK_SIZE = 480_000
+
+
+class LazyWaveform:
+    """Mono float32 waveform decoded on demand from an encoded audio file or buffer.
+
+    Only the container header is read on construction. Slicing or iterating over chunks decodes only
+    the requested frames, so peak memory is bounded by the chunk size rather than the recording length.
+    Multi-channel audio is downmixed to mono by averaging the channels, similarly to the decoding done by
+    HuggingFace datasets.
+
+    `np.asarray(lazy_waveform)` decodes the whole signal for code that needs a regular array.
+    """
+
+    def __init__(self, source: str | bytes, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        self.source = source
+        self.chunk_size = chunk_size
+        info = sf.info(self._open_source())
+        self.sample_rate: int = info.samplerate
+        self.num_frames: int = info.frames
+
+    @classmethod
+    def from_audio(cls, audio: dict, chunk_size: int = DEFAULT_CHUNK_SIZE) -> "LazyWaveform":
+        """Create from an undecoded HuggingFace `Audio` value i.e. a dict with `bytes` and `path` keys."""
+        source = audio["bytes"] if audio.get("bytes") is not None else audio["path"]
+        return cls(source, chunk_size=chunk_size)
+
+    def _open_source(self) -> str | io.BytesIO:
+        return io.BytesIO(self.source) if isinstance(self.source, bytes) else self.source
+
+    def __len__(self) -> int:
+        return self.num_frames
+
+    @property
+    def shape(self) -> tuple[int]:
+        return (self.num_frames,)
+
+    @property
+    def ndim(self) -> int:
+        return 1
+
+    @property
+    def dtype(self) -> np.dtype:
+        return np.dtype(np.float32)
+
+    def __repr__(self) -> str:
+        source = f"<{len(self.source)} bytes>" if isinstance(self.source, bytes) else self.source
+        return (
+            f"{self.__class__.__name__}(source={source}, sample_rate={self.sample_rate}, num_frames={self.num_frames})"
+        )
+
+    def read(self, start: int = 0, stop: int | None = None) -> np.ndarray:
+        """Decode the frames in [start, stop)."""
+        start, stop, _ = slice(start, stop).indices(self.num_frames)
+        if stop <= start:
+            return np.zeros(0, dtype=np.float32)
+        with sf.SoundFile(self._open_source()) as f:
+            f.seek(start)
+            data = f.read(stop - start, dtype="float32", always_2d=True)
+        return data.mean(axis=1, dtype=np.float32) if data.shape[1] > 1 else data[:, 0]
+
+    def iter_chunks(self, chunk_size: int | None = None) -> Iterator[np.ndarray]:
+        """Decode the waveform sequentially in chunks of `chunk_size` frames, the last one may be shorter."""
+        chunk_size = chunk_size or self.chunk_size
+        with sf.SoundFile(self._open_source()) as f:
+            for block in f.blocks(blocksize=chunk_size, dtype="float32", always_2d=True):
+                yield block.mean(axis=1, dtype=np.float32) if block.shape[1] > 1 else block[:, 0]
+
+    def __getitem__(self, key: int | slice) -> np.ndarray | np.float32:
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.num_frames)
+            if step < 0:
+                return np.asarray(self)[key]
+            return self.read(start, stop)[::step]
+        if isinstance(key, (int, np.integer)):
+            index = key + self.num_frames if key < 0 else key
+            if not 0 <= index < self.num_frames:
+                raise IndexError(f"Index {key} is out of bounds for waveform with {self.num_frames} frames")
+            return self.read(index, index + 1)[0]
+        raise TypeError(f"{self.__class__.__name__} only supports integer and slice indexing, got {type(key)}")
+
+    def __array__(self, dtype: np.dtype | None = None, copy: bool | None = None) -> np.ndarray:
+        waveform = self.read()
+        return waveform.astype(dtype, copy=False) if dtype is not None else waveform
+
+
+def iter_audio_chunks(waveform: np.ndarray | LazyWaveform, chunk_size: int) -> Iterator[np.ndarray]:
+    """Iterate over consecutive chunks of `chunk_size` frames of a waveform, lazy or not.
+
+    Chunks of a `LazyWaveform` are decoded one at a time, chunks of an array are views.
+    """
+    if isinstance(waveform, LazyWaveform):
+        yield from waveform.iter_chunks(chunk_size)
+        return
+    for start in range(0, len(waveform), chunk_size):
+        yield waveform[start : start + chunk_size]
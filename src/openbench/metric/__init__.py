@@ -1,6 +1,18 @@
 # For licensing see accompanying LICENSE.md file.
 # Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
 
+from .context import MetricContext
+from .diarization_metrics import (
+    DetectionCostFunction,
+    DetectionErrorRate,
+    DetectionPrecisionRecallFMeasure,
+    DiarizationErrorRate,
+    DiarizationFrames,
+    DiarizationHomogeneity,
+    DiarizationPurity,
+    DiarizationPurityCoverageFMeasure,
+    JaccardErrorRate,
+)
 from .metric import MetricOptions
 from .registry import MetricRegistry
 from .speaker_count_metrics import (
@@ -17,4 +29,5 @@ from .streaming_latency_metrics import (
     NumSubstitutions,
     StreamingLatency,
 )
+from .time_resolved import TIME_RESOLVED, TimeResolvedComponents
 from .word_error_metrics import WordDiarizationErrorRate, WordErrorRate
@@ -0,0 +1,26 @@
+# For licensing see accompanying LICENSE.md file.
+# Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
+
+from typing import Any, Callable, Hashable, TypeVar
+
+
+T = TypeVar("T")
+
+
+class MetricContext:
+    """Memoizes the artifacts derived from a single (reference, hypothesis) pair.
+
+    The runner creates one context per sample and passes it to every metric evaluating that sample so that
+    metrics needing the same artifact, e.g. the normalized words or their alignment, compute it only once.
+    Keys must identify everything the artifact depends on besides the pair itself, and shared artifacts must
+    not be modified by the metrics using them.
+    """
+
+    def __init__(self) -> None:
+        self.artifacts: dict[Hashable, Any] = {}
+
+    def get(self, key: Hashable, compute: Callable[[], T]) -> T:
+        """Get the artifact stored under `key`, computing it first if needed."""
+        if key not in self.artifacts:
+            self.artifacts[key] = compute()
+        return self.artifacts[key]
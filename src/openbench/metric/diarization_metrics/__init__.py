@@ -0,0 +1,15 @@
+# For licensing see accompanying LICENSE.md file.
+# Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
+
+from .diarization_metrics import (
+    DetectionCostFunction,
+    DetectionErrorRate,
+    DetectionPrecisionRecallFMeasure,
+    DiarizationErrorRate,
+    DiarizationHomogeneity,
+    DiarizationPurity,
+    DiarizationPurityCoverageFMeasure,
+    FrameEngineMixin,
+    JaccardErrorRate,
+)
+from .frame_analysis import DiarizationFrames, DiscretizedAnnotations, discretize, get_diarization_frames
@@ -0,0 +1,298 @@
+# For licensing see accompanying LICENSE.md file.
+# Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
+
+"""pyannote diarization and detection metrics with an optional frame-based engine."""
+
+from abc import ABC, abstractmethod
+from typing import get_args
+
+import numpy as np
+from pyannote.core import Annotation, Timeline
+from pyannote.metrics import detection, diarization
+from pyannote.metrics.identification import IER_CONFUSION, IER_CORRECT, IER_FALSE_ALARM, IER_MISS, IER_TOTAL
+from pyannote.metrics.types import Details
+
+from ...types import PipelineType
+from ..context import MetricContext
+from ..metric import MetricOptions
+from ..registry import MetricRegistry
+from ..time_resolved import TIME_RESOLVED, TimeResolvedComponents, sum_per_window, validate_window
+from .frame_analysis import DEFAULT_RESOLUTION, DiarizationEngine, DiarizationFrames, get_diarization_frames
+
+
+class FrameEngineMixin(ABC):
+    """Computes the components of a pyannote metric with either pyannote or `DiarizationFrames`.
+
+    With `engine="pyannote"` (default) the metric is pyannote's segment-based implementation, the annotations of
+    the sample cropped to its UEM are shared through the `MetricContext` by all the metrics using the same collar
+    and overlap settings. With
+    `engine="frames"` the components are derived from the frames of the sample, discretized with `resolution`
+    and shared through the `MetricContext` by all the metrics using the same collar and overlap settings, so that
+    evaluating DER, JER, purity and the detection metrics of a sample costs a single pass over its annotations.
+    Components have the same names and agree with pyannote to within the frame resolution.
+    """
+
+    def __init__(
+        self,
+        *args,
+        engine: DiarizationEngine = "pyannote",
+        resolution: float = DEFAULT_RESOLUTION,
+        **kwargs,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        if engine not in get_args(DiarizationEngine):
+            raise ValueError(f"Unknown diarization metric engine {engine}, choose from {get_args(DiarizationEngine)}")
+        self.engine = engine
+        self.resolution = resolution
+        # Sample being evaluated by the pyannote engine with its context, see `uemify`
+        self._shared_pair: tuple[Annotation, Annotation, MetricContext] | None = None
+
+    def compute_components(
+        self,
+        reference: Annotation,
+        hypothesis: Annotation,
+        uem: Timeline | None = None,
+        context: MetricContext | None = None,
+        **kwargs,
+    ) -> Details:
+        if self.engine == "pyannote":
+            if context is None:
+                return super().compute_components(reference, hypothesis, uem=uem, **kwargs)
+            # `uemify` gets the cropped annotations of this pair from the context
+            self._shared_pair = (reference, hypothesis, context)
+            try:
+                return super().compute_components(reference, hypothesis, uem=uem, **kwargs)
+            finally:
+                self._shared_pair = None
+        return self.compute_frame_components(self.get_frames(reference, hypothesis, uem=uem, context=context))
+
+    def uemify(
+        self,
+        reference: Annotation,
+        hypothesis: Annotation,
+        uem: Timeline | None = None,
+        collar: float = 0.0,
+        skip_overlap: bool = False,
+        returns_uem: bool = False,
+        returns_timeline: bool = False,
+    ) -> tuple:
+        """pyannote's `uemify`, sharing the annotations of the evaluated sample cropped to its UEM.
+
+        The crops are shared through the `MetricContext` by all the metrics using the same collar and overlap
+        settings. Calls on other annotations, e.g. the ones pyannote maps to the reference speakers, are not shared.
+        """
+        uemify = super().uemify
+        shared_pair = self._shared_pair
+        if shared_pair is None or shared_pair[0] is not reference or shared_pair[1] is not hypothesis:
+            return uemify(reference, hypothesis, uem, collar, skip_overlap, returns_uem, returns_timeline)
+        return shared_pair[2].get(
+            ("uemified_annotations", collar, skip_overlap, returns_uem, returns_timeline),
+            lambda: uemify(reference, hypothesis, uem, collar, skip_overlap, returns_uem, returns_timeline),
+        )
+
+    def get_frames(
+        self,
+        reference: Annotation,
+        hypothesis: Annotation,
+        uem: Timeline | None = None,
+        context: MetricContext | None = None,
+    ) -> DiarizationFrames:
+        return get_diarization_frames(
+            reference,
+            hypothesis,
+            uem=uem,
+            collar=self.collar,
+            skip_overlap=self.skip_overlap,
+            resolution=self.resolution,
+            context=context,
+        )
+
+    @abstractmethod
+    def compute_frame_components(self, frames: DiarizationFrames) -> Details:
+        pass
+
+
+@MetricRegistry.register_metric(PipelineType.DIARIZATION, MetricOptions.DER)
+class DiarizationErrorRate(FrameEngineMixin, diarization.DiarizationErrorRate):
+    """Diarization error rate, optionally resolved over time.
+
+    With `window` (in seconds) the components of each sample are also summed per window of the sample under
+    `TIME_RESOLVED`, to locate where errors occur on long-form audio. Windows come from a single sweep over the
+    frames of the sample, whatever the engine, and all share the optimal mapping of the whole sample so that
+    speaker confusion is consistent over time rather than remapped per window.
+    """
+
+    def __init__(self, *args, window: float | None = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.window = validate_window(window)
+
+    def compute_components(
+        self,
+        reference: Annotation,
+        hypothesis: Annotation,
+        uem: Timeline | None = None,
+        context: MetricContext | None = None,
+        **kwargs,
+    ) -> Details:
+        if self.window is None:
+            return super().compute_components(reference, hypothesis, uem=uem, context=context, **kwargs)
+
+        # The frame engine and the windows share the frames of the sample
+        context = context if context is not None else MetricContext()
+        detail = super().compute_components(reference, hypothesis, uem=uem, context=context, **kwargs)
+        frames = self.get_frames(reference, hypothesis, uem=uem, context=context)
+        frame_errors = self.get_frame_errors(frames)
+        num_frames = len(frames.evaluated)
+        # Frames fall in the window of their center
+        times = frames.to_duration(np.arange(num_frames) + 0.5)
+        num_windows = int(np.ceil(frames.to_duration(num_frames) / self.window))
+        detail[TIME_RESOLVED] = TimeResolvedComponents(
+            self.window,
+            {
+                name: frames.to_duration(sum_per_window(errors, times, self.window, num_windows))
+                for name, errors in frame_errors.items()
+            },
+        )
+        return detail
+
+    def get_frame_errors(self, frames: DiarizationFrames) -> dict[str, np.ndarray]:
+        """Components of each frame, in frames."""
+        num_ref = frames.reference_speaker_count
+        num_hyp = frames.hypothesis_speaker_count
+        # Segments of a reference speaker match as many segments of its mapped hypothesis speaker
+        correct = np.zeros(len(num_ref), dtype=np.int64)
+        for i, j in frames.optimal_mapping:
+            correct += np.minimum(frames.reference_counts[:, i], frames.hypothesis_counts[:, j])
+
+        return {
+            IER_TOTAL: num_ref,
+            IER_CORRECT: correct,
+            IER_CONFUSION: np.minimum(num_ref, num_hyp) - correct,
+            IER_MISS: np.maximum(num_ref - num_hyp, 0),
+            IER_FALSE_ALARM: np.maximum(num_hyp - num_ref, 0),
+        }
+
+    def compute_frame_components(self, frames: DiarizationFrames) -> Details:
+        detail = self.init_components()
+        for name, errors in self.get_frame_errors(frames).items():
+            detail[name] = frames.to_duration(errors.sum())
+        return detail
+
+
+@MetricRegistry.register_metric(PipelineType.DIARIZATION, MetricOptions.JER)
+class JaccardErrorRate(FrameEngineMixin, diarization.JaccardErrorRate):
+    def compute_frame_components(self, frames: DiarizationFrames) -> Details:
+        ref_durations = frames.reference_activity.sum(axis=0)
+        hyp_durations = frames.hypothesis_activity.sum(axis=0)
+        # Speakers without a mapped hypothesis speaker have a JER of 1
+        speaker_errors = np.ones(len(ref_durations))
+        for i, j in frames.optimal_mapping:
+            intersection = np.count_nonzero(frames.reference_activity[:, i] & frames.hypothesis_activity[:, j])
+            union = ref_durations[i] + hyp_durations[j] - intersection
+            speaker_errors[i] = (union - intersection) / union
+
+        detail = self.init_components()
+        detail[diarization.JER_SPEAKER_COUNT] = len(speaker_errors)
+        detail[diarization.JER_SPEAKER_ERROR] = speaker_errors.sum()
+        return detail
+
+
+@MetricRegistry.register_metric(PipelineType.DIARIZATION, MetricOptions.DIARIZATION_PURITY)
+class DiarizationPurity(FrameEngineMixin, diarization.DiarizationPurity):
+    def compute_frame_components(self, frames: DiarizationFrames) -> Details:
+        detail = self.init_components()
+        if frames.reference_activity.shape[1] == 0:
+            return detail
+
+        matrix = frames.cooccurrence
+        largest = matrix.max(axis=0)
+        duration = matrix.sum(axis=0)
+        if self.weighted:
+            detail[diarization.PURITY_CORRECT] = largest.sum() if matrix.size else 0.0
+            detail[diarization.PURITY_TOTAL] = duration.sum()
+        else:
+            detail[diarization.PURITY_CORRECT] = (largest / duration).sum()
+            detail[diarization.PURITY_TOTAL] = len(largest)
+        return detail
+
+
+@MetricRegistry.register_metric(PipelineType.DIARIZATION, MetricOptions.DIARIZATION_PURITY_COVERAGE_FMEASURE)
+class DiarizationPurityCoverageFMeasure(FrameEngineMixin, diarization.DiarizationPurityCoverageFMeasure):
+    def compute_frame_components(self, frames: DiarizationFrames) -> Details:
+        matrix = frames.cooccurrence
+        if matrix.size:
+            largest_class, largest_cluster = matrix.max(axis=0), matrix.max(axis=1)
+        else:
+            largest_class, largest_cluster = np.zeros(matrix.shape[1]), np.zeros(matrix.shape[0])
+        duration_cluster = matrix.sum(axis=0)
+        duration_class = matrix.sum(axis=1)
+
+        detail = self.init_components()
+        if self.weighted:
+            detail[diarization.PURITY_COVERAGE_LARGEST_CLASS] = largest_class.sum()
+            detail[diarization.PURITY_COVERAGE_TOTAL_CLUSTER] = duration_cluster.sum()
+            detail[diarization.PURITY_COVERAGE_LARGEST_CLUSTER] = largest_cluster.sum()
+            detail[diarization.PURITY_COVERAGE_TOTAL_CLASS] = duration_class.sum()
+        else:
+            detail[diarization.PURITY_COVERAGE_LARGEST_CLASS] = (largest_class / duration_cluster).sum()
+            detail[diarization.PURITY_COVERAGE_TOTAL_CLUSTER] = len(largest_class)
+            detail[diarization.PURITY_COVERAGE_LARGEST_CLUSTER] = (largest_cluster / duration_class).sum()
+            detail[diarization.PURITY_COVERAGE_TOTAL_CLASS] = len(largest_cluster)
+
+        # pyannote also reports the purity and coverage of the sample
+        purity, coverage, _ = self.compute_metrics(detail=detail)
+        detail[diarization.PURITY_NAME] = purity
+        detail[diarization.COVERAGE_NAME] = coverage
+        return detail
+
+
+@MetricRegistry.register_metric(PipelineType.DIARIZATION, MetricOptions.DIARIZATION_HOMOGENEITY)
+class DiarizationHomogeneity(FrameEngineMixin, diarization.DiarizationHomogeneity):
+    def compute_frame_components(self, frames: DiarizationFrames) -> Details:
+        matrix = frames.cooccurrence
+        duration = np.sum(matrix)
+        rduration = np.sum(matrix, axis=1)
+        hduration = np.sum(matrix, axis=0)
+
+        detail = self.init_components()
+        # Reference entropy and reference/hypothesis cross-entropy
+        ratio = np.ma.divide(rduration, duration).filled(0.0)
+        detail[diarization.HOMOGENEITY_ENTROPY] = -np.sum(ratio * np.ma.log(ratio).filled(0.0))
+        ratio = np.ma.divide(matrix, duration).filled(0.0)
+        hratio = np.ma.divide(matrix, hduration).filled(0.0)
+        detail[diarization.HOMOGENEITY_CROSS_ENTROPY] = -np.sum(ratio * np.ma.log(hratio).filled(0.0))
+        return detail
+
+
+@MetricRegistry.register_metric(PipelineType.DIARIZATION, MetricOptions.DETECTION_ERROR_RATE)
+class DetectionErrorRate(FrameEngineMixin, detection.DetectionErrorRate):
+    def compute_frame_components(self, frames: DiarizationFrames) -> Details:
+        speech = frames.speech_durations
+        return {
+            detection.DER_MISS: speech.reference - speech.both,
+            detection.DER_FALSE_ALARM: speech.hypothesis - speech.both,
+            detection.DER_TOTAL: speech.reference,
+        }
+
+
+@MetricRegistry.register_metric(PipelineType.DIARIZATION, MetricOptions.DETECTION_COST_FUNCTION)
+class DetectionCostFunction(FrameEngineMixin, detection.DetectionCostFunction):
+    def compute_frame_components(self, frames: DiarizationFrames) -> Details:
+        speech = frames.speech_durations
+        return {
+            detection.DCF_POS_TOTAL: speech.reference,
+            detection.DCF_NEG_TOTAL: speech.reference_non_speech,
+            detection.DCF_MISS: speech.reference - speech.both,
+            detection.DCF_FALSE_ALARM: speech.hypothesis - speech.both,
+        }
+
+
+@MetricRegistry.register_metric(PipelineType.DIARIZATION, MetricOptions.DETECTION_PRECISION_RECALL_FMEASURE)
+class DetectionPrecisionRecallFMeasure(FrameEngineMixin, detection.DetectionPrecisionRecallFMeasure):
+    def compute_frame_components(self, frames: DiarizationFrames) -> Details:
+        speech = frames.speech_durations
+        return {
+            detection.DFS_PRECISION_RETRIEVED: speech.hypothesis,
+            detection.DFS_RECALL_RELEVANT: speech.reference,
+            detection.DFS_RELEVANT_RETRIEVED: speech.both,
+        }
@@ -0,0 +1,231 @@
+# For licensing see accompanying LICENSE.md file.
+# Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
+
+"""Frame-based representation of a diarization shared by the diarization and detection metrics."""
+
+import warnings
+from functools import cached_property
+from typing import Literal, NamedTuple
+
+import numpy as np
+from pyannote.core import Annotation, Segment, Timeline
+from scipy.optimize import linear_sum_assignment
+
+from ..context import MetricContext
+
+
+DiarizationEngine = Literal["pyannote", "frames"]
+
+# Frame step in seconds, boundaries are placed within half a frame of their actual time
+DEFAULT_RESOLUTION = 0.01
+
+
+def to_frames(times: np.ndarray, resolution: float) -> np.ndarray:
+    """Index of the first frame whose center is at or after each time."""
+    return np.maximum(np.ceil(np.asarray(times, dtype=np.float64) / resolution - 0.5), 0).astype(np.int64)
+
+
+def get_segment_bounds(segments: list[Segment]) -> tuple[np.ndarray, np.ndarray]:
+    starts = np.array([segment.start for segment in segments], dtype=np.float64)
+    ends = np.array([segment.end for segment in segments], dtype=np.float64)
+    return starts, ends
+
+
+def get_tracks(annotation: Annotation) -> tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+    """Bounds and speaker index of each track of the annotation along with the number of speakers."""
+    speakers = {label: i for i, label in enumerate(annotation.labels())}
+    tracks = list(annotation.itertracks(yield_label=True))
+    starts, ends = get_segment_bounds([segment for segment, _, _ in tracks])
+    columns = np.array([speakers[label] for _, _, label in tracks], dtype=np.int64)
+    return starts, ends, columns, len(speakers)
+
+
+def get_active_counts(
+    starts: np.ndarray, ends: np.ndarray, columns: np.ndarray, n_frames: int, n_columns: int
+) -> np.ndarray:
+    """Number of segments active in each frame and column, from the cumulated segment boundaries."""
+    boundaries = np.zeros((n_frames + 1, n_columns), dtype=np.int32)
+    np.add.at(boundaries, (np.minimum(starts, n_frames), columns), 1)
+    np.add.at(boundaries, (np.minimum(ends, n_frames), columns), -1)
+    return np.cumsum(boundaries[:-1], axis=0)
+
+
+class SpeechDurations(NamedTuple):
+    reference: float
+    hypothesis: float
+    both: float
+    # Evaluated duration without reference speech
+    reference_non_speech: float
+
+
+class DiscretizedAnnotations(NamedTuple):
+    """Reference and hypothesis sampled on a frame grid before removing collars and overlap."""
+
+    resolution: float
+    # Frames within the UEM
+    uem: np.ndarray
+    # Number of active segments per frame (rows) and speaker (columns)
+    reference_counts: np.ndarray
+    hypothesis_counts: np.ndarray
+    # Start and end times of the reference segments, where collars are centered
+    reference_boundaries: np.ndarray
+
+
+def discretize(
+    reference: Annotation,
+    hypothesis: Annotation,
+    uem: Timeline | None = None,
+    resolution: float = DEFAULT_RESOLUTION,
+) -> DiscretizedAnnotations:
+    """Sample the annotations on a grid of `resolution` seconds spanning the UEM."""
+    if resolution <= 0:
+        raise ValueError(f"Frame resolution must be positive, got {resolution}")
+
+    if uem is None:
+        # Same approximation as pyannote's `uemify`
+        extent = reference.get_timeline().extent() | hypothesis.get_timeline().extent()
+        uem = Timeline(segments=[extent] if extent else [], uri=reference.uri)
+        warnings.warn("'uem' was approximated by the union of 'reference' and 'hypothesis' extents.")
+
+    uem_starts, uem_ends = get_segment_bounds(list(uem))
+    ref_starts, ref_ends, ref_columns, n_ref_labels = get_tracks(reference)
+    hyp_starts, hyp_ends, hyp_columns, n_hyp_labels = get_tracks(hypothesis)
+    n_frames = int(to_frames(uem_ends, resolution).max()) if len(uem_ends) else 0
+
+    uem_counts = get_active_counts(
+        to_frames(uem_starts, resolution),
+        to_frames(uem_ends, resolution),
+        np.zeros(len(uem_starts), dtype=np.int64),
+        n_frames,
+        1,
+    )
+    return DiscretizedAnnotations(
+        resolution=resolution,
+        uem=uem_counts[:, 0] > 0,
+        reference_counts=get_active_counts(
+            to_frames(ref_starts, resolution), to_frames(ref_ends, resolution), ref_columns, n_frames, n_ref_labels
+        ),
+        hypothesis_counts=get_active_counts(
+            to_frames(hyp_starts, resolution), to_frames(hyp_ends, resolution), hyp_columns, n_frames, n_hyp_labels
+        ),
+        reference_boundaries=np.concatenate([ref_starts, ref_ends]),
+    )
+
+
+class DiarizationFrames:
+    """Reference and hypothesis speaker activity sampled on a regular frame grid.
+
+    Both annotations are discretized once into frame x speaker matrices counting the active segments of each
+    speaker, see `discretize`, then restricted to the evaluated frames, i.e. the UEM minus the collars around
+    reference boundaries and, if `skip_overlap`, the overlapping speech of the reference. This is what pyannote's
+    `uemify` evaluates. The co-occurrence matrix between the reference and hypothesis speakers is then a single
+    matrix product from which every diarization and detection component is derived, see the frame engine of the
+    metrics in `diarization_metrics.py`.
+
+    Components agree with pyannote's segment-based computation to within `resolution` since each segment boundary
+    moves to the closest frame boundary. Segment counts rather than activity keep pyannote's semantics when a
+    speaker has overlapping segments.
+    """
+
+    def __init__(self, discretized: DiscretizedAnnotations, collar: float = 0.0, skip_overlap: bool = False) -> None:
+        self.resolution = resolution = discretized.resolution
+        evaluated = discretized.uem.copy()
+        if collar > 0:
+            boundaries = discretized.reference_boundaries
+            collars = get_active_counts(
+                to_frames(boundaries - 0.5 * collar, resolution),
+                to_frames(boundaries + 0.5 * collar, resolution),
+                np.zeros(len(boundaries), dtype=np.int64),
+                len(evaluated),
+                1,
+            )[:, 0]
+            evaluated &= collars == 0
+        if skip_overlap:
+            evaluated &= discretized.reference_counts.sum(axis=1) < 2
+
+        reference_counts = discretized.reference_counts
+        hypothesis_counts = discretized.hypothesis_counts
+        self.evaluated = evaluated
+        self.reference_counts = self._crop(reference_counts, evaluated)
+        self.hypothesis_counts = self._crop(hypothesis_counts, evaluated)
+
+    @staticmethod
+    def _crop(counts: np.ndarray, evaluated: np.ndarray) -> np.ndarray:
+        counts = counts * evaluated[:, None]
+        # Speakers without evaluated speech are dropped as pyannote does when cropping to the UEM
+        return counts[:, counts.any(axis=0)]
+
+    def to_duration(self, num_frames: np.ndarray | int) -> np.ndarray | float:
+        return num_frames * self.resolution
+
+    @cached_property
+    def reference_activity(self) -> np.ndarray:
+        return self.reference_counts > 0
+
+    @cached_property
+    def hypothesis_activity(self) -> np.ndarray:
+        return self.hypothesis_counts > 0
+
+    @cached_property
+    def frame_cooccurrence(self) -> np.ndarray:
+        """Co-occurrence of each reference (rows) and hypothesis (columns) speaker in frames x segment pairs."""
+        return self.reference_counts.T.astype(np.float64) @ self.hypothesis_counts.astype(np.float64)
+
+    @property
+    def cooccurrence(self) -> np.ndarray:
+        """Co-occurrence duration of each reference and hypothesis speaker, what `reference * hypothesis` gives."""
+        return self.to_duration(self.frame_cooccurrence)
+
+    @cached_property
+    def reference_speaker_count(self) -> np.ndarray:
+        """Number of reference segments active in each frame."""
+        return self.reference_counts.sum(axis=1)
+
+    @cached_property
+    def hypothesis_speaker_count(self) -> np.ndarray:
+        """Number of hypothesis segments active in each frame."""
+        return self.hypothesis_counts.sum(axis=1)
+
+    @cached_property
+    def optimal_mapping(self) -> list[tuple[int, int]]:
+        """(reference, hypothesis) speaker pairs maximizing their total co-occurrence, see `HungarianMapper`."""
+        cooccurrence = self.frame_cooccurrence
+        return [(i, j) for i, j in zip(*linear_sum_assignment(-cooccurrence)) if cooccurrence[i, j] > 0]
+
+    @cached_property
+    def speech_durations(self) -> SpeechDurations:
+        """Speech regardless of the speakers, what the detection metrics evaluate."""
+        reference_speech = self.reference_speaker_count > 0
+        hypothesis_speech = self.hypothesis_speaker_count > 0
+        return SpeechDurations(
+            self.to_duration(np.count_nonzero(reference_speech)),
+            self.to_duration(np.count_nonzero(hypothesis_speech)),
+            self.to_duration(np.count_nonzero(reference_speech & hypothesis_speech)),
+            self.to_duration(np.count_nonzero(self.evaluated & ~reference_speech)),
+        )
+
+
+def get_diarization_frames(
+    reference: Annotation,
+    hypothesis: Annotation,
+    uem: Timeline | None = None,
+    collar: float = 0.0,
+    skip_overlap: bool = False,
+    resolution: float = DEFAULT_RESOLUTION,
+    context: MetricContext | None = None,
+) -> DiarizationFrames:
+    """Get the frames of the sample shared by all the metrics evaluating it with the same settings.
+
+    Metrics with different collar or overlap settings still share the discretized annotations of the sample.
+    """
+    if context is None:
+        return DiarizationFrames(discretize(reference, hypothesis, uem, resolution), collar, skip_overlap)
+
+    # The UEM belongs to the sample, the metric settings are what distinguishes the frames of a sample
+    def compute() -> DiarizationFrames:
+        discretized = context.get(
+            ("discretized_annotations", resolution), lambda: discretize(reference, hypothesis, uem, resolution)
+        )
+        return DiarizationFrames(discretized, collar, skip_overlap)
+
+    return context.get(("diarization_frames", collar, skip_overlap, resolution), compute)
@@ -1,21 +1,9 @@
 # For licensing see accompanying LICENSE.md file.
 # Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
 
-from typing import Callable, ClassVar, Type, TypeVar
+from typing import Any, Callable, ClassVar, Type, TypeVar
 
 from pyannote.metrics.base import BaseMetric
-from pyannote.metrics.detection import (
-    DetectionCostFunction,
-    DetectionErrorRate,
-    DetectionPrecisionRecallFMeasure,
-)
-from pyannote.metrics.diarization import (
-    DiarizationErrorRate,
-    DiarizationHomogeneity,
-    DiarizationPurity,
-    DiarizationPurityCoverageFMeasure,
-    JaccardErrorRate,
-)
 
 from ..types import PipelineType
 from .metric import MetricOptions
@@ -23,6 +11,21 @@ from .metric import MetricOptions
 
 T = TypeVar("T", bound=BaseMetric)
 
+# Metric kwarg holding the list of kwargs overrides of a parameter sweep
+SWEEP_KEY = "sweep"
+
+
+def get_variant_name(metric_option: MetricOptions, overrides: dict[str, Any]) -> str:
+    """Name under which a variant of a parameter sweep is reported, e.g. `der[collar=0.25,skip_overlap=True]`."""
+    if not overrides:
+        return metric_option.value
+    return f"{metric_option.value}[{','.join(f'{key}={value}' for key, value in overrides.items())}]"
+
+
+def is_variant_of(metric_name: str, metric_option: MetricOptions) -> bool:
+    """Whether `metric_name` is reported by `metric_option`, either directly or by a variant of a sweep."""
+    return metric_name == metric_option.value or metric_name.startswith(f"{metric_option.value}[")
+
 
 class MetricRegistry:
     """Registry for metrics by pipeline type.
@@ -116,6 +119,47 @@ class MetricRegistry:
         metric_info = cls._metrics[metric_option]
         return metric_info["metric_class"](**kwargs)
 
+    @classmethod
+    def get_metric_variants(cls, metric_option: MetricOptions, **kwargs) -> dict[str, BaseMetric]:
+        """Get the metric instances of a metric option keyed by the name their results are reported under.
+
+        Without a `sweep` kwarg this is the single metric named after the metric option. Otherwise `sweep` is a
+        list of kwargs overrides and one metric is created per override, e.g. for DER
+
+            der:
+              collar: 0.0
+              engine: frames
+              sweep:
+                - {collar: 0.0}
+                - {collar: 0.25}
+                - {collar: 0.25, skip_overlap: true}
+
+        reports `der[collar=0.0]`, `der[collar=0.25]` and `der[collar=0.25,skip_overlap=True]`. All the variants
+        evaluate a sample with the same `MetricContext` so whatever they have in common, e.g. the discretized
+        annotations of the frame-based diarization metrics, is computed once.
+
+        Args:
+            metric_option: The metric option to get
+            **kwargs: Arguments passed to the constructor of every variant, and the `sweep` overrides
+
+        Returns:
+            The metric instances keyed by their reported name
+
+        Raises:
+            ValueError: If two variants have the same name
+        """
+        sweep = kwargs.pop(SWEEP_KEY, None)
+        if not sweep:
+            return {metric_option.value: cls.get_metric(metric_option, **kwargs)}
+
+        variants = {}
+        for overrides in sweep:
+            name = get_variant_name(metric_option, dict(overrides))
+            if name in variants:
+                raise ValueError(f"Duplicate variant {name} in the sweep of {metric_option.value}")
+            variants[name] = cls.get_metric(metric_option, **{**kwargs, **overrides})
+        return variants
+
     @classmethod
     def get_available_metrics(cls, pipeline_type: PipelineType) -> list[MetricOptions]:
         """Get all available metrics for a specific pipeline type.
@@ -131,31 +175,3 @@ class MetricRegistry:
             for metric_option, metric_info in cls._metrics.items()
             if pipeline_type in metric_info["supported_pipelines"]
         ]
-
-
-# Register all existing and interesting metrics from pyannote.metrics
-# Custom metrics will be registered in their own files
-MetricRegistry.register(DiarizationErrorRate, PipelineType.DIARIZATION, MetricOptions.DER)
-MetricRegistry.register(JaccardErrorRate, PipelineType.DIARIZATION, MetricOptions.JER)
-MetricRegistry.register(DiarizationPurity, PipelineType.DIARIZATION, MetricOptions.DIARIZATION_PURITY)
-MetricRegistry.register(
-    DiarizationPurityCoverageFMeasure,
-    PipelineType.DIARIZATION,
-    MetricOptions.DIARIZATION_PURITY_COVERAGE_FMEASURE,
-)
-MetricRegistry.register(
-    DiarizationHomogeneity,
-    PipelineType.DIARIZATION,
-    MetricOptions.DIARIZATION_HOMOGENEITY,
-)
-MetricRegistry.register(DetectionErrorRate, PipelineType.DIARIZATION, MetricOptions.DETECTION_ERROR_RATE)
-MetricRegistry.register(
-    DetectionCostFunction,
-    PipelineType.DIARIZATION,
-    MetricOptions.DETECTION_COST_FUNCTION,
-)
-MetricRegistry.register(
-    DetectionPrecisionRecallFMeasure,
-    PipelineType.DIARIZATION,
-    MetricOptions.DETECTION_PRECISION_RECALL_FMEASURE,
-)
@@ -8,3 +8,4 @@ from .latency_metrics import (
     StreamingLatency,
 )
 from .num_corrections import NumDeletions, NumInsertions, NumSubstitutions
+from .streaming_analysis import StreamingAnalysis, get_streaming_analysis
@@ -1,25 +1,23 @@
 # For licensing see accompanying LICENSE.md file.
 # Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
 
-import string
 import warnings
 
-import jiwer
 import numpy as np
 import scipy.stats
 from argmaxtools.utils import get_logger
 from pyannote.metrics.base import BaseMetric
 from pyannote.metrics.types import Details, MetricComponents
-from transformers.models.whisper.english_normalizer import BasicTextNormalizer
 
-from ...pipeline_prediction import StreamingTranscript, Transcript, Word
+from ...pipeline_prediction import StreamingTranscript, Transcript
 from ...types import PipelineType
+from ..context import MetricContext
 from ..metric import MetricOptions
 from ..registry import MetricRegistry
+from ..time_resolved import TIME_RESOLVED, TimeResolvedComponents, sum_per_window, validate_window
+from .streaming_analysis import get_streaming_analysis
 
 
-normalizer = BasicTextNormalizer()
-
 logger = get_logger(__name__)
 STREAMING_LATENCY = "streaming_latency"
 AVG_LAT = "scaled_avg_latency"
@@ -52,122 +50,49 @@ class BaseStreamingLatency(BaseMetric):
     the content in result t.
     """
 
-    def map_hypot_idx_to_ref_idx(self, hypot_idx: int, alignment_chunks: list[jiwer.AlignmentChunk]) -> int:
-        for chunk in alignment_chunks:
-            if chunk.hyp_start_idx <= hypot_idx < chunk.hyp_end_idx:
-                offset = hypot_idx - chunk.hyp_start_idx
-                return chunk.ref_start_idx + offset
-
-    def compute_min_max_latency(
-        self,
-        interim_results: list[str],
-        audio_cursor: list[float],
-        words: list[Word],
-        model_timestamps: list[list[dict[str, float]]],
-        model_timestamps_based: bool = False,
-    ):
-        # If API doesn't support Hypothesis/Confirmed text return None
-        if interim_results is None or audio_cursor is None:
-            return None, None, None
-        # If API doesn't support word timestamps return None
-        if (model_timestamps is None) and model_timestamps_based:
-            return None, None, None
-
-        transcript_gt = " ".join(word.word for word in words)
-        transcript_cursor_gt = []
-        gt_min_latency_l = []
-        gt_max_latency_l = []
-        gt_audio_duration = []
-        if model_timestamps_based:
-            model_min_latency_l = []
-            model_max_latency_l = []
-            transcript_cursor_model = []
-            model_audio_duration = []
-
-        transcript_gt = transcript_gt.translate(str.maketrans("", "", string.punctuation))
-        for l in range(len(interim_results)):
-            out = jiwer.process_words(normalizer(transcript_gt), normalizer(interim_results[l]))
-            alignments_l = [out.alignments[0][i].type for i in range(len(out.alignments[0]))]
-
-            indices = [i for i, val in enumerate(alignments_l) if val == "equal" or val == "substitute"]
-
-            if indices:
-                first_index = indices[0]
-                last_index = indices[-1]
-                ref_start = out.alignments[0][first_index].ref_start_idx
-                ref_end = out.alignments[0][last_index].ref_end_idx
-                if l == 0:
-                    start_timestamp = words[ref_start].start
-                else:
-                    if (normalizer(interim_results[l - 1]) == " ") or (normalizer(interim_results[l]) == " "):
-                        continue
-                    # Find the updated segment
-                    out_diff = jiwer.process_words(
-                        normalizer(interim_results[l - 1]),
-                        normalizer(interim_results[l]),
-                    )
-                    alignments_types = [out_diff.alignments[0][i].type for i in range(len(out_diff.alignments[0]))]
-                    indices_diff = [
-                        i for i, val in enumerate(alignments_types) if val == "insert" or val == "substitute"
-                    ]
-                    if indices_diff:
-                        diff_ref_start = out_diff.alignments[0][indices_diff[0]].hyp_start_idx
-                        # Map Start idx of updated segment to GT Transcript idx
-                        actual_idx = self.map_hypot_idx_to_ref_idx(diff_ref_start, out.alignments[0])
-                        try:
-                            start_timestamp = words[actual_idx].start
-                        # TODO: Handle Edge Cases
-                        except Exception:
-                            continue
-                    else:
-                        # Current behaviour is when there is no new word,
-                        # exclude this interim result from latency calculation
-                        continue
-
-                end_timestamp = words[ref_end - 1].end
-                gt_audio_duration.append(end_timestamp - start_timestamp)
-                if model_timestamps_based:
-                    start_timestamp_model = model_timestamps[l][0]["start"]
-                    end_timestamp_model = model_timestamps[l][-1]["end"]
-                    transcript_cursor_model.append(end_timestamp_model)
-                    model_audio_duration.append(end_timestamp_model - start_timestamp_model)
-
-                transcript_cursor_gt.append(start_timestamp + (end_timestamp - start_timestamp))
-                gt_min_latency_l.append(audio_cursor[l] - transcript_cursor_gt[-1])
-                if model_timestamps_based:
-                    model_min_latency_l.append(audio_cursor[l] - transcript_cursor_model[-1])
-                if len(transcript_cursor_gt) < 2:
-                    gt_max_latency_l.append(audio_cursor[l])
-                    if model_timestamps_based:
-                        model_max_latency_l.append(audio_cursor[l])
-                else:
-                    gt_max_latency_l.append(audio_cursor[l] - transcript_cursor_gt[-2])
-                    if model_timestamps_based:
-                        model_max_latency_l.append(audio_cursor[l] - transcript_cursor_model[-2])
-                # Exclude negative latency values.
-                # A negative latency indicates that the system predicted the transcript
-                # before receiving the entire corresponding audio. This is an edge case.
-                # Map those latencies to zero
-                gt_max_latency_l[-1] = 0 if gt_max_latency_l[-1] < 0 else gt_max_latency_l[-1]
-                gt_min_latency_l[-1] = 0 if gt_min_latency_l[-1] < 0 else gt_min_latency_l[-1]
-                if model_timestamps_based:
-                    model_max_latency_l[-1] = 0 if model_max_latency_l[-1] < 0 else model_max_latency_l[-1]
-                    model_min_latency_l[-1] = 0 if model_min_latency_l[-1] < 0 else model_min_latency_l[-1]
-
-                logger.debug("Min GT Latency: " + str(gt_min_latency_l[-1]))
-                logger.debug("Max GT Latency: " + str(gt_max_latency_l[-1]))
-                if model_timestamps_based:
-                    logger.debug("Model Min Latency: " + str(model_min_latency_l[-1]))
-                    logger.debug("Model Max Latency: " + str(model_max_latency_l[-1]))
-
-        if model_timestamps_based:
-            return model_min_latency_l, model_max_latency_l, model_audio_duration
-        else:
-            return gt_min_latency_l, gt_max_latency_l, gt_audio_duration
+    def __init__(self, window: float | None = None, **kwargs) -> None:
+        super().__init__(**kwargs)
+        # With `window` (in seconds) the components are also summed per window of the stream under
+        # `TIME_RESOLVED`, each interim result falling in the window of the audio cursor it was received at
+        self.window = validate_window(window)
 
     def _supports_paired_evaluation(self) -> bool:
         return True
 
+    def compute_latency_components(
+        self,
+        reference: Transcript,
+        hypothesis: StreamingTranscript,
+        context: MetricContext | None,
+        confirmed: bool,
+        model_timestamps_based: bool,
+    ) -> Details:
+        """Average latency of the interim results of a track weighted by the audio they transcribe."""
+        latency_name, duration_name = self.metric_components()
+        analysis = get_streaming_analysis(reference, hypothesis, context)
+        min_latency_l, max_latency_l, audio_duration = analysis.get_latencies(
+            confirmed=confirmed, model_timestamps_based=model_timestamps_based
+        )
+        if max_latency_l is None or min_latency_l is None:
+            return {latency_name: None, duration_name: 0}
+
+        avg_latency = [(min + max) / 2 for min, max in zip(min_latency_l, max_latency_l)]
+        detail = {
+            latency_name: sum(avg_lat * aud_dur for avg_lat, aud_dur in zip(avg_latency, audio_duration)),
+            duration_name: np.sum(audio_duration),
+        }
+
+        if self.window is not None:
+            cursors = analysis.get_audio_cursors(confirmed)
+            detail[TIME_RESOLVED] = TimeResolvedComponents(
+                self.window,
+                {
+                    latency_name: sum_per_window(np.multiply(avg_latency, audio_duration), cursors, self.window),
+                    duration_name: sum_per_window(audio_duration, cursors, self.window),
+                },
+            )
+        return detail
+
     def confidence_interval(self, alpha: float = 0.9) -> tuple[float, tuple[float, float]]:
         if self.results_[0][0] == "NA":
             return None, (None, None)
@@ -239,23 +164,16 @@ class StreamingLatency(BaseStreamingLatency):
     def metric_components(cls) -> MetricComponents:
         return [AVG_LAT, AUD_DUR]
 
-    def compute_components(self, reference: Transcript, hypothesis: StreamingTranscript, **kwargs) -> Details:
-        (
-            gt_min_latency_l,
-            gt_max_latency_l,
-            gt_audio_duration,
-        ) = self.compute_min_max_latency(
-            hypothesis.interim_results, hypothesis.audio_cursor, reference.words, None
-        )  # GT Timestamp Based
-        if gt_max_latency_l is None or gt_min_latency_l is None:
-            return {AVG_LAT: None, AUD_DUR: 0}
-        avg_latency = [(min + max) / 2 for min, max in zip(gt_min_latency_l, gt_max_latency_l)]
-        detail = {
-            AVG_LAT: sum(avg_lat * aud_dur for avg_lat, aud_dur in zip(avg_latency, gt_audio_duration)),
-            AUD_DUR: np.sum(gt_audio_duration),
-        }
-
-        return detail
+    def compute_components(
+        self,
+        reference: Transcript,
+        hypothesis: StreamingTranscript,
+        context: MetricContext | None = None,
+        **kwargs,
+    ) -> Details:
+        return self.compute_latency_components(
+            reference, hypothesis, context, confirmed=False, model_timestamps_based=False
+        )
 
     def compute_metric(self, detail: Details | None) -> float:
         if detail[AUD_DUR] == 0:
@@ -273,27 +191,16 @@ class ConfirmedStreamingLatency(BaseStreamingLatency):
     def metric_components(cls) -> MetricComponents:
         return [CONFIRMED_AVG_LAT, CONFIRMED_AUD_DUR]
 
-    def compute_components(self, reference: Transcript, hypothesis: StreamingTranscript, **kwargs) -> Details:
-        (
-            gt_min_latency_l,
-            gt_max_latency_l,
-            gt_audio_duration,
-        ) = super().compute_min_max_latency(
-            hypothesis.confirmed_interim_results,
-            hypothesis.confirmed_audio_cursor,
-            reference.words,
-            None,
-        )  # GT Timestamp Based
-        if gt_max_latency_l is None or gt_min_latency_l is None:
-            return {CONFIRMED_AVG_LAT: None, CONFIRMED_AUD_DUR: 0}
-
-        avg_latency = [(min + max) / 2 for min, max in zip(gt_min_latency_l, gt_max_latency_l)]
-        detail = {
-            CONFIRMED_AVG_LAT: sum(avg_lat * aud_dur for avg_lat, aud_dur in zip(avg_latency, gt_audio_duration)),
-            CONFIRMED_AUD_DUR: np.sum(gt_audio_duration),
-        }
-
-        return detail
+    def compute_components(
+        self,
+        reference: Transcript,
+        hypothesis: StreamingTranscript,
+        context: MetricContext | None = None,
+        **kwargs,
+    ) -> Details:
+        return self.compute_latency_components(
+            reference, hypothesis, context, confirmed=True, model_timestamps_based=False
+        )
 
     def compute_metric(self, detail: Details | None) -> float:
         if detail[CONFIRMED_AUD_DUR] == 0:
@@ -314,30 +221,16 @@ class ModelTimestampBasedConfirmedStreamingLatency(BaseStreamingLatency):
     def metric_components(cls) -> MetricComponents:
         return [MODEL_CONFIRMED_AVG_LAT, MODEL_CONFIRMED_AUD_DUR]
 
-    def compute_components(self, reference: Transcript, hypothesis: StreamingTranscript, **kwargs) -> Details:
-        (
-            model_min_latency_l,
-            model_max_latency_l,
-            model_audio_duration,
-        ) = self.compute_min_max_latency(
-            hypothesis.confirmed_interim_results,
-            hypothesis.confirmed_audio_cursor,
-            reference.words,
-            hypothesis.model_timestamps_confirmed,
-            model_timestamps_based=True,
+    def compute_components(
+        self,
+        reference: Transcript,
+        hypothesis: StreamingTranscript,
+        context: MetricContext | None = None,
+        **kwargs,
+    ) -> Details:
+        return self.compute_latency_components(
+            reference, hypothesis, context, confirmed=True, model_timestamps_based=True
         )
-        if model_min_latency_l is None or model_max_latency_l is None:
-            return {MODEL_CONFIRMED_AVG_LAT: None, MODEL_CONFIRMED_AUD_DUR: 0}
-
-        avg_latency = [(min + max) / 2 for min, max in zip(model_min_latency_l, model_max_latency_l)]
-        detail = {
-            MODEL_CONFIRMED_AVG_LAT: sum(
-                avg_lat * aud_dur for avg_lat, aud_dur in zip(avg_latency, model_audio_duration)
-            ),
-            MODEL_CONFIRMED_AUD_DUR: np.sum(model_audio_duration),
-        }
-
-        return detail
 
     def compute_metric(self, detail: Details | None) -> float:
         if detail[MODEL_CONFIRMED_AUD_DUR] == 0:
@@ -355,28 +248,16 @@ class ModelTimestampBasedStreamingLatency(BaseStreamingLatency):
     def metric_components(cls) -> MetricComponents:
         return [MODEL_AVG_LAT, MODEL_AUD_DUR]
 
-    def compute_components(self, reference: Transcript, hypothesis: StreamingTranscript, **kwargs) -> Details:
-        (
-            model_min_latency_l,
-            model_max_latency_l,
-            model_audio_duration,
-        ) = super().compute_min_max_latency(
-            hypothesis.interim_results,
-            hypothesis.audio_cursor,
-            reference.words,
-            hypothesis.model_timestamps_hypothesis,
-            model_timestamps_based=True,
+    def compute_components(
+        self,
+        reference: Transcript,
+        hypothesis: StreamingTranscript,
+        context: MetricContext | None = None,
+        **kwargs,
+    ) -> Details:
+        return self.compute_latency_components(
+            reference, hypothesis, context, confirmed=False, model_timestamps_based=True
         )
-        if model_min_latency_l is None or model_max_latency_l is None:
-            return {MODEL_AVG_LAT: None, MODEL_AUD_DUR: 0}
-
-        avg_latency = [(min + max) / 2 for min, max in zip(model_min_latency_l, model_max_latency_l)]
-        detail = {
-            MODEL_AVG_LAT: sum(avg_lat * aud_dur for avg_lat, aud_dur in zip(avg_latency, model_audio_duration)),
-            MODEL_AUD_DUR: np.sum(model_audio_duration),
-        }
-
-        return detail
 
     def compute_metric(self, detail: Details | None) -> float:
         if detail[MODEL_AUD_DUR] == 0:
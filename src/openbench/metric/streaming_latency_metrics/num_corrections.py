@@ -3,17 +3,17 @@
 
 import warnings
 
-import jiwer
 import scipy.stats
 from argmaxtools.utils import get_logger
 from pyannote.metrics.base import BaseMetric
 from pyannote.metrics.types import Details, MetricComponents
-from transformers.models.whisper.english_normalizer import BasicTextNormalizer
 
 from ...pipeline_prediction import StreamingTranscript, Transcript
 from ...types import PipelineType
+from ..context import MetricContext
 from ..metric import MetricOptions
 from ..registry import MetricRegistry
+from .streaming_analysis import get_streaming_analysis
 
 
 logger = get_logger(__name__)
@@ -21,37 +21,30 @@ NUM_DELETIONS = "num_deletions"
 NUM_SUBSTITUTIONS = "num_substitutions"
 NUM_INSERTIONS = "num_insertions"
 
-normalizer = BasicTextNormalizer()
-
 
 class BaseNumCorrections(BaseMetric):
     """Metric Calculation"""
 
-    def compute_num_corrections(self, interim_results, correction_type):
-        if interim_results is None:
+    def compute_num_corrections(
+        self,
+        reference: Transcript,
+        hypothesis: StreamingTranscript,
+        correction_type: str,
+        context: MetricContext | None = None,
+    ) -> int | None:
+        # The counts of the three correction types come from a single pass shared through the context
+        correction_counts = get_streaming_analysis(reference, hypothesis, context).correction_counts
+        if correction_counts is None:
             return None
-        n_deletion = 0
-        n_subs = 0
-        n_insertion = 0
-        for f in range(len(interim_results) - 1):
-            out = jiwer.process_words(normalizer(interim_results[f + 1]), normalizer(interim_results[f]))
-            prev_len = len(out.hypotheses[0])
-            for alig in out.alignments[0]:
-                if alig.type == "delete" and alig.ref_start_idx < prev_len:
-                    n_deletion = n_deletion + n_subs + alig.ref_end_idx - alig.ref_start_idx
-                elif alig.type == "substitute":
-                    n_subs = n_subs + alig.ref_end_idx - alig.ref_start_idx
-                elif alig.type == "insert":
-                    n_insertion = n_insertion + (alig.ref_end_idx - alig.ref_start_idx) + 1
 
         if correction_type == "insertion":
             # Intentionally Flipped
-            return n_deletion
+            return correction_counts.num_deletions
         elif correction_type == "substitutions":
-            return n_subs
+            return correction_counts.num_substitutions
         elif correction_type == "deletion":
             # Intentionally Flipped
-            return n_insertion
+            return correction_counts.num_insertions
 
     def _supports_paired_evaluation(self) -> bool:
         return True
@@ -118,8 +111,14 @@ class NumDeletions(BaseNumCorrections):
     def metric_components(cls) -> MetricComponents:
         return [NUM_DELETIONS]
 
-    def compute_components(self, reference: Transcript, hypothesis: StreamingTranscript, **kwargs) -> Details:
-        (num_corrections) = self.compute_num_corrections(hypothesis.interim_results, "deletion")
+    def compute_components(
+        self,
+        reference: Transcript,
+        hypothesis: StreamingTranscript,
+        context: MetricContext | None = None,
+        **kwargs,
+    ) -> Details:
+        (num_corrections) = self.compute_num_corrections(reference, hypothesis, "deletion", context)
 
         detail = {NUM_DELETIONS: num_corrections}
 
@@ -144,8 +143,14 @@ class NumSubstitutions(BaseNumCorrections):
     def metric_components(cls) -> MetricComponents:
         return [NUM_SUBSTITUTIONS]
 
-    def compute_components(self, reference: Transcript, hypothesis: StreamingTranscript, **kwargs) -> Details:
-        (num_corrections) = self.compute_num_corrections(hypothesis.interim_results, "substitutions")
+    def compute_components(
+        self,
+        reference: Transcript,
+        hypothesis: StreamingTranscript,
+        context: MetricContext | None = None,
+        **kwargs,
+    ) -> Details:
+        (num_corrections) = self.compute_num_corrections(reference, hypothesis, "substitutions", context)
 
         if num_corrections is None:
             return {
@@ -175,8 +180,14 @@ class NumInsertions(BaseNumCorrections):
     def metric_components(cls) -> MetricComponents:
         return [NUM_INSERTIONS]
 
-    def compute_components(self, reference: Transcript, hypothesis: StreamingTranscript, **kwargs) -> Details:
-        (num_corrections) = self.compute_num_corrections(hypothesis.interim_results, "insertion")
+    def compute_components(
+        self,
+        reference: Transcript,
+        hypothesis: StreamingTranscript,
+        context: MetricContext | None = None,
+        **kwargs,
+    ) -> Details:
+        (num_corrections) = self.compute_num_corrections(reference, hypothesis, "insertion", context)
 
         if num_corrections is None:
             return {
@@ -0,0 +1,220 @@
+# For licensing see accompanying LICENSE.md file.
+# Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
+
+"""Analysis of a streaming transcript shared by all the streaming latency and correction metrics."""
+
+import string
+from functools import cached_property
+from typing import NamedTuple
+
+from argmaxtools.utils import get_logger
+
+from ...pipeline_prediction import StreamingTranscript, Transcript
+from ..context import MetricContext
+from .text_alignment import get_aligner, get_alignment, get_edits, normalize_text
+
+
+logger = get_logger(__name__)
+
+
+class LatencyEvent(NamedTuple):
+    """Interim result used in the latency computation and the reference audio it transcribes."""
+
+    index: int
+    start_timestamp: float
+    end_timestamp: float
+
+
+class Latencies(NamedTuple):
+    min_latency: list[float] | None
+    max_latency: list[float] | None
+    audio_duration: list[float] | None
+
+
+class CorrectionCounts(NamedTuple):
+    num_deletions: int
+    num_substitutions: int
+    num_insertions: int
+
+
+class StreamingAnalysis:
+    """Latencies and corrections of a streaming transcript against its reference.
+
+    All the streaming metrics evaluating a sample read from the same analysis, see `get_streaming_analysis`,
+    so the interim results of each track (hypothesis and confirmed) are aligned against the reference once
+    whatever the number of metrics and timestamp variants. Each part is computed the first time it is needed.
+    """
+
+    def __init__(
+        self,
+        reference: Transcript,
+        hypothesis: StreamingTranscript,
+        context: MetricContext | None = None,
+    ) -> None:
+        self.reference = reference
+        self.hypothesis = hypothesis
+        self.context = context if context is not None else MetricContext()
+        self._latency_events: dict[bool, list[LatencyEvent]] = {}
+        self._latencies: dict[tuple[bool, bool], Latencies] = {}
+
+    def get_track(
+        self, confirmed: bool
+    ) -> tuple[list[str] | None, list[float] | None, list[list[dict[str, float]]] | None]:
+        """Interim results, audio cursor and model timestamps of the hypothesis or confirmed track."""
+        if confirmed:
+            return (
+                self.hypothesis.confirmed_interim_results,
+                self.hypothesis.confirmed_audio_cursor,
+                self.hypothesis.model_timestamps_confirmed,
+            )
+        return (
+            self.hypothesis.interim_results,
+            self.hypothesis.audio_cursor,
+            self.hypothesis.model_timestamps_hypothesis,
+        )
+
+    def get_latency_events(self, confirmed: bool) -> list[LatencyEvent]:
+        """Find the interim results adding new words and the reference words they transcribe."""
+        if confirmed in self._latency_events:
+            return self._latency_events[confirmed]
+
+        interim_results, _, _ = self.get_track(confirmed)
+        words = self.reference.words
+        context = self.context
+        transcript_gt = " ".join(word.word for word in words)
+        transcript_gt = transcript_gt.translate(str.maketrans("", "", string.punctuation))
+        normalized_transcript_gt = normalize_text(transcript_gt, context)
+
+        events = []
+        for l in range(len(interim_results)):
+            alignment = get_alignment(normalized_transcript_gt, normalize_text(interim_results[l], context), context)
+            matched_ref_span = alignment.get_matched_ref_span()
+            if matched_ref_span is None:
+                continue
+
+            ref_start, ref_end = matched_ref_span
+            if l == 0:
+                start_timestamp = words[ref_start].start
+            else:
+                if (normalize_text(interim_results[l - 1], context) == " ") or (
+                    normalize_text(interim_results[l], context) == " "
+                ):
+                    continue
+                # Find the updated segment, only the edits between consecutive interim results are needed
+                edits = get_edits(
+                    normalize_text(interim_results[l - 1], context),
+                    normalize_text(interim_results[l], context),
+                    context,
+                )
+                indices_diff = [
+                    i for i, edit in enumerate(edits) if edit.type == "insert" or edit.type == "substitute"
+                ]
+                if not indices_diff:
+                    # Current behaviour is when there is no new word,
+                    # exclude this interim result from latency calculation
+                    continue
+                # Map Start idx of updated segment to GT Transcript idx
+                actual_idx = alignment.map_hyp_index(edits[indices_diff[0]].hyp_start_idx)
+                try:
+                    start_timestamp = words[actual_idx].start
+                # TODO: Handle Edge Cases
+                except Exception:
+                    continue
+
+            events.append(LatencyEvent(l, start_timestamp, words[ref_end - 1].end))
+
+        self._latency_events[confirmed] = events
+        return events
+
+    def get_audio_cursors(self, confirmed: bool) -> list[float]:
+        """Audio cursor at each interim result used in the latency computation, in the order of the latencies."""
+        _, audio_cursor, _ = self.get_track(confirmed)
+        return [audio_cursor[event.index] for event in self.get_latency_events(confirmed)]
+
+    def get_latencies(self, confirmed: bool, model_timestamps_based: bool) -> Latencies:
+        """Min and max latencies of the interim results of a track along with the audio duration they transcribe.
+
+        The audio transcribed by an interim result is located with the reference word timestamps or, if
+        `model_timestamps_based`, with the word timestamps returned by the model. Latencies are None if the
+        API does not provide the track or the timestamps.
+        """
+        key = (confirmed, model_timestamps_based)
+        if key not in self._latencies:
+            self._latencies[key] = self._compute_latencies(confirmed, model_timestamps_based)
+        return self._latencies[key]
+
+    def _compute_latencies(self, confirmed: bool, model_timestamps_based: bool) -> Latencies:
+        interim_results, audio_cursor, model_timestamps = self.get_track(confirmed)
+        # If API doesn't support Hypothesis/Confirmed text return None
+        if interim_results is None or audio_cursor is None:
+            return Latencies(None, None, None)
+        # If API doesn't support word timestamps return None
+        if (model_timestamps is None) and model_timestamps_based:
+            return Latencies(None, None, None)
+
+        transcript_cursor = []
+        min_latency_l = []
+        max_latency_l = []
+        audio_duration = []
+        for l, start_timestamp, end_timestamp in self.get_latency_events(confirmed):
+            if model_timestamps_based:
+                start_timestamp = model_timestamps[l][0]["start"]
+                end_timestamp = model_timestamps[l][-1]["end"]
+                transcript_cursor.append(end_timestamp)
+            else:
+                transcript_cursor.append(start_timestamp + (end_timestamp - start_timestamp))
+            audio_duration.append(end_timestamp - start_timestamp)
+
+            min_latency_l.append(audio_cursor[l] - transcript_cursor[-1])
+            if len(transcript_cursor) < 2:
+                max_latency_l.append(audio_cursor[l])
+            else:
+                max_latency_l.append(audio_cursor[l] - transcript_cursor[-2])
+            # Exclude negative latency values.
+            # A negative latency indicates that the system predicted the transcript
+            # before receiving the entire corresponding audio. This is an edge case.
+            # Map those latencies to zero
+            max_latency_l[-1] = 0 if max_latency_l[-1] < 0 else max_latency_l[-1]
+            min_latency_l[-1] = 0 if min_latency_l[-1] < 0 else min_latency_l[-1]
+
+            logger.debug(f"Min {'Model' if model_timestamps_based else 'GT'} Latency: {min_latency_l[-1]}")
+            logger.debug(f"Max {'Model' if model_timestamps_based else 'GT'} Latency: {max_latency_l[-1]}")
+
+        return Latencies(min_latency_l, max_latency_l, audio_duration)
+
+    @cached_property
+    def correction_counts(self) -> CorrectionCounts | None:
+        """Count the words of interim results changed by the next interim result, None without interim results."""
+        interim_results = self.hypothesis.interim_results
+        if interim_results is None:
+            return None
+
+        context = self.context
+        aligner = get_aligner(context)
+        n_deletion = 0
+        n_subs = 0
+        n_insertion = 0
+        for f in range(len(interim_results) - 1):
+            # Only the edits are counted, no need to align the words left unchanged
+            edits = get_edits(
+                normalize_text(interim_results[f + 1], context), normalize_text(interim_results[f], context), context
+            )
+            prev_len = len(aligner.encode(normalize_text(interim_results[f], context)))
+            for alig in edits:
+                if alig.type == "delete" and alig.ref_start_idx < prev_len:
+                    n_deletion = n_deletion + n_subs + alig.ref_end_idx - alig.ref_start_idx
+                elif alig.type == "substitute":
+                    n_subs = n_subs + alig.ref_end_idx - alig.ref_start_idx
+                elif alig.type == "insert":
+                    n_insertion = n_insertion + (alig.ref_end_idx - alig.ref_start_idx) + 1
+
+        return CorrectionCounts(n_deletion, n_subs, n_insertion)
+
+
+def get_streaming_analysis(
+    reference: Transcript, hypothesis: StreamingTranscript, context: MetricContext | None = None
+) -> StreamingAnalysis:
+    """Get the analysis of the sample shared by all the streaming metrics evaluating it."""
+    if context is None:
+        return StreamingAnalysis(reference, hypothesis)
+    return context.get("streaming_analysis", lambda: StreamingAnalysis(reference, hypothesis, context))
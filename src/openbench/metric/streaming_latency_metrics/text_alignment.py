@@ -0,0 +1,143 @@
+# For licensing see accompanying LICENSE.md file.
+# Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
+
+"""Normalization and alignment of streaming transcripts, memoized in the sample's `MetricContext`."""
+
+from bisect import bisect_right
+
+import jiwer
+from rapidfuzz.distance import Levenshtein, Opcodes
+from transformers.models.whisper.english_normalizer import BasicTextNormalizer
+
+from ..context import MetricContext
+from ..word_error_metrics.alignment import tokenize_words
+
+
+normalizer = BasicTextNormalizer()
+
+# Number of word codes compared at once when looking for the common prefix of two texts
+PREFIX_BLOCK_SIZE = 1024
+
+
+class WordAlignment:
+    """Alignment chunks of `jiwer.process_words` stored as lists of chunk types and word indices.
+
+    Long transcripts have many chunks per interim result, this avoids creating a `jiwer.AlignmentChunk` for
+    each of them when only a few are looked at.
+    """
+
+    def __init__(self, opcodes: Opcodes) -> None:
+        tags, ref_starts, ref_ends, hyp_starts, hyp_ends = zip(*opcodes.as_list()) if opcodes else ((),) * 5
+        self.types = ["substitute" if tag == "replace" else tag for tag in tags]
+        self.ref_starts, self.ref_ends = ref_starts, ref_ends
+        self.hyp_starts, self.hyp_ends = hyp_starts, hyp_ends
+
+    def get_matched_ref_span(self) -> tuple[int, int] | None:
+        """Reference words spanned by the "equal" and "substitute" chunks, None if there are none."""
+        matched = [i for i, chunk_type in enumerate(self.types) if chunk_type == "equal" or chunk_type == "substitute"]
+        if not matched:
+            return None
+        return self.ref_starts[matched[0]], self.ref_ends[matched[-1]]
+
+    def map_hyp_index(self, hyp_idx: int) -> int | None:
+        """Map a hypothesis word index to the reference index at the same offset of its chunk."""
+        # Hypothesis ranges of the chunks are sorted and disjoint, the first one ending after `hyp_idx` is the
+        # only one that can contain it
+        i = bisect_right(self.hyp_ends, hyp_idx)
+        if i < len(self.hyp_ends) and self.hyp_starts[i] <= hyp_idx:
+            return self.ref_starts[i] + hyp_idx - self.hyp_starts[i]
+        return None
+
+
+class IncrementalAligner:
+    """Aligns the successive interim results of a stream, giving the same chunks as `jiwer.process_words`.
+
+    Each text is tokenized once and encoded as a string with one character per distinct word, so that
+    rapidfuzz aligns the codes directly instead of jiwer transforming the whole reference for every interim
+    result. Consecutive interim results mostly share their beginning and end; rapidfuzz never edits a common
+    prefix or suffix, so their edits are found by aligning only the part in between.
+    """
+
+    def __init__(self) -> None:
+        self.vocabulary: dict[str, int] = {}
+        self.encoded_texts: dict[str, str] = {}
+
+    def encode(self, text: str) -> str:
+        if text not in self.encoded_texts:
+            vocabulary = self.vocabulary
+            self.encoded_texts[text] = "".join(
+                chr(vocabulary.setdefault(token, len(vocabulary))) for token in tokenize_words([text])
+            )
+        return self.encoded_texts[text]
+
+    @staticmethod
+    def to_chunks(opcodes: Opcodes, offset: int = 0) -> list[jiwer.AlignmentChunk]:
+        return [
+            jiwer.AlignmentChunk(
+                type=opcode.tag,
+                ref_start_idx=opcode.src_start + offset,
+                ref_end_idx=opcode.src_end + offset,
+                hyp_start_idx=opcode.dest_start + offset,
+                hyp_end_idx=opcode.dest_end + offset,
+            )
+            for opcode in opcodes
+        ]
+
+    def align(self, truth: str, hypothesis: str) -> WordAlignment:
+        """Align all the words of two texts."""
+        truth_codes = self.encode(truth)
+        if len(truth_codes) == 0:
+            # Same error as jiwer which does not support empty references
+            raise ValueError("one or more references are empty strings")
+        return WordAlignment(Levenshtein.opcodes(truth_codes, self.encode(hypothesis)))
+
+    def get_edits(self, truth: str, hypothesis: str) -> list[jiwer.AlignmentChunk]:
+        """Get the chunks of `align` that are not "equal", only aligning the words that differ."""
+        truth_codes, hypothesis_codes = self.encode(truth), self.encode(hypothesis)
+        if len(truth_codes) == 0:
+            raise ValueError("one or more references are empty strings")
+
+        prefix_length = 0
+        max_length = min(len(truth_codes), len(hypothesis_codes))
+        # Compare blocks of codes first, then the codes of the first differing block
+        while (
+            prefix_length + PREFIX_BLOCK_SIZE <= max_length
+            and truth_codes[prefix_length : prefix_length + PREFIX_BLOCK_SIZE]
+            == hypothesis_codes[prefix_length : prefix_length + PREFIX_BLOCK_SIZE]
+        ):
+            prefix_length += PREFIX_BLOCK_SIZE
+        while prefix_length < max_length and truth_codes[prefix_length] == hypothesis_codes[prefix_length]:
+            prefix_length += 1
+
+        suffix_length = 0
+        max_length -= prefix_length
+        while (
+            suffix_length < max_length
+            and truth_codes[len(truth_codes) - 1 - suffix_length]
+            == hypothesis_codes[len(hypothesis_codes) - 1 - suffix_length]
+        ):
+            suffix_length += 1
+
+        opcodes = Levenshtein.opcodes(
+            truth_codes[prefix_length : len(truth_codes) - suffix_length],
+            hypothesis_codes[prefix_length : len(hypothesis_codes) - suffix_length],
+        )
+        return [chunk for chunk in self.to_chunks(opcodes, prefix_length) if chunk.type != "equal"]
+
+
+def normalize_text(text: str, context: MetricContext) -> str:
+    return context.get(("basic_normalized_text", text), lambda: normalizer(text))
+
+
+def get_aligner(context: MetricContext) -> IncrementalAligner:
+    return context.get("incremental_aligner", IncrementalAligner)
+
+
+def get_alignment(truth: str, hypothesis: str, context: MetricContext) -> WordAlignment:
+    """Chunks of `jiwer.process_words(truth, hypothesis).alignments[0]`, once per sample for every metric."""
+    return context.get(("alignment", truth, hypothesis), lambda: get_aligner(context).align(truth, hypothesis))
+
+
+def get_edits(truth: str, hypothesis: str, context: MetricContext) -> list[jiwer.AlignmentChunk]:
+    """Same as `get_alignment` without the "equal" chunks, faster for texts sharing most of their words."""
+    return context.get(("edits", truth, hypothesis), lambda: get_aligner(context).get_edits(truth, hypothesis))
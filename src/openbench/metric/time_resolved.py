@@ -0,0 +1,31 @@
+# For licensing see accompanying LICENSE.md file.
+# Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
+
+"""Components of a metric resolved over consecutive windows of a sample."""
+
+from typing import NamedTuple
+
+import numpy as np
+
+
+# Key of the per-window components in the components returned by a metric, it is not accumulated
+TIME_RESOLVED = "time_resolved"
+
+
+class TimeResolvedComponents(NamedTuple):
+    """Components of a sample summed per window, window i covers [i * window, (i + 1) * window) seconds."""
+
+    window: float
+    components: dict[str, np.ndarray]
+
+
+def validate_window(window: float | None) -> float | None:
+    if window is not None and window <= 0:
+        raise ValueError(f"Time-resolved window must be positive, got {window}")
+    return window
+
+
+def sum_per_window(values: np.ndarray, times: np.ndarray, window: float, num_windows: int = 0) -> np.ndarray:
+    """Sum the values falling in each window from their times, in a single pass over the values."""
+    indices = np.maximum(np.floor(np.asarray(times, dtype=np.float64) / window), 0).astype(np.int64)
+    return np.bincount(indices, weights=np.asarray(values, dtype=np.float64), minlength=num_windows)
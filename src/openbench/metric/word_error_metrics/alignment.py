@@ -0,0 +1,115 @@
+# For licensing see accompanying LICENSE.md file.
+# Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
+
+"""Word alignment backends used by the word error metrics."""
+
+import re
+from abc import ABC, abstractmethod
+from typing import Literal
+
+import jiwer
+from pydantic import BaseModel, Field
+from rapidfuzz.distance import Levenshtein
+
+
+AlignmentBackendName = Literal["fast", "jiwer"]
+
+# `jiwer.transforms.RemoveMultipleSpaces` pattern, part of the default jiwer word transform
+MULTIPLE_SPACES_PATTERN = re.compile(r"\s\s+")
+
+
+class AlignmentMetrics(BaseModel):
+    wer: float = Field(..., description="Word Error Rate")
+    mer: float = Field(..., description="Match Error Rate")
+    wil: float = Field(..., description="Word Information Loss")
+    wip: float = Field(..., description="Word Information Preservation")
+    hits: int = Field(..., description="Number of correct words")
+    substitutions: int = Field(..., description="Number of substitutions")
+    deletions: int = Field(..., description="Number of deletions")
+    insertions: int = Field(..., description="Number of insertions")
+    ops: list[list[jiwer.AlignmentChunk]] = Field(..., description="Alignment operations")
+    truth: list[list[str]] = Field(..., description="Reference words")
+    hypothesis: list[list[str]] = Field(..., description="Hypothesis words")
+
+
+def tokenize_words(words: list[str]) -> list[str]:
+    """Split words into tokens the same way jiwer does after joining them with spaces."""
+    text = MULTIPLE_SPACES_PATTERN.sub(" ", " ".join(words)).strip()
+    return [token for token in text.split(" ") if token]
+
+
+class AlignmentBackend(ABC):
+    """Aligns reference and hypothesis words into `jiwer.AlignmentChunk`s.
+
+    Chunk indices refer to the words as split by `tokenize_words`, which are the given words
+    unless some of them are empty or contain spaces.
+    """
+
+    @abstractmethod
+    def align(self, ref_words: list[str], hyp_words: list[str]) -> list[jiwer.AlignmentChunk]:
+        pass
+
+    def align_batch(self, pairs: list[tuple[list[str], list[str]]]) -> list[list[jiwer.AlignmentChunk]]:
+        """Align several (reference, hypothesis) pairs.
+
+        Pairs are still aligned one at a time, rapidfuzz has no batched Levenshtein alignment. What a batch shares
+        is the state of the backend, e.g. the interned vocabulary of `FastAlignmentBackend`.
+        """
+        return [self.align(ref_words, hyp_words) for ref_words, hyp_words in pairs]
+
+
+class JiwerAlignmentBackend(AlignmentBackend):
+    """Reference backend going through `jiwer.compute_measures` on the joined words."""
+
+    def align(self, ref_words: list[str], hyp_words: list[str]) -> list[jiwer.AlignmentChunk]:
+        result = jiwer.compute_measures(
+            truth=" ".join(ref_words),
+            hypothesis=" ".join(hyp_words),
+        )
+        return AlignmentMetrics(**result).ops[0]
+
+
+class FastAlignmentBackend(AlignmentBackend):
+    """Backend aligning integer token IDs directly with rapidfuzz's bit-parallel Levenshtein.
+
+    This is the alignment jiwer computes internally, so the chunks are identical to `JiwerAlignmentBackend`,
+    without the string transforms and the parsing of every measure into pydantic models. Tokens are interned
+    into a vocabulary shared by all the alignments of the backend so that each distinct word of a batch is only
+    added once.
+    """
+
+    def __init__(self) -> None:
+        self.vocabulary: dict[str, int] = {}
+
+    def intern(self, tokens: list[str]) -> list[int]:
+        vocabulary = self.vocabulary
+        return [vocabulary.setdefault(token, len(vocabulary)) for token in tokens]
+
+    def align(self, ref_words: list[str], hyp_words: list[str]) -> list[jiwer.AlignmentChunk]:
+        ref_tokens = tokenize_words(ref_words)
+        if len(ref_tokens) == 0:
+            # Same error as jiwer which does not support empty references
+            raise ValueError("one or more references are empty strings")
+        opcodes = Levenshtein.opcodes(self.intern(ref_tokens), self.intern(tokenize_words(hyp_words)))
+        return [
+            jiwer.AlignmentChunk(
+                type=opcode.tag,
+                ref_start_idx=opcode.src_start,
+                ref_end_idx=opcode.src_end,
+                hyp_start_idx=opcode.dest_start,
+                hyp_end_idx=opcode.dest_end,
+            )
+            for opcode in opcodes
+        ]
+
+
+ALIGNMENT_BACKENDS: dict[str, type[AlignmentBackend]] = {
+    "fast": FastAlignmentBackend,
+    "jiwer": JiwerAlignmentBackend,
+}
+
+
+def get_alignment_backend(name: AlignmentBackendName) -> AlignmentBackend:
+    if name not in ALIGNMENT_BACKENDS:
+        raise ValueError(f"Unknown alignment backend {name}, choose from {list(ALIGNMENT_BACKENDS)}")
+    return ALIGNMENT_BACKENDS[name]()
@@ -4,11 +4,32 @@
 import re
 import unicodedata
 from fractions import Fraction
+from functools import lru_cache
 from typing import Iterator, Match
 
 from .english_abbreviations import ABBR
 
 
+# Maximum number of normalized texts memoized by each `EnglishTextNormalizer`
+NORMALIZED_TEXT_CACHE_SIZE = 1 << 16
+
+BRACKETS_PATTERN = re.compile(r"[<\[][^>\]]*[>\]]")
+PARENTHESIS_PATTERN = re.compile(r"\(([^)]+?)\)")
+SPACE_BEFORE_APOSTROPHE_PATTERN = re.compile(r"\s+'")
+DIGITS_COMMA_PATTERN = re.compile(r"(\d),(\d)")
+PERIOD_PATTERN = re.compile(r"\.([^0-9]|$)")
+PREFIX_SYMBOL_PATTERN = re.compile(r"[.$¢€£]([^0-9])")
+SUFFIX_SYMBOL_PATTERN = re.compile(r"([^0-9])%")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+NUMERIC_WORD_PATTERN = re.compile(r"^\d+(\.\d+)?$")
+# Word joining speaker turns normalized in one pass, it is left untouched by every normalization step
+SEGMENT_SENTINEL = "xxsegmentboundaryxx"
+# Same as the prefix/suffix symbol patterns but treat the sentinel as the end/start of a turn
+SEGMENT_PREFIX_SYMBOL_PATTERN = re.compile(rf"[.$¢€£](?! {SEGMENT_SENTINEL}\b)([^0-9])")
+SEGMENT_SUFFIX_SYMBOL_PATTERN = re.compile(rf"(?<!\b{SEGMENT_SENTINEL})([^0-9])%")
+WORD_CHARACTER_PATTERN = re.compile(r"\w")
+REGEX_SYNTAX_PATTERN = re.compile(r"[\\.^$*+?{}\[\]|()]")
+
 # non-ASCII letters that are not separated by "NFKD" normalization
 ADDITIONAL_DIACRITICS = {
     "œ": "oe",
@@ -30,27 +51,40 @@ ADDITIONAL_DIACRITICS = {
 }
 
 
-def remove_symbols_and_diacritics(s: str, keep: str = "") -> str:
-    """
-    Replace any other markers, symbols, and punctuations with a space, and drop any diacritics
-    (category 'Mn' and some manual mappings)
-    """
+class SymbolsAndDiacriticsTable(dict):
+    """`str.translate` table of `remove_symbols_and_diacritics`, filled as new characters are seen."""
 
-    def replace_character(char):
-        if char in keep:
-            return char
-        elif char in ADDITIONAL_DIACRITICS:
-            return ADDITIONAL_DIACRITICS[char]
+    def __init__(self, keep: str = "") -> None:
+        super().__init__()
+        self.keep = keep
 
+    def __missing__(self, codepoint: int) -> str:
+        char = chr(codepoint)
+        if char in self.keep:
+            replacement = char
+        elif char in ADDITIONAL_DIACRITICS:
+            replacement = ADDITIONAL_DIACRITICS[char]
         elif unicodedata.category(char) == "Mn":
-            return ""
-
+            replacement = ""
         elif unicodedata.category(char)[0] in "MSP":
-            return " "
+            replacement = " "
+        else:
+            replacement = char
+        self[codepoint] = replacement
+        return replacement
 
-        return char
 
-    return "".join(replace_character(c) for c in unicodedata.normalize("NFKD", s))
+@lru_cache(maxsize=None)
+def get_symbols_and_diacritics_table(keep: str) -> SymbolsAndDiacriticsTable:
+    return SymbolsAndDiacriticsTable(keep)
+
+
+def remove_symbols_and_diacritics(s: str, keep: str = "") -> str:
+    """
+    Replace any other markers, symbols, and punctuations with a space, and drop any diacritics
+    (category 'Mn' and some manual mappings)
+    """
+    return unicodedata.normalize("NFKD", s).translate(get_symbols_and_diacritics_table(keep))
 
 
 def remove_symbols(s: str) -> str:
@@ -213,10 +247,10 @@ class EnglishNumberNormalizer:
                 skip = False
                 continue
 
-            next_is_numeric = next is not None and re.match(r"^\d+(\.\d+)?$", next)
+            next_is_numeric = next is not None and NUMERIC_WORD_PATTERN.match(next)
             has_prefix = current[0] in self.prefixes
             current_without_prefix = current[1:] if has_prefix else current
-            if re.match(r"^\d+(\.\d+)?$", current_without_prefix):
+            if NUMERIC_WORD_PATTERN.match(current_without_prefix):
                 # arabic numbers (potentially with signs and fractions)
                 f = to_fraction(current_without_prefix)
                 if f is None:
@@ -523,8 +557,69 @@ def generate_speech_segments(words: list[str], speakers: list[str]) -> tuple[lis
     return segments, segments_speakers
 
 
+def compile_replacers(
+    replacers: dict[str, str],
+) -> tuple[re.Pattern, dict[str, tuple[str, tuple[str, ...], tuple[str, ...]]]]:
+    """Compile replacers with patterns of the form `\\bliteral\\b`, `\\bliteral` or `literal\\b` into one regex.
+
+    Literals sharing the same word boundaries become a single group of alternatives so that the regex engine
+    tries them at once. Alternatives keep the order of `replacers` so the first listed literal wins, as when
+    the replacers are applied one after the other.
+
+    Returns:
+        tuple: (pattern, dispatch) where dispatch maps each literal to its replacement along with the text that,
+               if found right before or right after it, could make a later literal match across the replacement.
+               See `EnglishTextNormalizer.replace`
+    """
+    groups: dict[tuple[bool, bool], list[str]] = {}
+    literals: list[tuple[str, str, re.Pattern, bool, bool]] = []
+    for pattern, replacement in replacers.items():
+        leading_boundary, trailing_boundary = pattern.startswith(r"\b"), pattern.endswith(r"\b")
+        literal = pattern.removeprefix(r"\b").removesuffix(r"\b")
+        if REGEX_SYNTAX_PATTERN.search(literal):
+            raise ValueError(f"Replacer pattern {pattern} is not a literal with optional word boundaries")
+        groups.setdefault((leading_boundary, trailing_boundary), []).append(re.escape(literal))
+        literals.append((literal, replacement, re.compile(pattern), leading_boundary, trailing_boundary))
+
+    dispatch = {}
+    for i, (literal, replacement, _, _, _) in enumerate(literals):
+        # A word boundary appears where the replacement and the literal differ in their first/last character type
+        adds_leading_boundary = is_word_character(literal[0]) and not is_word_character(replacement[:1])
+        adds_trailing_boundary = is_word_character(literal[-1]) and not is_word_character(replacement[-1:])
+        prefixes, suffixes = set(), set()
+        for later_literal, _, later_pattern, leading_boundary, trailing_boundary in literals[i + 1 :]:
+            if later_pattern.search(replacement):
+                # The replacement itself is replaced again, an empty prefix always matches
+                prefixes.add("")
+            for split in range(1, len(later_literal)):
+                if replacement.startswith(later_literal[split:]):
+                    prefixes.add(later_literal[:split])
+                if replacement.endswith(later_literal[:split]):
+                    suffixes.add(later_literal[split:])
+            if adds_leading_boundary and trailing_boundary:
+                prefixes.add(later_literal)
+            if adds_trailing_boundary and leading_boundary:
+                suffixes.add(later_literal)
+        dispatch[literal] = (replacement, tuple(prefixes), tuple(suffixes))
+
+    boundary = r"\b"
+    pattern = "|".join(
+        f"{boundary * leading_boundary}(?:{'|'.join(group)}){boundary * trailing_boundary}"
+        for (leading_boundary, trailing_boundary), group in groups.items()
+    )
+    return re.compile(pattern), dispatch
+
+
+def is_word_character(s: str) -> bool:
+    return WORD_CHARACTER_PATTERN.match(s) is not None
+
+
 class EnglishTextNormalizer:
-    def __init__(self, english_spelling_mapping: dict[str, str] | None = None) -> None:
+    def __init__(
+        self,
+        english_spelling_mapping: dict[str, str] | None = None,
+        cache_size: int | None = NORMALIZED_TEXT_CACHE_SIZE,
+    ) -> None:
         self.ignore_patterns = r"\b(hmm|mm|mhm|mmm|uh|um)\b"
         self.replacers = {
             # common contractions
@@ -584,32 +679,124 @@ class EnglishTextNormalizer:
         self.standardize_numbers = EnglishNumberNormalizer()
         self.standardize_spellings = EnglishSpellingNormalizer(english_spelling_mapping)
 
+        self.ignore_pattern = re.compile(self.ignore_patterns)
+        self.replacers_pattern, self.replacers_dispatch = compile_replacers(self.replacers)
+        self.compiled_replacers = [
+            (re.compile(pattern), replacement) for pattern, replacement in self.replacers.items()
+        ]
+        self.cache_size = cache_size
+        self._build_caches()
+
+    def _build_caches(self) -> None:
+        # Every metric normalizes the same references for every pipeline so normalized texts are memoized
+        self._cached_process_transcript = lru_cache(maxsize=self.cache_size)(self._process_transcript)
+        self._cached_process_segments = lru_cache(maxsize=self.cache_size)(self._process_segments)
+
+    def __getstate__(self) -> dict:
+        # The caches wrap bound methods which cannot be pickled, e.g. to send metrics to worker processes,
+        # they are dropped and rebuilt empty on unpickling
+        state = self.__dict__.copy()
+        del state["_cached_process_transcript"], state["_cached_process_segments"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._build_caches()
+
+    def replace(self, s: str) -> str:
+        """Apply all the replacers in a single pass over `s`.
+
+        This gives the same result as applying them one after the other except when a replacement makes a
+        replacer listed after it match, e.g. in "'lln't" the "'ll" only matches once "n't" is replaced by
+        " not". Texts where this could happen are rare and replaced one replacer at a time instead.
+        """
+        needs_sequential_replace = False
+
+        def get_replacement(match: Match) -> str:
+            nonlocal needs_sequential_replace
+            replacement, prefixes, suffixes = self.replacers_dispatch[match.group()]
+            if s.endswith(prefixes, 0, match.start()) or s.startswith(suffixes, match.end()):
+                needs_sequential_replace = True
+            return replacement
+
+        replaced = self.replacers_pattern.sub(get_replacement, s)
+        if not needs_sequential_replace:
+            return replaced
+        for pattern, replacement in self.compiled_replacers:
+            s = pattern.sub(replacement, s)
+        return s
+
     def process_transcript(self, s: str) -> str:
+        return self._cached_process_transcript(s)
+
+    def _process_transcript(self, s: str) -> str:
+        return self._standardize_transcript(self._clean_transcript(s))
+
+    def _clean_transcript(self, s: str) -> str:
         s = s.lower()
 
-        s = re.sub(r"[<\[][^>\]]*[>\]]", "", s)  # remove words between brackets
-        s = re.sub(r"\(([^)]+?)\)", "", s)  # remove words between parenthesis
-        s = re.sub(self.ignore_patterns, "", s)
-        s = re.sub(r"\s+'", "'", s)  # standardize when there's a space before an apostrophe
+        s = BRACKETS_PATTERN.sub("", s)  # remove words between brackets
+        s = PARENTHESIS_PATTERN.sub("", s)  # remove words between parenthesis
+        s = self.ignore_pattern.sub("", s)
+        s = SPACE_BEFORE_APOSTROPHE_PATTERN.sub("'", s)  # standardize when there's a space before an apostrophe
 
-        for pattern, replacement in self.replacers.items():
-            s = re.sub(pattern, replacement, s)
+        s = self.replace(s)
 
-        s = re.sub(r"(\d),(\d)", r"\1\2", s)  # remove commas between digits
-        s = re.sub(r"\.([^0-9]|$)", r" \1", s)  # remove periods not followed by numbers
+        s = DIGITS_COMMA_PATTERN.sub(r"\1\2", s)  # remove commas between digits
+        s = PERIOD_PATTERN.sub(r" \1", s)  # remove periods not followed by numbers
         s = remove_symbols_and_diacritics(s, keep=".%$¢€£")  # keep some symbols for numerics
 
+        return s
+
+    def _standardize_transcript(
+        self,
+        s: str,
+        prefix_symbol_pattern: re.Pattern = PREFIX_SYMBOL_PATTERN,
+        suffix_symbol_pattern: re.Pattern = SUFFIX_SYMBOL_PATTERN,
+    ) -> str:
         s = self.standardize_numbers(s)
         s = self.standardize_spellings(s)
 
         # now remove prefix/suffix symbols that are not preceded/followed by numbers
-        s = re.sub(r"[.$¢€£]([^0-9])", r" \1", s)
-        s = re.sub(r"([^0-9])%", r"\1 ", s)
+        s = prefix_symbol_pattern.sub(r" \1", s)
+        s = suffix_symbol_pattern.sub(r"\1 ", s)
 
-        s = re.sub(r"\s+", " ", s)  # replace any successive whitespace characters with a space
+        s = WHITESPACE_PATTERN.sub(" ", s)  # replace any successive whitespace characters with a space
 
         return s
 
+    def process_segments(self, segments: tuple[str, ...]) -> list[list[str]]:
+        """Normalize speaker turns and split them into words.
+
+        Gives the same words as normalizing each turn with `process_transcript` but the turns are joined by
+        `SEGMENT_SENTINEL` and normalized in a single pass, which is much faster for transcripts with many
+        short turns.
+        """
+        return self._cached_process_segments(tuple(segments))
+
+    def _process_segments(self, segments: tuple[str, ...]) -> list[list[str]]:
+        num_boundaries = len(segments) - 1
+        joined = f" {SEGMENT_SENTINEL} ".join(segments)
+        s = self._clean_transcript(joined)
+        # Fall back to one pass per turn when the turns are not independent in a single pass:
+        # - the sentinel is removed e.g. by brackets spanning several turns, or is already in the text
+        # - "and a half" is dropped at the start of a transcript but not at the start of a joined turn
+        if (
+            joined.count(SEGMENT_SENTINEL) != num_boundaries
+            or s.split().count(SEGMENT_SENTINEL) != num_boundaries
+            or "half" in s
+        ):
+            return [self.process_transcript(segment).split() for segment in segments]
+
+        s = self._standardize_transcript(s, SEGMENT_PREFIX_SYMBOL_PATTERN, SEGMENT_SUFFIX_SYMBOL_PATTERN)
+        normalized_segments: list[list[str]] = [[]]
+        for word in s.split():
+            if word == SEGMENT_SENTINEL:
+                normalized_segments.append([])
+            else:
+                normalized_segments[-1].append(word)
+        return normalized_segments
+
     def __call__(self, words: list[str], speakers: list[str] | None = None) -> tuple[list[str], list[str] | None]:
         """Processes a transcript and returns a list of words and a list of speakers if speakers are provided.
 
@@ -634,10 +821,10 @@ class EnglishTextNormalizer:
         segments, segments_speakers = generate_speech_segments(words, speakers)
 
         # normalize each segment:
-        # 1. Join words into a single string
-        # 2. Normalize the string
-        # 3. Split the string into words
-        normalized_segments = [self.process_transcript(" ".join(segment)).split() for segment in segments]
+        # 1. Join words of each segment into a single string
+        # 2. Normalize all the strings at once
+        # 3. Split the strings into words
+        normalized_segments = self.process_segments(tuple(" ".join(segment) for segment in segments))
 
         # Flatten normalized segments and match their correspondeing speakers
         # Since we expand contractions and replace written numbers we need to match the normalized words with their corresponding speakers
@@ -648,3 +835,17 @@ class EnglishTextNormalizer:
             normalized_speakers.extend([segment_speaker] * len(normalized_segment))
 
         return normalized_words, normalized_speakers
+
+
+@lru_cache(maxsize=None)
+def _get_english_text_normalizer(spelling_mapping_items: tuple[tuple[str, str], ...] | None) -> EnglishTextNormalizer:
+    return EnglishTextNormalizer(dict(spelling_mapping_items) if spelling_mapping_items is not None else None)
+
+
+def get_english_text_normalizer(english_spelling_mapping: dict[str, str] | None = None) -> EnglishTextNormalizer:
+    """Get the normalizer shared by all the metrics using the same spelling mapping.
+
+    Sharing it means a reference is normalized once no matter how many metrics and pipelines evaluate it.
+    """
+    spelling_mapping_items = tuple(sorted(english_spelling_mapping.items())) if english_spelling_mapping else None
+    return _get_english_text_normalizer(spelling_mapping_items)
@@ -6,33 +6,20 @@ import numpy as np
 from argmaxtools.utils import get_logger
 from pyannote.metrics.base import BaseMetric
 from pyannote.metrics.types import Details, MetricComponents
-from pydantic import BaseModel, Field
 from scipy import optimize
 
 from ...pipeline_prediction import Transcript
 from ...types import PipelineType
+from ..context import MetricContext
 from ..metric import MetricOptions
 from ..registry import MetricRegistry
-from .text_normalizer import EnglishTextNormalizer
+from .alignment import AlignmentBackendName, get_alignment_backend
+from .text_normalizer import get_english_text_normalizer
 
 
 logger = get_logger(__name__)
 
 
-class AlignmentMetrics(BaseModel):
-    wer: float = Field(..., description="Word Error Rate")
-    mer: float = Field(..., description="Match Error Rate")
-    wil: float = Field(..., description="Word Information Loss")
-    wip: float = Field(..., description="Word Information Preservation")
-    hits: int = Field(..., description="Number of correct words")
-    substitutions: int = Field(..., description="Number of substitutions")
-    deletions: int = Field(..., description="Number of deletions")
-    insertions: int = Field(..., description="Number of insertions")
-    ops: list[list[jiwer.AlignmentChunk]] = Field(..., description="Alignment operations")
-    truth: list[list[str]] = Field(..., description="Reference words")
-    hypothesis: list[list[str]] = Field(..., description="Hypothesis words")
-
-
 def parse_diarzed_words(transcript: Transcript) -> tuple[list[str], list[str] | None]:
     """Parse a list of words into text and speaker strings.
 
@@ -43,6 +30,12 @@ def parse_diarzed_words(transcript: Transcript) -> tuple[list[str], list[str] |
     return word_list, speaker_list
 
 
+def encode_labels(labels: list[str], unique_labels: list[str]) -> np.ndarray:
+    """Encode labels as their position in `unique_labels`."""
+    label_to_code = {label: code for code, label in enumerate(unique_labels)}
+    return np.array([label_to_code[label] for label in labels], dtype=np.int64)
+
+
 class BaseWordErrorMetric(BaseMetric):
     """Base class for word error metrics."""
 
@@ -50,44 +43,51 @@ class BaseWordErrorMetric(BaseMetric):
         self,
         use_text_normalizer: bool = True,
         english_spelling_mapping: dict[str, str] | None = None,
+        alignment_backend: AlignmentBackendName = "fast",
         **kwargs,
     ) -> None:
         super().__init__(instantaneous=True)
         self.use_text_normalizer = use_text_normalizer
         # NOTE: Currently only English text normalizer is supported
-        self.text_normalizer = EnglishTextNormalizer(english_spelling_mapping)
+        self.text_normalizer = get_english_text_normalizer(english_spelling_mapping)
+        self.alignment_backend = get_alignment_backend(alignment_backend)
 
     def _supports_paired_evaluation(self) -> bool:
         return True
 
+    def _normalize_words(
+        self, transcript: Transcript, context: MetricContext, role: str
+    ) -> tuple[list[str], list[str] | None]:
+        words, speakers = parse_diarzed_words(transcript)
+        if not self.use_text_normalizer:
+            return words, speakers
+        return context.get(
+            ("normalized_words", role, self.text_normalizer),
+            lambda: self.text_normalizer(words=words, speakers=speakers),
+        )
+
     def _get_word_error_metrics(
-        self, reference: Transcript, hypothesis: Transcript
+        self,
+        reference: Transcript,
+        hypothesis: Transcript,
+        context: MetricContext | None = None,
     ) -> tuple[
         jiwer.AlignmentChunk,
         tuple[list[str], list[str]],
         tuple[list[str] | None, list[str] | None],
     ]:
-        ref_words, ref_speakers = parse_diarzed_words(reference)
-        hyp_words, hyp_speakers = parse_diarzed_words(hypothesis)
-
-        if self.use_text_normalizer:
-            ref_words, ref_speakers = self.text_normalizer(
-                words=ref_words,
-                speakers=ref_speakers,
-            )
-            hyp_words, hyp_speakers = self.text_normalizer(
-                words=hyp_words,
-                speakers=hyp_speakers,
-            )
-
-        result = jiwer.compute_measures(
-            truth=" ".join(ref_words),
-            hypothesis=" ".join(hyp_words),
-        )
-        result = AlignmentMetrics(**result)
+        # Metrics evaluating the same sample share the normalized words and their alignment through the context
+        context = context if context is not None else MetricContext()
+        ref_words, ref_speakers = self._normalize_words(reference, context, "reference")
+        hyp_words, hyp_speakers = self._normalize_words(hypothesis, context, "hypothesis")
 
         # Get alignments
-        return result.ops[0], (ref_words, hyp_words), (ref_speakers, hyp_speakers)
+        normalizer = self.text_normalizer if self.use_text_normalizer else None
+        alignments = context.get(
+            ("word_alignment", normalizer, type(self.alignment_backend)),
+            lambda: self.alignment_backend.align(ref_words, hyp_words),
+        )
+        return alignments, (ref_words, hyp_words), (ref_speakers, hyp_speakers)
 
 
 @MetricRegistry.register_metric(PipelineType.ORCHESTRATION, MetricOptions.WDER)
@@ -95,7 +95,7 @@ class WordDiarizationErrorRate(BaseWordErrorMetric):
     """Word Diarization Error Rate (WDER) implementation.
 
     This metric evaluates both the transcription and speaker assignment accuracy
-    at the word level. It uses jiwer for word alignments and handles speaker
+    at the word level. It uses jiwer's Levenshtein alignment of words and handles speaker
     mapping using the Hungarian algorithm.
 
     Reference:
@@ -117,18 +117,21 @@ class WordDiarizationErrorRate(BaseWordErrorMetric):
             "num_correct_asr_incorrect_speaker",  # Cis is the number of Correct ASR words with Incorrect Speaker tokens
         ]
 
-    def compute_components(self, reference: Transcript, hypothesis: Transcript, **kwargs) -> dict[str, int]:
+    def compute_components(
+        self, reference: Transcript, hypothesis: Transcript, context: MetricContext | None = None, **kwargs
+    ) -> dict[str, int]:
         """Compute WDER between reference and hypothesis.
 
         Args:
             reference: List of reference words with their speaker labels
             hypothesis: List of hypothesis words with their speaker labels
+            context: Artifacts shared with the other metrics evaluating the same sample
         """
         (
             alignments,
             (ref_words, hyp_words),
             (ref_speakers, hyp_speakers),
-        ) = self._get_word_error_metrics(reference, hypothesis)
+        ) = self._get_word_error_metrics(reference, hypothesis, context)
 
         if len(ref_words) != len(ref_speakers):
             raise ValueError(
@@ -139,67 +142,47 @@ class WordDiarizationErrorRate(BaseWordErrorMetric):
                 f"Hypothesis words and speaker labels must have same length but got {hyp_words=} ({len(hyp_words)=}) and {hyp_speakers=} ({len(hyp_speakers)=})"
             )
 
-        # Build cost matrix for speaker mapping
+        # Encode speakers to integer codes following the sorted order of their labels
         unique_ref_speakers = sorted(set(ref_speakers))
         unique_hyp_speakers = sorted(set(hyp_speakers))
-        cost_matrix = np.zeros((len(unique_ref_speakers), len(unique_hyp_speakers)))
-
-        # Pre-process alignments to get all matching word pairs
-        matching_pairs = []
-        for alignment in alignments:
-            if alignment.type not in ["equal", "substitute"]:
-                continue
-            # Get all aligned word pairs at once
-            ref_indices = range(alignment.ref_start_idx, alignment.ref_end_idx)
-            hyp_indices = range(alignment.hyp_start_idx, alignment.hyp_start_idx + len(ref_indices))
-            matching_pairs.extend(zip(ref_indices, hyp_indices))
-
-        # Convert to numpy arrays for faster operations
-        matching_pairs = np.array(matching_pairs)
-        ref_speakers_array = np.array(ref_speakers)
-        hyp_speakers_array = np.array(hyp_speakers)
-
-        # Calculate cost matrix efficiently
-        for ref_idx, ref_spk in enumerate(unique_ref_speakers):
-            for hyp_idx, hyp_spk in enumerate(unique_hyp_speakers):
-                # Use boolean indexing to count matches
-                ref_matches = ref_speakers_array[matching_pairs[:, 0]] == ref_spk
-                hyp_matches = hyp_speakers_array[matching_pairs[:, 1]] == hyp_spk
-                cost_matrix[ref_idx, hyp_idx] = np.sum(ref_matches & hyp_matches)
+        ref_codes = encode_labels(ref_speakers, unique_ref_speakers)
+        hyp_codes = encode_labels(hyp_speakers, unique_hyp_speakers)
+
+        # Expand the alignment chunks into the indices of all matching word pairs
+        chunks = [alignment for alignment in alignments if alignment.type in ["equal", "substitute"]]
+        ref_starts = np.array([chunk.ref_start_idx for chunk in chunks], dtype=np.int64)
+        hyp_starts = np.array([chunk.hyp_start_idx for chunk in chunks], dtype=np.int64)
+        lengths = np.array([chunk.ref_end_idx - chunk.ref_start_idx for chunk in chunks], dtype=np.int64)
+        is_equal_chunk = np.array([chunk.type == "equal" for chunk in chunks], dtype=bool)
+        offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        pair_ref_codes = ref_codes[np.repeat(ref_starts, lengths) + offsets]
+        pair_hyp_codes = hyp_codes[np.repeat(hyp_starts, lengths) + offsets]
+        is_equal = np.repeat(is_equal_chunk, lengths)
+
+        # Contingency table of speaker co-occurrences over matching word pairs
+        num_ref_speakers, num_hyp_speakers = len(unique_ref_speakers), len(unique_hyp_speakers)
+        cost_matrix = (
+            np.bincount(
+                pair_ref_codes * num_hyp_speakers + pair_hyp_codes, minlength=num_ref_speakers * num_hyp_speakers
+            )
+            .reshape(num_ref_speakers, num_hyp_speakers)
+            .astype(np.float64)
+        )
 
         # Find optimal speaker mapping using Hungarian algorithm
         row_ind, col_ind = optimize.linear_sum_assignment(cost_matrix, maximize=True)
         speaker_mapping = {unique_ref_speakers[i]: unique_hyp_speakers[j] for i, j in zip(row_ind, col_ind)}
         logger.debug(f"Speaker mapping: {speaker_mapping}")
 
-        # Calculate final statistics
-        total_words = 0
-        correct_assignments = 0
-        num_substitutions_asr = 0
-        num_substitutions_asr_incorrect_speaker = 0  # Sis
-        num_correct_asr_incorrect_speaker = 0  # Cis
+        # Calculate final statistics, unmapped reference speakers never match any hypothesis speaker
+        mapped_hyp_codes = np.full(num_ref_speakers, -1, dtype=np.int64)
+        mapped_hyp_codes[row_ind] = col_ind
+        is_incorrect_speaker = pair_hyp_codes != mapped_hyp_codes[pair_ref_codes]
 
-        for alignment in alignments:
-            # We are only interested in substitutions and correct words
-            if alignment.type not in ["equal", "substitute"]:
-                continue
-
-            for i in range(alignment.ref_start_idx, alignment.ref_end_idx):
-                j = alignment.hyp_start_idx + (i - alignment.ref_start_idx)
-                total_words += 1
-                ref_spk = ref_speakers[i]
-                hyp_spk = hyp_speakers[j]
-                is_correct_speaker = hyp_spk == speaker_mapping.get(ref_spk)
-                _type = alignment.type
-
-                if _type == "equal":
-                    correct_assignments += 1
-                    num_correct_asr_incorrect_speaker += 1 if not is_correct_speaker else 0
-                elif _type == "substitute":
-                    num_substitutions_asr += 1
-                    num_substitutions_asr_incorrect_speaker += 1 if not is_correct_speaker else 0
-                else:
-                    raise ValueError(f"Unknown alignment type: {_type}")
+        correct_assignments = int(is_equal.sum())
+        num_substitutions_asr = int((~is_equal).sum())
+        num_substitutions_asr_incorrect_speaker = int((~is_equal & is_incorrect_speaker).sum())  # Sis
+        num_correct_asr_incorrect_speaker = int((is_equal & is_incorrect_speaker).sum())  # Cis
 
         return {
             "num_substitutions_asr": num_substitutions_asr,
@@ -248,14 +231,17 @@ class WordErrorRate(BaseWordErrorMetric):
             "num_words",  # Total number of words in reference
         ]
 
-    def compute_components(self, reference: Transcript, hypothesis: Transcript, **kwargs) -> dict[str, int]:
+    def compute_components(
+        self, reference: Transcript, hypothesis: Transcript, context: MetricContext | None = None, **kwargs
+    ) -> dict[str, int]:
         """Compute WER between reference and hypothesis.
 
         Args:
             reference: Reference transcript
             hypothesis: Hypothesis transcript
+            context: Artifacts shared with the other metrics evaluating the same sample
         """
-        alignments, (ref_words, hyp_words), (_, _) = self._get_word_error_metrics(reference, hypothesis)
+        alignments, (ref_words, hyp_words), (_, _) = self._get_word_error_metrics(reference, hypothesis, context)
 
         # Calculate statistics
         num_substitutions = 0
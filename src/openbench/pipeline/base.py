@@ -7,7 +7,8 @@ from typing import Any, Callable, Generic, TypeVar
 
 from pydantic import BaseModel, Field
 
-from ..dataset.dataset_base import BaseSample
+from ..dataset.audio_input import AudioInputSpec
+from ..dataset.dataset_base import BaseDataset, BaseSample
 from ..types import PipelineType, PredictionProtocol
 
 
@@ -69,6 +70,23 @@ class Pipeline(ABC):
         config = cls._config_class(**config_dict)
         return cls(config)
 
+    @property
+    def input_spec(self) -> AudioInputSpec | None:
+        """Audio format the pipeline expects, samples are converted to it before `parse_input`.
+
+        Pipelines that require a specific sample rate, number of channels or dtype should override this.
+        If None, samples are passed with the audio as stored in the dataset.
+        """
+        return None
+
+    def prepare(self, dataset: BaseDataset) -> None:
+        """Called by the runner once before the samples of `dataset` are processed.
+
+        Pipelines that process a whole dataset at once, e.g. CLIs loading their models once for a batch of
+        files, override this. Samples are still processed one by one with `__call__` afterwards.
+        """
+        pass
+
     @abstractmethod
     def build_pipeline(self) -> Callable[[ParsedInput], GenericOutput]:
         pass
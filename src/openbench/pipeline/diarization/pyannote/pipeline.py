@@ -1,16 +1,18 @@
 # For licensing see accompanying LICENSE.md file.
 # Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
 
+import os
 from typing import Callable
 
+import numpy as np
 import torch
-from argmaxtools.utils import get_fastest_device
+from argmaxtools.utils import get_fastest_device, get_logger
 from pyannote.audio import Pipeline as PyannotePipeline
 from pyannote.audio.pipelines import SpeakerDiarization
 from pyannote.audio.sample import Annotation
-from pydantic import model_validator
+from pydantic import Field, model_validator
 
-from ....dataset import DiarizationSample
+from ....dataset import AudioInputSpec, DiarizationSample
 from ....pipeline_prediction import DiarizationAnnotation
 from ...base import Pipeline, PipelineType, register_pipeline
 from ..common import DiarizationOutput, DiarizationPipelineConfig
@@ -20,6 +22,32 @@ from .oracle_diarizer import OracleSpeakerDiarization
 __all__ = ["PyAnnotePipeline", "PyAnnotePipelineConfig"]
 
 
+logger = get_logger(__name__)
+
+# Process whose torch thread settings were applied by `set_torch_threads`
+_threads_set_pid: int | None = None
+
+
+def set_torch_threads(num_threads: int | None, num_interop_threads: int | None) -> None:
+    """Apply the torch thread settings once per process, worker processes apply them on their first sample."""
+    global _threads_set_pid
+    if _threads_set_pid == os.getpid():
+        return
+    _threads_set_pid = os.getpid()
+
+    if num_threads is not None:
+        torch.set_num_threads(num_threads)
+    if num_interop_threads is not None:
+        try:
+            torch.set_num_interop_threads(num_interop_threads)
+        except RuntimeError:
+            # Inter-op threads can only be set before any inter-op parallel work in the process
+            logger.warning(f"Could not set inter-op threads, using {torch.get_num_interop_threads()}")
+    logger.info(
+        f"Running with {torch.get_num_threads()} intra-op and {torch.get_num_interop_threads()} inter-op threads"
+    )
+
+
 class PyAnnotePipelineConfig(DiarizationPipelineConfig):
     device: str | None = None
     num_speakers: int | None = None
@@ -28,10 +56,38 @@ class PyAnnotePipelineConfig(DiarizationPipelineConfig):
     use_oracle_clustering: bool | None = None
     use_oracle_segmentation: bool | None = None
     use_float16: bool = False
+    num_threads: int | None = Field(
+        None,
+        description="Number of intra-op threads used by torch in each worker process. On CPU it defaults to the "
+        "number of CPUs divided by `num_worker_processes` so that parallel workers do not oversubscribe the CPUs",
+    )
+    num_interop_threads: int | None = Field(
+        None, description="Number of inter-op threads used by torch in each worker process, torch default if None"
+    )
+    quantize_embedding: bool = Field(
+        False,
+        description="Quantize the linear and recurrent layers of the embedding model to int8 with dynamic "
+        "quantization, only supported on CPU",
+    )
+    embedding_batch_size: int | None = Field(
+        None, description="Number of speaker chunks embedded at once, pyannote default if None"
+    )
+    segmentation_batch_size: int | None = Field(
+        None, description="Number of audio chunks segmented at once, pyannote default if None"
+    )
 
     @model_validator(mode="after")
     def resolve_device(self) -> "PyAnnotePipelineConfig":
-        self.device = get_fastest_device()
+        if self.device is None:
+            self.device = get_fastest_device()
+        return self
+
+    @model_validator(mode="after")
+    def resolve_cpu_options(self) -> "PyAnnotePipelineConfig":
+        if self.quantize_embedding and self.device != "cpu":
+            raise ValueError(f"Quantizing the embedding model is only supported on CPU, got device {self.device}")
+        if self.device == "cpu" and self.num_threads is None and self.num_worker_processes:
+            self.num_threads = max(1, (os.cpu_count() or 1) // self.num_worker_processes)
         return self
 
 
@@ -49,15 +105,31 @@ class PyAnnotePipeline(Pipeline):
             clustering = "OracleClustering" if self.config.use_oracle_clustering else "AgglomerativeClustering"
             pipeline = self._build_oracle_pipeline(pipeline, clustering)
 
+        if self.config.embedding_batch_size is not None:
+            pipeline.embedding_batch_size = self.config.embedding_batch_size
+        if self.config.segmentation_batch_size is not None:
+            pipeline.segmentation_batch_size = self.config.segmentation_batch_size
+
         pipeline.to(torch.device(self.config.device))
 
+        if self.config.quantize_embedding:
+            # Convolutions are left as is, dynamic quantization only applies to linear and recurrent layers
+            pipeline._embedding.model_ = torch.ao.quantization.quantize_dynamic(
+                pipeline._embedding.model_, {torch.nn.Linear, torch.nn.LSTM}, dtype=torch.qint8
+            )
+
+        # float16 autocast is only meaningful on accelerators
+        use_autocast = self.config.use_float16 and self.config.device != "cpu"
+        if self.config.use_float16 and not use_autocast:
+            logger.warning("`use_float16` is ignored on CPU")
+
         def call_pipeline(
             inputs: dict[str, torch.FloatTensor | int],
         ) -> DiarizationAnnotation:
-            with torch.autocast(
-                device_type=self.config.device,
-                enabled=True,
-                dtype=torch.float16 if self.config.use_float16 else torch.float32,
+            set_torch_threads(self.config.num_threads, self.config.num_interop_threads)
+            with (
+                torch.inference_mode(),
+                torch.autocast(device_type=self.config.device, enabled=use_autocast, dtype=torch.float16),
             ):
                 annot: Annotation = pipeline(
                     inputs,
@@ -102,8 +174,14 @@ class PyAnnotePipeline(Pipeline):
         _pipeline.instantiate(params)
         return _pipeline
 
+    @property
+    def input_spec(self) -> AudioInputSpec:
+        # pyannote models run at 16kHz, providing it directly avoids resampling inside the pipeline
+        return AudioInputSpec(sample_rate=16000)
+
     def parse_input(self, input_sample: DiarizationSample) -> dict[str, torch.FloatTensor | int]:
-        waveform = torch.from_numpy(input_sample.waveform).float().unsqueeze(0)
+        # `np.asarray` decodes lazy waveforms and only copies if the waveform is not already float32
+        waveform = torch.from_numpy(np.asarray(input_sample.waveform, dtype=np.float32)).unsqueeze(0)
         waveform = waveform.to(self.config.device)
         parsed_input = {
             "waveform": waveform,
@@ -1,6 +1,7 @@
 # For licensing see accompanying LICENSE.md file.
 # Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
 
+import json
 import os
 import re
 import subprocess
@@ -10,7 +11,7 @@ from typing import Callable, TypedDict
 from argmaxtools.utils import get_logger
 from pydantic import Field
 
-from ...dataset import DiarizationSample
+from ...dataset import BaseDataset, DiarizationSample
 from ...pipeline_prediction import DiarizationAnnotation
 from ..base import Pipeline, PipelineType, register_pipeline
 from .common import DiarizationOutput, DiarizationPipelineConfig
@@ -21,11 +22,21 @@ __all__ = ["SpeakerKitPipeline", "SpeakerKitPipelineConfig"]
 logger = get_logger(__name__)
 
 TEMP_AUDIO_DIR = Path("audio_temp")
+# Files exchanged with the CLI in batch mode, relative to the output directory of the pipeline
+BATCH_MANIFEST_PATH = Path("speakerkit_manifest.json")
+BATCH_REPORT_PATH = Path("speakerkit_report.json")
 
 
 class SpeakerKitPipelineConfig(DiarizationPipelineConfig):
     cli_path: str = Field(..., description="The absolute path to the SpeakerKit CLI")
     model_path: str | None = Field(None, description="The absolute path to the SpeakerKit model")
+    batch_mode: bool = Field(
+        False,
+        description="Diarize all the samples of a dataset with a single CLI invocation so that the models are "
+        "loaded once. Prediction times are then read from the per-file timings of the JSON report of the CLI. "
+        "Requires a SpeakerKit CLI supporting the `--manifest-path` and `--report-path` options described in "
+        "`SpeakerKitCli`, with other CLIs the invocation fails",
+    )
 
 
 class SpeakerKitInput(TypedDict):
@@ -35,47 +46,115 @@ class SpeakerKitInput(TypedDict):
 
 
 class SpeakerKitCli:
+    """SpeakerKit CLI invoked either per file or once for a batch of files.
+
+    In batch mode the CLI reads a JSON manifest listing the audio, RTTM path and optional number of speakers of
+    each file, e.g. `{"files": [{"audio_path": ..., "rttm_path": ..., "num_speakers": null}]}`, and writes
+    a JSON report with the model load time and the time taken by each file, in milliseconds, e.g.
+    `{"model_load_time_ms": ..., "files": [{"audio_path": ..., "rttm_path": ..., "total_time_ms": ...}]}`.
+    """
+
     def __init__(self, cli_path: str, model_path: str | None = None):
         self.cli_path = cli_path
         self.model_path = model_path
+        # RTTM path and prediction time of the files diarized by `diarize_batch` by audio file name
+        self.batch_outputs: dict[str, tuple[Path, float]] = {}
+        self.model_load_time: float | None = None
 
-    def __call__(self, speakerkit_input: SpeakerKitInput) -> tuple[Path, float]:
+    def _get_base_cmd(self) -> list[str]:
         try:
-            cmd = [
-                self.cli_path,
-                "diarize",
-                "--api-key",
-                os.environ["SPEAKERKIT_API_KEY"],
-                "--audio-path",
-                str(speakerkit_input["audio_path"]),
-                "--rttm-path",
-                str(speakerkit_input["output_path"]),
-                "--verbose",
-            ]
-            if self.model_path:
-                cmd.extend(["--model-path", self.model_path])
+            cmd = [self.cli_path, "diarize", "--api-key", os.environ["SPEAKERKIT_API_KEY"]]
         except KeyError as e:
             raise ValueError("`SPEAKERKIT_API_KEY` environment variable is not set") from e
+        if self.model_path:
+            cmd.extend(["--model-path", self.model_path])
+        return cmd
 
-        if speakerkit_input["num_speakers"] is not None:
-            cmd.extend(["--num-speakers", str(speakerkit_input["num_speakers"])])
-
+    def _run(self, cmd: list[str]) -> str:
         try:
             result = subprocess.run(cmd, check=True, capture_output=True, text=True)
             logger.info(f"Diarization CLI stdout:\n{result.stdout}")
         except subprocess.CalledProcessError as e:
             raise RuntimeError(f"Diarization CLI failed with error: {e.stderr}") from e
+        return result.stdout
+
+    def __call__(self, speakerkit_input: SpeakerKitInput) -> tuple[Path, float]:
+        cmd = [
+            *self._get_base_cmd(),
+            "--audio-path",
+            str(speakerkit_input["audio_path"]),
+            "--rttm-path",
+            str(speakerkit_input["output_path"]),
+            "--verbose",
+        ]
+        if speakerkit_input["num_speakers"] is not None:
+            cmd.extend(["--num-speakers", str(speakerkit_input["num_speakers"])])
+
+        stdout = self._run(cmd)
 
         # Delete the audio file
         speakerkit_input["audio_path"].unlink()
 
         # Parse stdout and take the total time it took to diarize
         pattern = r"Model Load Time:\s+\d+\.\d+\s+ms\nTotal Time:\s+(\d+\.\d+)\s+ms"
-        matches = re.search(pattern, result.stdout)
+        matches = re.search(pattern, stdout)
         total_time = float(matches.group(1))
 
         return speakerkit_input["output_path"], total_time / 1000
 
+    def diarize_batch(self, speakerkit_inputs: list[SpeakerKitInput]) -> None:
+        """Diarize all the files with a single CLI invocation, outputs are kept for `get_batch_output`.
+
+        Files whose report has no time taken are left out.
+        """
+        if not speakerkit_inputs:
+            return
+
+        manifest = {
+            "files": [
+                {
+                    "audio_path": str(speakerkit_input["audio_path"]),
+                    "rttm_path": str(speakerkit_input["output_path"]),
+                    "num_speakers": speakerkit_input["num_speakers"],
+                }
+                for speakerkit_input in speakerkit_inputs
+            ]
+        }
+        BATCH_MANIFEST_PATH.write_text(json.dumps(manifest, indent=2))
+        BATCH_REPORT_PATH.unlink(missing_ok=True)
+
+        logger.info(f"Running SpeakerKit CLI on a batch of {len(speakerkit_inputs)} files")
+        self._run(
+            [
+                *self._get_base_cmd(),
+                "--manifest-path",
+                str(BATCH_MANIFEST_PATH),
+                "--report-path",
+                str(BATCH_REPORT_PATH),
+            ]
+        )
+
+        report = json.loads(BATCH_REPORT_PATH.read_text())
+        self.model_load_time = report["model_load_time_ms"] / 1000
+        logger.info(f"SpeakerKit model loading took {self.model_load_time:.4g} seconds")
+        for file_report in report["files"]:
+            audio_name = Path(file_report["audio_path"]).name
+            if "total_time_ms" not in file_report:
+                # The prediction time of the file is unknown, `get_batch_output` diarizes it alone instead
+                logger.warning(f"No prediction time in the report of {audio_name}")
+                continue
+            self.batch_outputs[audio_name] = Path(file_report["rttm_path"]), file_report["total_time_ms"] / 1000
+
+    def get_batch_output(self, speakerkit_input: SpeakerKitInput) -> tuple[Path, float]:
+        """Get the output of a file diarized by `diarize_batch`, diarizing it alone if it was not."""
+        output = self.batch_outputs.get(speakerkit_input["audio_path"].name)
+        if output is None:
+            logger.warning(f"{speakerkit_input['audio_path'].name} was not diarized in batch, diarizing it alone")
+            return self(speakerkit_input)
+
+        speakerkit_input["audio_path"].unlink(missing_ok=True)
+        return output
+
 
 @register_pipeline
 class SpeakerKitPipeline(Pipeline):
@@ -83,7 +162,14 @@ class SpeakerKitPipeline(Pipeline):
     pipeline_type = PipelineType.DIARIZATION
 
     def build_pipeline(self) -> Callable[[SpeakerKitInput], tuple[Path, float]]:
-        return SpeakerKitCli(cli_path=self.config.cli_path, model_path=self.config.model_path)
+        self.cli = SpeakerKitCli(cli_path=self.config.cli_path, model_path=self.config.model_path)
+        if self.config.batch_mode:
+            return self.cli.get_batch_output
+        return self.cli
+
+    def prepare(self, dataset: BaseDataset) -> None:
+        if self.config.batch_mode:
+            self.cli.diarize_batch([self.parse_input(sample) for sample in dataset])
 
     def parse_input(self, input_sample: DiarizationSample) -> SpeakerKitInput:
         inputs: SpeakerKitInput = {
@@ -1,15 +1,16 @@
 # For licensing see accompanying LICENSE.md file.
 # Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
 
-import subprocess
-from pathlib import Path
-from typing import Callable
+from typing import Any, Callable
 
-import pandas as pd
+import numpy as np
+import torch
+import whisperx
 from argmaxtools.utils import get_logger
 from pydantic import Field
+from whisperx.diarize import DiarizationPipeline
 
-from ...dataset import DiarizationSample
+from ...dataset import AudioInputSpec, DiarizationSample
 from ...pipeline_prediction import Transcript
 from ..base import Pipeline, PipelineConfig, PipelineType, register_pipeline
 from .common import OrchestrationOutput
@@ -17,7 +18,10 @@ from .common import OrchestrationOutput
 
 logger = get_logger(__name__)
 
-TEMP_AUDIO_DIR = Path("audio_temp")
+# WhisperX models run at 16kHz
+SAMPLE_RATE = 16000
+# Alignment language when the Whisper model does not detect one, as in the WhisperX CLI
+DEFAULT_ALIGN_LANGUAGE = "en"
 
 
 class WhisperXPipelineConfig(PipelineConfig):
@@ -41,85 +45,59 @@ class WhisperXPipelineConfig(PipelineConfig):
         default=0,
         description="Number of threads used by torch for CPU inference",
     )
+    language: str | None = Field(
+        default=None,
+        description="The language of the audio, detected on each sample by the Whisper model if None",
+    )
+    diarization_model_name: str | None = Field(
+        default=None,
+        description="The pyannote diarization model to use, WhisperX's default if None",
+    )
 
 
 class WhisperX:
+    """WhisperX transcription, alignment and diarization run in-process.
+
+    Models are loaded once and reused for every sample, which is what the WhisperX CLI does within one
+    invocation. Alignment models are loaded the first time a language is seen.
+    """
+
     def __init__(self, config: WhisperXPipelineConfig):
         self.config = config
 
-    def __call__(self, audio_path: Path | str) -> pd.DataFrame:
-        if isinstance(audio_path, str):
-            audio_path = Path(audio_path)
-
-        audio_name = audio_path.stem
-        # Convert config to CLI arguments
-        output_dir = f"output/{audio_name}"
-        args = [
-            "whisperx",
-            str(audio_path),
-            "--output_dir",
-            output_dir,
-            "--model",
-            self.config.model_name,
-            "--device",
-            self.config.device,
-            "--batch_size",
-            str(self.config.batch_size),
-            "--compute_type",
-            self.config.compute_type,
-            "--threads",
-            str(self.config.threads),
-            "--diarize",
-        ]
-
-        # Run whisperx CLI
-        subprocess.run(args)
-
-        # Parse .vtt file
-        with open(f"{output_dir}/{audio_name}.vtt", "r") as f:
-            vtt_content = f.read()
-
-        # Parse VTT content
-        lines = vtt_content.strip().split("\n")
-        segments = []
-        current_speaker = None
-
-        for line in lines:
-            line = line.strip()
-            if not line or line == "WEBVTT":
-                continue
-
-            # Check if line contains timestamp
-            if " --> " in line:
-                start, end = line.split(" --> ")
-                # Convert timestamp to seconds
-                start_sec = start
-                end_sec = end
-            # Check if line contains speaker and text
-            elif line.startswith("[SPEAKER_"):
-                speaker_end = line.find("]:")
-                if speaker_end != -1:
-                    current_speaker = line[1:speaker_end]
-                    text = line[speaker_end + 2 :].strip()
-                    segments.append(
-                        {
-                            "start": start_sec,
-                            "end": end_sec,
-                            "speaker_label": current_speaker,
-                            "text": text,
-                        }
-                    )
-            # If line doesn't have speaker tag, use previous speaker
-            elif line and current_speaker is not None:
-                segments[-1]["text"] += " " + line
-
-        # Convert to DataFrame
-        df = pd.DataFrame(segments)
-
-        # Clean up
-        audio_path.unlink()
-
-        return df
+        # Same thread handling as the WhisperX CLI, 0 keeps the torch default
+        asr_threads = 4
+        if config.threads > 0:
+            torch.set_num_threads(config.threads)
+            asr_threads = config.threads
+
+        logger.info(f"Loading WhisperX models on {config.device}")
+        self.asr_model = whisperx.load_model(
+            config.model_name,
+            device=config.device,
+            compute_type=config.compute_type,
+            language=config.language,
+            threads=asr_threads,
+        )
+        self.align_models: dict[str, tuple[torch.nn.Module, dict[str, Any]]] = {}
+        self.get_align_model(config.language or DEFAULT_ALIGN_LANGUAGE)
+        self.diarization_model = DiarizationPipeline(model_name=config.diarization_model_name, device=config.device)
+
+    def get_align_model(self, language: str) -> tuple[torch.nn.Module, dict[str, Any]]:
+        if language not in self.align_models:
+            logger.info(f"Loading WhisperX alignment model for language {language}")
+            self.align_models[language] = whisperx.load_align_model(language, self.config.device)
+        return self.align_models[language]
+
+    def __call__(self, audio: np.ndarray) -> dict[str, Any]:
+        result = self.asr_model.transcribe(audio, batch_size=self.config.batch_size)
+        language = result.get("language") or DEFAULT_ALIGN_LANGUAGE
+
+        align_model, align_metadata = self.get_align_model(language)
+        result = whisperx.align(result["segments"], align_model, align_metadata, audio, self.config.device)
+
+        diarization = self.diarization_model(audio)
+        return whisperx.assign_word_speakers(diarization, result)
 
 
 @register_pipeline
@@ -127,22 +105,35 @@ class WhisperXPipeline(Pipeline):
     _config_class = WhisperXPipelineConfig
     pipeline_type = PipelineType.ORCHESTRATION
 
-    def build_pipeline(self) -> Callable[[Path], pd.DataFrame]:
+    def build_pipeline(self) -> Callable[[np.ndarray], dict[str, Any]]:
         return WhisperX(self.config)
 
-    def parse_input(self, input_sample: DiarizationSample) -> Path:
-        return input_sample.save_audio(TEMP_AUDIO_DIR)
-
-    def parse_output(self, output: pd.DataFrame) -> OrchestrationOutput:
-        output = output.assign(words=lambda df: df["text"].str.split()).explode("words")
-
-        words = output["words"].tolist()
-        speakers = output["speaker_label"].tolist()
-
-        prediction = Transcript.from_words_info(
-            words=words,
-            speaker=speakers,
-        )
+    @property
+    def input_spec(self) -> AudioInputSpec:
+        return AudioInputSpec(sample_rate=SAMPLE_RATE)
+
+    def parse_input(self, input_sample: DiarizationSample) -> np.ndarray:
+        # `np.asarray` decodes lazy waveforms and only copies if the waveform is not already float32
+        return np.asarray(input_sample.waveform, dtype=np.float32)
+
+    def parse_output(self, output: dict[str, Any]) -> OrchestrationOutput:
+        words, starts, ends, speakers = [], [], [], []
+        speaker = None
+        for segment in output["segments"]:
+            for word in segment.get("words", []):
+                # Words that could not be aligned, e.g. numerals, or that fall outside of any diarization turn
+                # have no speaker, they keep the speaker of their segment or else of the previous word
+                speaker = word.get("speaker", segment.get("speaker", speaker))
+                words.append(word["word"])
+                starts.append(word.get("start"))
+                ends.append(word.get("end"))
+                speakers.append(speaker)
+
+        # Leading words without any speaker take the first one assigned
+        first_speaker = next((speaker for speaker in speakers if speaker is not None), None)
+        speakers = [first_speaker if speaker is None else speaker for speaker in speakers]
+
+        prediction = Transcript.from_words_info(words=words, start=starts, end=ends, speaker=speakers)
         return OrchestrationOutput(
             prediction=prediction,
         )
@@ -1,6 +1,11 @@
 # For licensing see accompanying LICENSE.md file.
 # Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
 
+from typing import Iterator
+
+import numpy as np
+
+from ...dataset import LazyWaveform, iter_audio_chunks
 from ...pipeline_prediction import StreamingTranscript
 from ..base import PipelineConfig, PipelineOutput
 
@@ -10,3 +15,12 @@ class StreamingTranscriptionConfig(PipelineConfig):
 
 
 class StreamingTranscriptionOutput(PipelineOutput[StreamingTranscript]): ...
+
+
+def iter_pcm16_chunks(waveform: np.ndarray | LazyWaveform, chunk_size: int) -> Iterator[bytes]:
+    """Iterate over a float waveform as 16-bit PCM bytes in chunks of `chunk_size` frames.
+
+    Chunks are converted one at a time so that lazy waveforms are never fully decoded.
+    """
+    for chunk in iter_audio_chunks(waveform, chunk_size):
+        yield (chunk * 32767).astype(np.int16).tobytes()
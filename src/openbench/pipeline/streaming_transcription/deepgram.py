@@ -11,12 +11,12 @@ from argmaxtools.utils import get_logger
 from dotenv import load_dotenv
 from pydantic import Field
 
-from openbench.dataset import StreamingSample
+from openbench.dataset import AudioInputSpec, LazyWaveform, StreamingSample
 
 from ...pipeline import Pipeline, register_pipeline
 from ...pipeline_prediction import StreamingTranscript
 from ...types import PipelineType
-from .common import StreamingTranscriptionConfig, StreamingTranscriptionOutput
+from .common import StreamingTranscriptionConfig, StreamingTranscriptionOutput, iter_pcm16_chunks
 
 
 load_dotenv()
@@ -75,12 +75,12 @@ class DeepgramApi:
 
             async def sender(ws):
                 """Sends the data, mimicking a real-time connection."""
-                nonlocal data, audio_cursor
+                nonlocal audio_cursor
                 try:
-                    while len(data):
-                        # How many bytes are in `REALTIME_RESOLUTION` seconds of audio
-                        i = int(byte_rate * self.realtime_resolution)
-                        chunk, data = data[:i], data[i:]
+                    # How many frames are in `REALTIME_RESOLUTION` seconds of audio
+                    chunk_size = int(byte_rate * self.realtime_resolution) // sample_width
+                    # Chunks are converted to PCM bytes as they are sent to avoid converting the whole waveform
+                    for chunk in iter_pcm16_chunks(data, chunk_size):
                         # Send the data
                         await ws.send(chunk)
                         # Move the audio cursor
@@ -151,7 +151,7 @@ class DeepgramApi:
             )
 
     def __call__(self, sample):
-        # Sample must be in bytes
+        # Sample is the float waveform, either an array or a `LazyWaveform`
         (
             transcript,
             interim_transcripts,
@@ -187,11 +187,14 @@ class DeepgramStreamingPipeline(Pipeline):
     _config_class = DeepgramStreamingPipelineConfig
     pipeline_type = PipelineType.STREAMING_TRANSCRIPTION
 
-    def parse_input(self, input_sample: StreamingSample):
-        y = input_sample.waveform
-        y_int16 = (y * 32767).astype(np.int16)
-        audio_data_byte = y_int16.T.tobytes()
-        return audio_data_byte
+    @property
+    def input_spec(self) -> AudioInputSpec:
+        # Audio is streamed at the sample rate declared to the API
+        return AudioInputSpec(sample_rate=self.config.sample_rate)
+
+    def parse_input(self, input_sample: StreamingSample) -> np.ndarray | LazyWaveform:
+        # Conversion to PCM bytes happens chunk by chunk while streaming
+        return input_sample.waveform
 
     def parse_output(self, output) -> StreamingTranscriptionOutput:
         model_timestamps_hypothesis = output["model_timestamps_hypothesis"]
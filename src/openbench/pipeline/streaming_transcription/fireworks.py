@@ -7,13 +7,14 @@ import threading
 import time
 import urllib.parse
 
+import numpy as np
 import torch
 import torchaudio
 import websocket
 from argmaxtools.utils import get_logger
 from dotenv import load_dotenv
 
-from openbench.dataset import StreamingSample
+from openbench.dataset import AudioInputSpec, StreamingSample
 
 from ...pipeline import Pipeline, register_pipeline
 from ...pipeline_prediction import StreamingTranscript
@@ -180,8 +181,14 @@ class FireworksStreamingPipeline(Pipeline):
 
         return audio_chunk_bytes
 
+    @property
+    def input_spec(self) -> AudioInputSpec:
+        # `audio2chunks` expects the waveform at the configured sample rate
+        return AudioInputSpec(sample_rate=self.config.sample_rate)
+
     def parse_input(self, input_sample: StreamingSample):
-        y = input_sample.waveform
+        # Resampling needs the whole signal so lazy waveforms are decoded here
+        y = np.asarray(input_sample.waveform)
         audio_data_byte = self.audio2chunks(y)
         return audio_data_byte
 
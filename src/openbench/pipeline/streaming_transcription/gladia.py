@@ -14,12 +14,12 @@ from dotenv import load_dotenv
 from websockets.client import ClientConnection, connect
 from websockets.exceptions import ConnectionClosedOK
 
-from openbench.dataset import StreamingSample
+from openbench.dataset import AudioInputSpec, LazyWaveform, StreamingSample
 
 from ...pipeline import Pipeline, register_pipeline
 from ...pipeline_prediction import StreamingTranscript
 from ...types import PipelineType
-from .common import StreamingTranscriptionConfig, StreamingTranscriptionOutput
+from .common import StreamingTranscriptionConfig, StreamingTranscriptionOutput, iter_pcm16_chunks
 
 
 load_dotenv()
@@ -127,19 +127,13 @@ class GladiaApi:
         async def send_audio(socket: ClientConnection, data) -> None:
             global audio_cursor
             audio_duration_in_seconds = 0.1
-            chunk_size = int(
-                STREAMING_CONFIGURATION["sample_rate"]
-                * (STREAMING_CONFIGURATION["bit_depth"] / 8)
-                * STREAMING_CONFIGURATION["channels"]
-                * audio_duration_in_seconds
-            )
+            # Number of frames per chunk, each frame is converted to `bit_depth` PCM for every channel
+            chunk_size = int(STREAMING_CONFIGURATION["sample_rate"] * audio_duration_in_seconds)
 
-            # Send the audio file in chunks
-            offset = 0
-            while offset < len(data):
+            # Send the audio file in chunks, converting each chunk to PCM bytes only when it is sent
+            for chunk in iter_pcm16_chunks(data, chunk_size):
                 try:
-                    await socket.send(data[offset : offset + chunk_size])
-                    offset += chunk_size
+                    await socket.send(chunk)
                     audio_cursor += audio_duration_in_seconds
                     await asyncio.sleep(audio_duration_in_seconds)
                 except ConnectionClosedOK:
@@ -176,7 +170,7 @@ class GladiaApi:
         )
 
     def __call__(self, sample):
-        # Sample must be in bytes
+        # Sample is the float waveform, either an array or a `LazyWaveform`
         (
             transcript,
             interim_transcripts,
@@ -209,11 +203,14 @@ class GladiaStreamingPipeline(Pipeline):
     _config_class = GladiaStreamingPipelineConfig
     pipeline_type = PipelineType.STREAMING_TRANSCRIPTION
 
-    def parse_input(self, input_sample: StreamingSample):
-        y = input_sample.waveform
-        y_int16 = (y * 32767).astype(np.int16)
-        audio_data_byte = y_int16.T.tobytes()
-        return audio_data_byte
+    @property
+    def input_spec(self) -> AudioInputSpec:
+        # The live session is initiated for 16kHz PCM, see `STREAMING_CONFIGURATION` in `GladiaApi.run`
+        return AudioInputSpec(sample_rate=16000)
+
+    def parse_input(self, input_sample: StreamingSample) -> np.ndarray | LazyWaveform:
+        # Conversion to PCM bytes happens chunk by chunk while streaming
+        return input_sample.waveform
 
     def parse_output(self, output) -> StreamingTranscriptionOutput:
         model_timestamps_hypothesis = output["model_timestamps_hypothesis"]
@@ -14,12 +14,12 @@ import websockets
 from argmaxtools.utils import get_logger
 from dotenv import load_dotenv
 
-from openbench.dataset import StreamingSample
+from openbench.dataset import AudioInputSpec, LazyWaveform, StreamingSample
 
 from ...pipeline import Pipeline, register_pipeline
 from ...pipeline_prediction import StreamingTranscript
 from ...types import PipelineType
-from .common import StreamingTranscriptionConfig, StreamingTranscriptionOutput
+from .common import StreamingTranscriptionConfig, StreamingTranscriptionOutput, iter_pcm16_chunks
 
 
 load_dotenv()
@@ -100,9 +100,9 @@ class OpenAIApi:
             global audio_finished
             global audio_cursor
             try:
-                while len(data):
-                    i = int(byte_rate * self.realtime_resolution)
-                    chunk, data = data[:i], data[i:]
+                # Chunks are converted to PCM bytes as they are sent to avoid converting the whole waveform
+                chunk_size = int(byte_rate * self.realtime_resolution) // self.sample_width
+                for chunk in iter_pcm16_chunks(data, chunk_size):
                     audio_chunk = base64.b64encode(chunk).decode("utf-8")
                     audio_event = {
                         "type": "input_audio_buffer.append",
@@ -207,7 +207,7 @@ class OpenAIApi:
 
                     await asyncio.wait_for(
                         asyncio.gather(sender_task, receiver_task),
-                        timeout=2 * len(data) / byte_rate,  # timeout in seconds,
+                        timeout=2 * len(data) / self.sample_rate,  # timeout in seconds,
                         # 2* audio duration
                     )
 
@@ -227,7 +227,7 @@ class OpenAIApi:
         )
 
     def __call__(self, sample):
-        # Sample must be in bytes
+        # Sample is the float waveform, either an array or a `LazyWaveform`
         (
             transcript,
             interim_transcripts,
@@ -293,11 +293,14 @@ class OpenAIStreamingPipeline(Pipeline):
 
         return audio_chunk_bytes
 
-    def parse_input(self, input_sample: StreamingSample):
-        y = input_sample.waveform
-        y_int16 = (y * 32767).astype(np.int16)
-        audio_data_byte = y_int16.T.tobytes()
-        return audio_data_byte
+    @property
+    def input_spec(self) -> AudioInputSpec:
+        # Audio is streamed at the sample rate declared to the API
+        return AudioInputSpec(sample_rate=self.config.sample_rate)
+
+    def parse_input(self, input_sample: StreamingSample) -> np.ndarray | LazyWaveform:
+        # Conversion to PCM bytes happens chunk by chunk while streaming
+        return input_sample.waveform
 
     def parse_output(self, output) -> StreamingTranscriptionOutput:
         model_timestamps_hypothesis = output["model_timestamps_hypothesis"]
@@ -3,14 +3,16 @@
 
 import json
 import os
+import shutil
 import subprocess
+from collections import defaultdict
 from pathlib import Path
 from typing import Callable
 
 from argmaxtools.utils import _maybe_git_clone, get_logger
 from pydantic import BaseModel, Field
 
-from ...dataset import TranscriptionSample
+from ...dataset import BaseDataset, TranscriptionSample
 from ...pipeline_prediction import Transcript
 from ..base import Pipeline, PipelineType, register_pipeline
 from .common import TranscriptionConfig, TranscriptionOutput
@@ -23,6 +25,8 @@ WHISPERKIT_REPO_URL = "https://github.com/argmaxinc/WhisperKit"
 PRODUCT_NAME = "whisperkit-cli"
 TEMP_AUDIO_DIR = Path("./temp_audio")
 WHISPERKIT_DEFAULT_REPORT_PATH = "./whisperkit_report"
+# Folder of the report dir listing the audio files of a batch, passed to the CLI with `--audio-folder`
+BATCH_AUDIO_DIRNAME = "batch_audio"
 
 
 class WhisperKitTranscriptionConfig(TranscriptionConfig):
@@ -56,6 +60,15 @@ class WhisperKitTranscriptionConfig(TranscriptionConfig):
         default="cpuAndNeuralEngine",
         description="Compute units for audio encoder",
     )
+    cli_path: str | None = Field(
+        default=None,
+        description="The path to a WhisperKit CLI executable. If not provided, the CLI is cloned and built",
+    )
+    batch_mode: bool = Field(
+        default=False,
+        description="Transcribe all the samples of a dataset with a single CLI invocation so that the model is "
+        "loaded once. Prediction times are then read from the timings of each report and exclude model loading",
+    )
 
     def create_report_path(self) -> Path:
         if self.report_path is None:
@@ -131,6 +144,11 @@ class TranscriptionCliOutput(BaseModel):
         ...,
         description="Path to the .srt file containing transcription results",
     )
+    prediction_time: float | None = Field(
+        default=None,
+        description="Time in seconds taken to transcribe the file excluding model loading, read from the report "
+        "in batch mode",
+    )
 
 
 class WhisperKitEngine:
@@ -146,6 +164,9 @@ class WhisperKitEngine:
         self.transcription_config = transcription_config
         self.transcription_args = self.transcription_config.generate_cli_args()
         self.transcription_config.create_report_path()
+        # Outputs of the files transcribed by `transcribe_batch` by audio file name
+        self.batch_outputs: dict[str, TranscriptionCliOutput] = {}
+        self.model_load_time: float | None = None
 
     def _clone_and_build_cli(self) -> str:
         """Clone the repository and build the CLI."""
@@ -237,6 +258,70 @@ class WhisperKitEngine:
             srt_report_path=srt_report_path,
         )
 
+    def transcribe_batch(self, inputs: list[TranscriptionCliInput]) -> None:
+        """Transcribe the given audio files with one CLI invocation per language, loading the model once.
+
+        The audio files of each invocation are linked into a folder of the report dir passed to the CLI with
+        `--audio-folder`. Outputs are kept for `get_batch_output`, with the prediction time of each file read
+        from the timings of its report. Files whose report has no prediction time are left out.
+        """
+        report_dir = self.transcription_config.create_report_path()
+        batch_dir = report_dir / BATCH_AUDIO_DIRNAME
+
+        inputs_by_language: dict[str | None, list[TranscriptionCliInput]] = defaultdict(list)
+        for input in inputs:
+            inputs_by_language[input.language].append(input)
+
+        for language, language_inputs in inputs_by_language.items():
+            shutil.rmtree(batch_dir, ignore_errors=True)
+            batch_dir.mkdir(parents=True)
+            for input in language_inputs:
+                os.symlink(input.audio_path.resolve(), batch_dir / input.audio_path.name)
+
+            cmd = [self.cli_path, "transcribe", "--audio-folder", str(batch_dir), *self.transcription_args]
+            if language:
+                cmd.extend(["--language", language])
+
+            logger.info(f"Running WhisperKit CLI on a batch of {len(language_inputs)} files")
+            logger.debug(f"Running WhisperKit CLI: {cmd}")
+            try:
+                subprocess.run(cmd, check=True, capture_output=True, text=True)
+            except subprocess.CalledProcessError as e:
+                raise RuntimeError(f"CLI command failed: {e.stderr}")
+            finally:
+                shutil.rmtree(batch_dir, ignore_errors=True)
+
+            for input in language_inputs:
+                json_report_path = report_dir / input.audio_path.with_suffix(".json").name
+                with json_report_path.open("r") as f:
+                    timings = json.load(f).get("timings", {})
+                # Every file of the batch reports the same model loading time
+                if self.model_load_time is None and "modelLoading" in timings:
+                    self.model_load_time = timings["modelLoading"]
+                if "fullPipeline" not in timings:
+                    # The prediction time of the file is unknown, `get_batch_output` transcribes it alone instead
+                    logger.warning(f"No prediction time in the report of {input.audio_path.name}")
+                    continue
+                self.batch_outputs[input.audio_path.name] = TranscriptionCliOutput(
+                    json_report_path=json_report_path,
+                    srt_report_path=report_dir / input.audio_path.with_suffix(".srt").name,
+                    prediction_time=timings["fullPipeline"],
+                )
+
+        if self.model_load_time is not None:
+            logger.info(f"WhisperKit model loading took {self.model_load_time:.4g} seconds")
+
+    def get_batch_output(self, input: TranscriptionCliInput) -> TranscriptionCliOutput:
+        """Get the output of a file transcribed by `transcribe_batch`, transcribing it alone if it was not."""
+        output = self.batch_outputs.get(input.audio_path.name)
+        if output is None:
+            logger.warning(f"{input.audio_path.name} was not transcribed in batch, transcribing it alone")
+            return self.transcribe(input)
+
+        if not input.keep_audio:
+            input.audio_path.unlink(missing_ok=True)
+        return output
+
 
 @register_pipeline
 class WhisperKitTranscriptionPipeline(Pipeline):
@@ -246,15 +331,22 @@ class WhisperKitTranscriptionPipeline(Pipeline):
     def build_pipeline(self) -> Callable[[TranscriptionCliInput], TranscriptionCliOutput]:
         # Create WhisperKit engine
         engine_config = WhisperKitEngineConfig(
+            cli_path=self.config.cli_path,
             clone_dir="./whisperkit_repo",
         )
 
-        engine = WhisperKitEngine(
+        self.engine = WhisperKitEngine(
             config=engine_config,
             transcription_config=self.config,
         )
 
-        return engine.transcribe
+        if self.config.batch_mode:
+            return self.engine.get_batch_output
+        return self.engine.transcribe
+
+    def prepare(self, dataset: BaseDataset) -> None:
+        if self.config.batch_mode:
+            self.engine.transcribe_batch([self.parse_input(sample) for sample in dataset])
 
     def parse_input(self, input_sample: TranscriptionSample) -> TranscriptionCliInput:
         return TranscriptionCliInput(
@@ -275,4 +367,5 @@ class WhisperKitTranscriptionPipeline(Pipeline):
 
         return TranscriptionOutput(
             prediction=transcript,
+            prediction_time=output.prediction_time,
         )
@@ -3,5 +3,5 @@
 
 from .benchmark import BenchmarkRunner
 from .config import BenchmarkConfig, WandbConfig
-from .data_models import BaseSampleResult, BenchmarkResult, GlobalResult, TaskResult
+from .data_models import BaseSampleResult, BenchmarkResult, GlobalResult, TaskResult, TimeResolvedResult
 from .wandb_logger import DiarizationWandbLogger, TranscriptionWandbLogger
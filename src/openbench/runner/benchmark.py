@@ -1,6 +1,7 @@
 # For licensing see accompanying LICENSE.md file.
 # Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
 
+from contextlib import nullcontext
 from multiprocessing import Pool
 from typing import NamedTuple
 
@@ -10,7 +11,7 @@ from argmaxtools.utils import get_logger
 from pyannote.metrics.base import BaseMetric
 
 from ..dataset import BaseDataset, BaseSample, DatasetRegistry
-from ..metric import MetricRegistry
+from ..metric import TIME_RESOLVED, MetricRegistry
 from ..pipeline import Pipeline
 from ..types import PipelineType
 from .config import BenchmarkConfig
@@ -19,9 +20,11 @@ from .data_models import (
     DiarizationSampleResult,
     GlobalResult,
     TaskResult,
+    TimeResolvedResult,
     TranscriptionSampleResult,
 )
-from .utils import change_directory, get_global_results
+from .metric_evaluation import MetricEvaluationStage, MetricOutput, accumulate_components, evaluate_metrics
+from .utils import change_directory, get_global_results, set_stratified_confidence_width
 from .wandb_logger import DiarizationWandbLogger, TranscriptionWandbLogger
 
 
@@ -40,6 +43,7 @@ class ProcessingResult(NamedTuple):
     task_results: list[TaskResult]
     sample_id: int
     metrics_string: str
+    metric_outputs: list[MetricOutput]
 
 
 class BenchmarkRunner:
@@ -68,10 +72,11 @@ class BenchmarkRunner:
     def _get_metrics(self, pipeline: Pipeline) -> dict[str, BaseMetric]:
         metrics_dict = {}
         available_metrics = MetricRegistry.get_available_metrics(pipeline.pipeline_type)
-        for metric_name, kwargs in self.config.metrics.items():
-            if metric_name not in available_metrics:
+        for metric_option, kwargs in self.config.metrics.items():
+            if metric_option not in available_metrics:
                 continue
-            metrics_dict[metric_name] = MetricRegistry.get_metric(metric_name, **kwargs)
+            # Parameter sweeps add one metric per variant, each reported as a separate result
+            metrics_dict.update(MetricRegistry.get_metric_variants(metric_option, **kwargs))
         return metrics_dict
 
     def _process_single_sample_wrapper(self, args):
@@ -86,7 +91,7 @@ class BenchmarkRunner:
         sample_and_id: tuple[int, BaseSample],
         pipeline: Pipeline,
         dataset_name: str,
-        metrics_dict: dict,
+        metrics_dict: dict[str, BaseMetric] | None,
         dataset_length: int,
     ) -> ProcessingResult:
         sample_id, sample = sample_and_id
@@ -110,25 +115,59 @@ class BenchmarkRunner:
 
         sample_result = sample_result_class(**sample_results_attributes)
 
-        # Process metrics
+        # Metrics are evaluated by the metric workers, if any, once the runner submits the prediction
+        metric_outputs = []
         task_results = []
-        metrics_logging_string = ""
+        metrics_logging_string = "Evaluated by the metric workers\n"
+        if metrics_dict is not None:
+            metric_outputs = evaluate_metrics(metrics_dict, sample.reference, output.prediction, sample.extra_info)
+            task_results, metrics_logging_string = self._get_task_results(
+                metric_outputs, metrics_dict, dataset_name, sample_id, pipeline
+            )
 
-        for metric_name, metric in metrics_dict.items():
-            reference = sample.reference
-            kwargs = sample.extra_info
+        # Create logging string
+        logging_string = (
+            "\n=========================================================\n"
+            f"Pipeline: {pipeline.__class__.__name__}\n"
+            f"Dataset: {dataset_name}\n"
+            f"Iteration: {sample_id + 1} of {dataset_length} ({((sample_id + 1) / dataset_length):.2%})\n"
+            f"Prediction time: {prediction_time:.4g} seconds\n"
+            f"Audio duration: {audio_duration:.4g} seconds\n"
+            f"Speed Factor: {audio_duration / prediction_time:.4g}x\n"
+            "---------------------------------------------------------\n"
+            "Metrics:\n"
+            f"{metrics_logging_string}"
+            "---------------------------------------------------------\n"
+            "=========================================================\n"
+        )
 
-            # The metric returns a dictionary that is also stored in the metric object as a state to compute the global result
-            # We copy to avoid any side effects that may happen while interacting with dictionary for reporting
-            _metric_output = metric(hypothesis=output.prediction, reference=reference, detailed=True, **kwargs)
-            metric_output = _metric_output.copy()
+        return ProcessingResult(sample_result, task_results, sample_id, logging_string, metric_outputs)
 
+    def _get_task_results(
+        self,
+        metric_outputs: list[MetricOutput],
+        metrics_dict: dict[str, BaseMetric],
+        dataset_name: str,
+        sample_id: int,
+        pipeline: Pipeline,
+    ) -> tuple[list[TaskResult], str]:
+        """Get the task results of a sample and a string logging them along with the current global results."""
+        task_results = []
+        metrics_logging_string = ""
+        for metric_name, _, metric_output in metric_outputs:
+            metric = metrics_dict[metric_name]
             detailed_result = {
                 component_name: component_value
                 for component_name, component_value in metric_output.items()
-                if component_name != metric.name
+                if component_name not in (metric.name, TIME_RESOLVED)
             }
             result = metric_output[metric.name]
+            time_resolved_result = None
+            if TIME_RESOLVED in metric_output:
+                window, components = metric_output[TIME_RESOLVED]
+                time_resolved_result = TimeResolvedResult(
+                    window=window, components={name: values.tolist() for name, values in components.items()}
+                )
 
             task_results.append(
                 TaskResult(
@@ -138,6 +177,7 @@ class BenchmarkRunner:
                     metric_name=metric_name,
                     result=result,
                     detailed_result=detailed_result,
+                    time_resolved_result=time_resolved_result,
                 )
             )
             formatted_result = f"{result:4g}" if result is not None else "N/A"
@@ -147,24 +187,32 @@ class BenchmarkRunner:
                 f"{metric_name} - Sample: {formatted_result}\n{metric_name} - Global: {formatted_metric}\n"
             )
             metrics_logging_string += formatted_string
+        return task_results, metrics_logging_string
 
-        # Create logging string
-        logging_string = (
-            "\n=========================================================\n"
-            f"Pipeline: {pipeline.__class__.__name__}\n"
-            f"Dataset: {dataset_name}\n"
-            f"Iteration: {sample_id + 1} of {dataset_length} ({((sample_id + 1) / dataset_length):.2%})\n"
-            f"Prediction time: {prediction_time:.4g} seconds\n"
-            f"Audio duration: {audio_duration:.4g} seconds\n"
-            f"Speed Factor: {audio_duration / prediction_time:.4g}x\n"
-            "---------------------------------------------------------\n"
-            "Metrics:\n"
-            f"{metrics_logging_string}"
-            "---------------------------------------------------------\n"
-            "=========================================================\n"
-        )
+    def _get_metric_stage(self, metrics_dict: dict[str, BaseMetric]) -> MetricEvaluationStage | None:
+        """Get the metric workers if configured, otherwise metrics are evaluated after each prediction."""
+        if not self.config.num_metric_workers or not metrics_dict:
+            return None
+        logger.info(f"Evaluating metrics with {self.config.num_metric_workers} metric workers")
+        return MetricEvaluationStage(metrics_dict, self.config.num_metric_workers)
 
-        return ProcessingResult(sample_result, task_results, sample_id, logging_string)
+    def _merge_metric_outputs(
+        self,
+        metric_outputs: dict[int, list[MetricOutput]],
+        metrics_dict: dict[str, BaseMetric],
+        dataset_name: str,
+        pipeline: Pipeline,
+    ) -> list[TaskResult]:
+        """Accumulate the metric outputs of samples evaluated in other processes and get their task results."""
+        task_results = []
+        for sample_id in sorted(metric_outputs):
+            for output in metric_outputs[sample_id]:
+                accumulate_components(metrics_dict[output.metric_name], output)
+            sample_task_results, _ = self._get_task_results(
+                metric_outputs[sample_id], metrics_dict, dataset_name, sample_id, pipeline
+            )
+            task_results.extend(sample_task_results)
+        return task_results
 
     def _run_pipeline_on_dataset_parallel(
         self,
@@ -200,52 +248,60 @@ class BenchmarkRunner:
         metrics_dict = self._get_metrics(pipeline)
         dataset_length = len(dataset)
 
-        args_list = [
-            ((i, sample), pipeline, dataset_name, metrics_dict, dataset_length) for i, sample in enumerate(dataset)
-        ]
+        # Submit the longest samples first (LPT scheduling) so that a long sample picked up last by a
+        # worker does not leave the other workers idle at the end of the run.
+        # Durations come from the dataset index or the audio headers, no audio is decoded here.
+        durations = dataset.get_audio_durations()
+        schedule = sorted(range(dataset_length), key=lambda i: durations[i], reverse=True)
+        logger.info(
+            f"Scheduled {dataset_length} samples ({durations.sum():.1f}s of audio) by descending duration, "
+            f"longest sample is {durations.max(initial=0.0):.1f}s"
+        )
+
+        # With metric workers the pipeline workers only run inference
+        metric_stage = self._get_metric_stage(metrics_dict)
+        worker_metrics_dict = metrics_dict if metric_stage is None else None
+        args_list = (((i, dataset[i]), pipeline, dataset_name, worker_metrics_dict, dataset_length) for i in schedule)
 
         # NOTE: Currently, pipelines that utilize the MPS backend are not supported in parallel mode.
         # This is due to the limitation of sharing tensors across processes.
         # As workaround would be to move tensors to the CPU before processing in separate processes,
         # but this would defeat the purpose of using the MPS backend and would be slower.
         # Ref: https://github.com/pytorch/pytorch/issues/87688
-        with Pool(processes=pipeline.config.num_worker_processes) as pool:
-            results = list(
-                tqdm.tqdm(
-                    pool.imap(
-                        self._process_single_sample_wrapper,
-                        args_list,
-                        chunksize=pipeline.config.per_worker_chunk_size,
-                    ),
-                    total=dataset_length,
-                    desc=f"Processing {dataset_name}",
-                )
-            )
+        results = []
+        with Pool(processes=pipeline.config.num_worker_processes) as pool, metric_stage or nullcontext():
+            for result in tqdm.tqdm(
+                pool.imap(
+                    self._process_single_sample_wrapper,
+                    args_list,
+                    chunksize=pipeline.config.per_worker_chunk_size,
+                ),
+                total=dataset_length,
+                desc=f"Processing {dataset_name}",
+            ):
+                results.append(result)
+                if metric_stage is not None:
+                    # Only the annotation columns are needed here so we avoid decoding the audio again
+                    reference, extra_info = dataset.get_reference(result.sample_id)
+                    metric_stage.submit(result.sample_id, reference, result.sample_result.prediction, extra_info)
+
+            if metric_stage is not None:
+                metric_outputs = metric_stage.collect()
+            else:
+                metric_outputs = {result.sample_id: result.metric_outputs for result in results}
 
         # Sort results by sample_id to maintain order
         results.sort(key=lambda x: x.sample_id)
 
         # Separate results
         per_sample_results = [r.sample_result for r in results]
-        per_task_results = [task for r in results for task in r.task_results]
 
         # Log results
         for result in results:
             logger.info(result.metrics_string)
 
-        # Now update the metrics in the main process
-        for metric in metrics_dict.values():
-            # Clear any existing state
-            metric.reset()
-            # Update metric with all results
-            for sample_result in per_sample_results:
-                sample = dataset[sample_result.sample_id]
-                # Get UEM from extra_info if available
-                kwargs = {}
-                if hasattr(sample, "extra_info") and "uem" in sample.extra_info:
-                    kwargs["uem"] = sample.extra_info["uem"]
-
-                metric(hypothesis=sample_result.prediction, reference=sample.reference, detailed=True, **kwargs)
+        # The metrics were evaluated on copies of the metrics of the main process, accumulate their components
+        per_task_results = self._merge_metric_outputs(metric_outputs, metrics_dict, dataset_name, pipeline)
 
         # Calculate global results after updating metrics
         global_results = get_global_results(
@@ -272,18 +328,29 @@ class BenchmarkRunner:
         metrics_dict = self._get_metrics(pipeline)
         dataset_length = len(dataset)
 
-        for sample_id, sample in enumerate(dataset):
-            processing_result = self._process_single_sample(
-                sample_and_id=(sample_id, sample),
-                pipeline=pipeline,
-                dataset_name=dataset_name,
-                metrics_dict=metrics_dict,
-                dataset_length=dataset_length,
-            )
-            per_sample_results.append(processing_result.sample_result)
-            per_task_results.extend(processing_result.task_results)
+        metric_stage = self._get_metric_stage(metrics_dict)
+        with metric_stage or nullcontext():
+            for sample_id, sample in enumerate(dataset):
+                processing_result = self._process_single_sample(
+                    sample_and_id=(sample_id, sample),
+                    pipeline=pipeline,
+                    dataset_name=dataset_name,
+                    metrics_dict=metrics_dict if metric_stage is None else None,
+                    dataset_length=dataset_length,
+                )
+                if metric_stage is not None:
+                    metric_stage.submit(
+                        sample_id, sample.reference, processing_result.sample_result.prediction, sample.extra_info
+                    )
+                per_sample_results.append(processing_result.sample_result)
+                per_task_results.extend(processing_result.task_results)
+
+                logger.info(processing_result.metrics_string)
 
-            logger.info(processing_result.metrics_string)
+            if metric_stage is not None:
+                per_task_results = self._merge_metric_outputs(
+                    metric_stage.collect(), metrics_dict, dataset_name, pipeline
+                )
 
         global_results = get_global_results(
             metrics_dict=metrics_dict,
@@ -328,6 +395,8 @@ class BenchmarkRunner:
                     ds = DatasetRegistry.get_dataset_for_pipeline(
                         pipeline_type=pipeline.pipeline_type, config=dataset_config
                     )
+                    ds.set_input_spec(pipeline.input_spec)
+                    pipeline.prepare(ds)
 
                     logger.info(f"Evaluating {pipeline.__class__.__name__} on {dataset_name}...")
 
@@ -343,6 +412,8 @@ class BenchmarkRunner:
                         results = self._run_pipeline_on_dataset(pipeline, ds, dataset_name)
 
                     sample_results, task_results, global_results = results
+                    if ds.index is not None and ds.index.is_stratified:
+                        set_stratified_confidence_width(global_results, task_results, ds.index)
                     wandb_logger(global_results, task_results, sample_results)
 
                     per_sample_results.extend(sample_results)
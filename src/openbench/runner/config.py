@@ -27,6 +27,11 @@ class BenchmarkConfig(BaseModel):
         ..., description="The metrics that will be used for each task"
     )
     datasets: dict[str, DatasetConfig] = Field(..., description="Datasets to evaluate")
+    num_metric_workers: int | None = Field(
+        None,
+        description="Number of worker processes evaluating the metrics while the pipeline keeps running. "
+        "If not set, the metrics of each sample are evaluated right after its prediction by the pipeline process",
+    )
 
     class Config:
         arbitrary_types_allowed = True
@@ -67,6 +67,16 @@ class TranscriptionSampleResult(BaseSampleResult[Union[Transcript, StreamingTran
     """
 
 
+class TimeResolvedResult(BaseModel):
+    """The components of a metric on a given sample summed over consecutive windows of the sample"""
+
+    window: float = Field(
+        ...,
+        description="The duration of the windows in seconds, the i-th window covers [i * window, (i + 1) * window)",
+    )
+    components: dict[str, list[float]] = Field(..., description="The value of each component in each window")
+
+
 class TaskResult(BaseModel):
     """The evaluation result for a given task on a given sample of a dataset"""
 
@@ -80,6 +90,10 @@ class TaskResult(BaseModel):
         description="The detailed results of the metric i.e. breakdown by its components allowing \
         for more granular analysis",
     )
+    time_resolved_result: TimeResolvedResult | None = Field(
+        None,
+        description="The components of the metric per window of the sample if the metric is time-resolved",
+    )
 
 
 class GlobalResult(BaseModel):
@@ -97,6 +111,11 @@ class GlobalResult(BaseModel):
     avg_result: float | None = Field(..., description="The average result of the metric")
     upper_bound: float | None = Field(..., description="The upper bound of the confidence interval")
     lower_bound: float | None = Field(..., description="The lower bound of the confidence interval")
+    stratified_confidence_width: float | None = Field(
+        None,
+        description="The estimated width of the confidence interval of the metric over the full dataset. \
+        Only set when the dataset is a stratified subset of the full dataset",
+    )
 
 
 class BenchmarkResult(BaseModel):
@@ -0,0 +1,128 @@
+# For licensing see accompanying LICENSE.md file.
+# Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
+
+"""Metric evaluation as a stage of its own, running in worker processes alongside the pipeline."""
+
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, NamedTuple
+
+from argmaxtools.utils import get_logger
+from pyannote.metrics.base import BaseMetric
+from pyannote.metrics.types import Details
+
+from ..metric import MetricContext
+
+
+logger = get_logger(__name__)
+
+
+class MetricOutput(NamedTuple):
+    """Components of a metric on a single sample, as returned by `BaseMetric.__call__` with `detailed=True`."""
+
+    metric_name: str
+    uri: str
+    components: Details
+
+
+def evaluate_metrics(
+    metrics_dict: dict[str, BaseMetric],
+    reference: Any,
+    prediction: Any,
+    extra_info: dict[str, Any],
+) -> list[MetricOutput]:
+    """Evaluate all the metrics on a sample, accumulating its components in each metric."""
+    # Shared by all the metrics so that artifacts such as word alignments are computed once per sample
+    context = MetricContext()
+    outputs = []
+    for metric_name, metric in metrics_dict.items():
+        # The metric returns a dictionary that is also stored in the metric object as a state to compute the global result
+        # We copy to avoid any side effects that may happen while interacting with dictionary for reporting
+        components = metric(hypothesis=prediction, reference=reference, detailed=True, context=context, **extra_info)
+        outputs.append(MetricOutput(metric_name, getattr(reference, "uri", "NA"), components.copy()))
+    return outputs
+
+
+def accumulate_components(metric: BaseMetric, output: MetricOutput) -> None:
+    """Accumulate the components of a sample evaluated by a copy of `metric`, e.g. in another process.
+
+    This is the bookkeeping of `BaseMetric.__call__` without computing the components again. Components are None
+    when the sample does not support the metric, which makes the accumulated component None as the streaming
+    metrics do.
+    """
+    metric.results_.append((output.uri, output.components))
+    for name in metric.components_:
+        if output.components[name] is None:
+            metric.accumulated_[name] = None
+            break
+        metric.accumulated_[name] += output.components[name]
+
+
+# Metrics of the worker process, copied from the runner once when the worker starts
+_worker_metrics: dict[str, BaseMetric] = {}
+
+
+def _init_worker(metrics_dict: dict[str, BaseMetric]) -> None:
+    global _worker_metrics
+    _worker_metrics = metrics_dict
+
+
+def _evaluate_sample(
+    sample_id: int, reference: Any, prediction: Any, extra_info: dict[str, Any]
+) -> tuple[int, list[MetricOutput]]:
+    outputs = evaluate_metrics(_worker_metrics, reference, prediction, extra_info)
+    # Accumulation happens in the runner, the worker metrics only need the components of this sample
+    for metric in _worker_metrics.values():
+        metric.reset()
+    return sample_id, outputs
+
+
+class MetricEvaluationStage:
+    """Pool of worker processes evaluating the metrics of the predictions submitted by the runner.
+
+    The runner submits each prediction as soon as the pipeline returns it and keeps running the pipeline while
+    the workers score, so inference and metric costs scale independently with the number of pipeline and metric
+    workers. At most `max_pending` predictions wait to be scored, beyond that `submit` waits for the workers to
+    catch up, which bounds the memory held by the queue. Workers are spawned rather than forked so that they do
+    not inherit the model or device state of the pipeline process.
+
+    Use as a context manager, `collect` returns the metric outputs of all the submitted samples once scored.
+    """
+
+    def __init__(self, metrics_dict: dict[str, BaseMetric], num_workers: int, max_pending: int | None = None) -> None:
+        self.num_workers = num_workers
+        self.max_pending = max_pending or 4 * num_workers
+        self.executor = ProcessPoolExecutor(
+            max_workers=num_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(metrics_dict,),
+        )
+        self.pending: set[Future] = set()
+        self.outputs: dict[int, list[MetricOutput]] = {}
+
+    def __enter__(self) -> "MetricEvaluationStage":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+    def _store(self, futures: set[Future]) -> None:
+        for future in futures:
+            sample_id, outputs = future.result()
+            self.outputs[sample_id] = outputs
+        self.pending -= futures
+
+    def submit(self, sample_id: int, reference: Any, prediction: Any, extra_info: dict[str, Any]) -> None:
+        if len(self.pending) >= self.max_pending:
+            done, _ = wait(self.pending, return_when=FIRST_COMPLETED)
+            self._store(done)
+        self.pending.add(self.executor.submit(_evaluate_sample, sample_id, reference, prediction, extra_info))
+
+    def collect(self) -> dict[int, list[MetricOutput]]:
+        """Wait for all the submitted samples to be scored and get their metric outputs by sample id."""
+        if self.pending:
+            logger.info(f"Waiting for the metrics of {len(self.pending)} samples")
+            done, _ = wait(self.pending)
+            self._store(done)
+        return self.outputs
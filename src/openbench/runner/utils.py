@@ -5,10 +5,12 @@ import os
 from contextlib import contextmanager
 from pathlib import Path
 
+import numpy as np
 from argmaxtools.utils import get_logger
 from pyannote.metrics.base import BaseMetric
 
-from .data_models import GlobalResult
+from ..dataset import DatasetIndex
+from .data_models import GlobalResult, TaskResult
 
 
 logger = get_logger(__name__)
@@ -44,6 +46,30 @@ def get_global_results(
     return global_results
 
 
+def set_stratified_confidence_width(
+    global_results: list[GlobalResult],
+    task_results: list[TaskResult],
+    index: DatasetIndex,
+    alpha: float = 0.9,
+) -> None:
+    """Estimate from the per-sample results how precise the global results of a stratified subset are.
+
+    The confidence width is stored in `stratified_confidence_width` of each global result.
+    """
+    for global_result in global_results:
+        values = np.full(len(index), np.nan)
+        for task_result in task_results:
+            if task_result.metric_name == global_result.metric_name and task_result.result is not None:
+                values[task_result.sample_id] = task_result.result
+        confidence_width = index.estimate_confidence_width(values, alpha=alpha)
+        global_result.stratified_confidence_width = confidence_width
+        logger.info(
+            f"{global_result.metric_name} on {global_result.dataset_name}: {global_result.global_result:.4g} "
+            f"with an estimated {alpha:.0%} confidence width of {confidence_width:.4g} on the full dataset "
+            f"({index.total_duration / 3600:.2f}h of audio evaluated, the width scales with 1/sqrt(hours))"
+        )
+
+
 @contextmanager
 def change_directory(path: Path | str):
     """Context manager for changing the current working directory.
@@ -12,6 +12,7 @@ import wandb
 from argmaxtools.utils import get_logger
 
 from ..metric import MetricOptions
+from ..metric.registry import is_variant_of
 from ..types import PredictionProtocol
 from .data_models import (
     BaseSampleResult,
@@ -94,7 +95,8 @@ class WandbLogger(ABC, Generic[SampleResult]):
             all_keys.update(task_result.detailed_result.keys())
         for key in all_keys:
             df[f"detailed_{key}"] = df["detailed_result"].apply(lambda x: x.get(key, None))
-        df = df.drop(columns=["detailed_result"])
+        # Per-window components are kept in the benchmark results, the table only holds per-sample values
+        df = df.drop(columns=["detailed_result", "time_resolved_result"])
 
         return {f"{dataset_name}/task_results_table": wandb.Table(dataframe=df)}
 
@@ -248,7 +250,7 @@ class DiarizationWandbLogger(WandbLogger[DiarizationSampleResult]):
         wandb.log_artifact(embeddings_artifact)
 
     def get_der_components(self, global_results: list[GlobalResult]) -> dict[str, wandb.Table]:
-        """Create a table of DER components.
+        """Create a table of DER components with one row per DER variant, e.g. of a collar sweep.
 
         Args:
             global_results: List of GlobalResult objects
@@ -257,9 +259,13 @@ class DiarizationWandbLogger(WandbLogger[DiarizationSampleResult]):
             Dictionary mapping dataset name to wandb.Table with DER breakdown
         """
         self.logger.info("Getting DER components")
-        der_global_results = [g for g in global_results if g.metric_name == MetricOptions.DER.value]
-        if len(der_global_results) == 0 or len(der_global_results) > 1:
-            raise ValueError("There should be only one DER global result as logging is done per dataset")
+        der_global_results = [g for g in global_results if is_variant_of(g.metric_name, MetricOptions.DER)]
+        if len(der_global_results) == 0:
+            raise ValueError("There should be at least one DER global result")
+        if len({g.dataset_name for g in der_global_results}) > 1:
+            raise ValueError("DER global results should come from a single dataset as logging is done per dataset")
+        if len({g.metric_name for g in der_global_results}) < len(der_global_results):
+            raise ValueError("There should be only one global result per DER variant")
 
         dataset_name = der_global_results[0].dataset_name
         der_detailed_result = [g.detailed_result for g in der_global_results]
@@ -275,6 +281,7 @@ class DiarizationWandbLogger(WandbLogger[DiarizationSampleResult]):
             .assign(
                 pipeline_name=[g.pipeline_name for g in der_global_results],
                 dataset_name=[g.dataset_name for g in der_global_results],
+                metric_name=[g.metric_name for g in der_global_results],
                 der=[g.global_result for g in der_global_results],
                 false_alarm_rate=lambda x: x["false_alarm"] / x["total"],
                 missed_detection_rate=lambda x: x["missed_detection"] / x["total"],
@@ -282,7 +289,7 @@ class DiarizationWandbLogger(WandbLogger[DiarizationSampleResult]):
             )
         )
 
-        first_cols = ["pipeline_name", "dataset_name", "der"]
+        first_cols = ["pipeline_name", "dataset_name", "metric_name", "der"]
         last_cols = [col for col in der_components_df.columns if col not in first_cols]
 
         return {
@@ -308,7 +315,7 @@ class DiarizationWandbLogger(WandbLogger[DiarizationSampleResult]):
         self.log_embeddings_artifact(sample_results)
 
         custom_log_dict = {}
-        if any(g.metric_name == MetricOptions.DER.value for g in global_results):
+        if any(is_variant_of(g.metric_name, MetricOptions.DER) for g in global_results):
             custom_log_dict.update(self.get_der_components(global_results))
         return custom_log_dict
 
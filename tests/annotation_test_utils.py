@@ -0,0 +1,20 @@
+# For licensing see accompanying LICENSE.md file.
+# Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
+
+"""Random pyannote annotations shared by the metric and runner tests."""
+
+import random
+
+from pyannote.core import Annotation, Segment
+
+
+def create_annotation(rng: random.Random, labels: list, num_segments: int) -> Annotation:
+    """Speaker turns with gaps and overlaps, including overlapping turns of the same speaker."""
+    annotation = Annotation()
+    start = 0.0
+    for track in range(num_segments):
+        start = round(max(0.0, start + rng.uniform(-1, 2)), 3)
+        end = round(start + rng.uniform(0.1, 5), 3)
+        annotation[Segment(start, end), track] = rng.choice(labels)
+        start = end
+    return annotation
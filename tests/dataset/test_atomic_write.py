@@ -0,0 +1,47 @@
+# For licensing see accompanying LICENSE.md file.
+# Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from openbench.dataset.dataset_utils import atomic_write
+
+
+class TestAtomicWrite(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name) / "nested" / "index.json"
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_write(self) -> None:
+        tmp_paths = []
+
+        def write(tmp_path: Path) -> None:
+            tmp_paths.append(tmp_path)
+            tmp_path.write_text("new")
+
+        self.assertEqual(atomic_write(self.path, write), self.path)
+        self.assertEqual(self.path.read_text(), "new")
+        # The temporary file is next to the file and unique to the writer
+        self.assertEqual(tmp_paths[0].parent, self.path.parent)
+        self.assertNotEqual(tmp_paths[0], self.path)
+        self.assertEqual(list(self.path.parent.iterdir()), [self.path])
+
+    def test_failed_write_keeps_file(self) -> None:
+        atomic_write(self.path, lambda tmp_path: tmp_path.write_text("old"))
+
+        def write(tmp_path: Path) -> None:
+            tmp_path.write_text("partial")
+            raise OSError("disk full")
+
+        with self.assertRaises(OSError):
+            atomic_write(self.path, write)
+        self.assertEqual(self.path.read_text(), "old")
+        self.assertEqual(list(self.path.parent.iterdir()), [self.path])
+
+
+if __name__ == "__main__":
+    unittest.main()
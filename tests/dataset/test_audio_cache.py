@@ -0,0 +1,61 @@
+# For licensing see accompanying LICENSE.md file.
+# Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import datasets
+import numpy as np
+import soundfile as sf
+
+from openbench.dataset import TranscriptionSample
+from openbench.dataset.audio_cache import get_audio_cache_dir
+from openbench.pipeline_prediction import Transcript
+
+
+SAMPLE_RATE = 16000
+
+
+class TestAudioCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.tmp_path = Path(self.tmp_dir.name)
+        self.patcher = mock.patch.object(datasets.config, "HF_DATASETS_CACHE", str(self.tmp_path / "cache"))
+        self.patcher.start()
+
+    def tearDown(self) -> None:
+        self.patcher.stop()
+        self.tmp_dir.cleanup()
+
+    def create_sample(self, seed: int) -> TranscriptionSample:
+        waveform = np.random.default_rng(seed).uniform(-0.5, 0.5, SAMPLE_RATE).astype(np.float32)
+        return TranscriptionSample(
+            audio_name="sample",
+            waveform=waveform,
+            sample_rate=SAMPLE_RATE,
+            reference=Transcript.from_words_info(words=["hello"]),
+        )
+
+    def test_same_audio_is_written_once(self) -> None:
+        sample = self.create_sample(seed=0)
+        first_path = sample.save_audio(self.tmp_path / "pipeline_a")
+        second_path = sample.save_audio(self.tmp_path / "pipeline_b")
+        self.assertEqual(len(list(get_audio_cache_dir().glob("*.wav"))), 1)
+
+        saved, sample_rate = sf.read(first_path, dtype="float32")
+        self.assertEqual(sample_rate, SAMPLE_RATE)
+        np.testing.assert_allclose(saved, sample.waveform, atol=1e-4)
+
+        # Pipelines delete their input file after use, the cache must not be affected
+        first_path.unlink()
+        self.assertTrue(second_path.exists())
+        self.assertEqual(len(list(get_audio_cache_dir().glob("*.wav"))), 1)
+
+        self.create_sample(seed=1).save_audio(self.tmp_path / "pipeline_a")
+        self.assertEqual(len(list(get_audio_cache_dir().glob("*.wav"))), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+# For licensing see accompanying LICENSE.md file.
+# Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import datasets
+import numpy as np
+import soundfile as sf
+
+from openbench.dataset import AudioInputSpec, LazyWaveform, TranscriptionDataset
+from openbench.dataset.audio_input import conform_audio, get_resampled_path, resample_audio
+
+
+class TestAudioInput(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.sample_rate = 44100
+        t = np.arange(2 * self.sample_rate) / self.sample_rate
+        self.waveform = (0.5 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_resample_audio(self) -> None:
+        resampled = resample_audio(self.waveform, self.sample_rate, 16000)
+        self.assertEqual(resampled.dtype, np.float32)
+        self.assertEqual(len(resampled), 2 * 16000)
+        # The tone is preserved
+        spectrum = np.abs(np.fft.rfft(resampled))
+        self.assertAlmostEqual(np.argmax(spectrum) * 16000 / len(resampled), 440, delta=1)
+
+    def test_conform_audio(self) -> None:
+        spec = AudioInputSpec(sample_rate=16000, channels=2, dtype="int16")
+        waveform, sample_rate = conform_audio(self.waveform, self.sample_rate, spec)
+        self.assertEqual(sample_rate, 16000)
+        self.assertEqual(waveform.shape, (2 * 16000, 2))
+        self.assertEqual(waveform.dtype, np.int16)
+
+    def test_dataset_input_spec_is_cached(self) -> None:
+        audio_path = Path(self.tmp_dir.name) / "sample.wav"
+        sf.write(audio_path, self.waveform, self.sample_rate, subtype="FLOAT")
+        ds = datasets.Dataset.from_dict({"audio": [str(audio_path)], "transcript": [["hello"]]})
+        dataset = TranscriptionDataset(ds.cast_column("audio", datasets.Audio()), lazy_audio=True)
+
+        # Without conversion the waveform stays lazy
+        dataset.set_input_spec(AudioInputSpec())
+        self.assertIsInstance(dataset[0].waveform, LazyWaveform)
+
+        dataset.set_input_spec(AudioInputSpec(sample_rate=16000))
+        with mock.patch.object(datasets.config, "HF_DATASETS_CACHE", self.tmp_dir.name):
+            sample = dataset[0]
+            self.assertEqual(sample.sample_rate, 16000)
+            self.assertAlmostEqual(sample.get_audio_duration(), 2.0)
+            self.assertTrue(get_resampled_path(dataset.ds._fingerprint, 0, 16000).exists())
+
+            cached_sample = dataset[0]
+            self.assertIsInstance(cached_sample.waveform, np.memmap)
+            np.testing.assert_array_equal(cached_sample.waveform, sample.waveform)
+
+            # Cached waveforms are writable, e.g. by `torch.from_numpy`, without modifying the cache
+            self.assertTrue(cached_sample.waveform.flags.writeable)
+            cached_sample.waveform[:] = 0.0
+            np.testing.assert_array_equal(dataset[0].waveform, sample.waveform)
+
+
+if __name__ == "__main__":
+    unittest.main()
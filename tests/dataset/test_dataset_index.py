@@ -0,0 +1,162 @@
+# For licensing see accompanying LICENSE.md file.
+# Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import datasets
+import numpy as np
+import pandas as pd
+import soundfile as sf
+
+from openbench.dataset import DatasetConfig, DatasetIndex, DiarizationDataset
+
+
+SAMPLE_RATE = 16000
+
+# (duration, timestamps_start, timestamps_end, speakers)
+SAMPLES = [
+    (3.0, [0.0, 1.0], [2.0, 3.0], ["A", "B"]),  # 1s of overlap over 3s of speech
+    (1.0, [0.0], [1.0], ["A"]),
+    (5.0, [0.0, 1.0, 2.0], [1.0, 2.0, 3.0], ["A", "B", "C"]),
+]
+
+
+class TestDatasetIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        tmp_path = Path(self.tmp_dir.name)
+        audio_paths = []
+        for i, (duration, *_) in enumerate(SAMPLES):
+            audio_path = tmp_path / f"sample_{i}.wav"
+            sf.write(audio_path, np.zeros(int(duration * SAMPLE_RATE), dtype=np.float32), SAMPLE_RATE)
+            audio_paths.append(str(audio_path))
+
+        ds = datasets.Dataset.from_dict(
+            {
+                "audio": audio_paths,
+                "timestamps_start": [sample[1] for sample in SAMPLES],
+                "timestamps_end": [sample[2] for sample in SAMPLES],
+                "speakers": [sample[3] for sample in SAMPLES],
+            }
+        ).cast_column("audio", datasets.Audio(sampling_rate=SAMPLE_RATE))
+        self.dataset = DiarizationDataset(ds)
+        self.index = self.dataset.build_index()
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_build_index(self) -> None:
+        np.testing.assert_allclose(self.index.durations, [3.0, 1.0, 5.0])
+        self.assertEqual(self.index.df["num_speakers"].tolist(), [2, 1, 3])
+        np.testing.assert_allclose(self.index.df["overlap_ratio"], [1 / 3, 0.0, 0.0])
+        self.assertEqual(self.index.df["sample_rate"].tolist(), [SAMPLE_RATE] * 3)
+        self.assertTrue(self.index.df["num_words"].isna().all())
+        self.assertTrue((self.index.df["file_size"] > 0).all())
+
+    def test_config_select(self) -> None:
+        config = DatasetConfig(dataset_id="dummy", max_duration=4.0)
+        self.assertEqual(config.select(self.index).sample_ids, [0, 1])
+
+        config = DatasetConfig(dataset_id="dummy", duration_range=(2.0, 5.0), min_speakers=3)
+        self.assertEqual(config.select(self.index).sample_ids, [2])
+
+        config = DatasetConfig(dataset_id="dummy", sort_by="audio_duration", sort_descending=True, num_samples=2)
+        self.assertEqual(config.select(self.index).sample_ids, [2, 0])
+
+    def test_stratified_sample(self) -> None:
+        rng = np.random.default_rng(0)
+        num_samples = 200
+        index = DatasetIndex(
+            pd.DataFrame(
+                {
+                    "sample_id": np.arange(num_samples),
+                    "audio_duration": rng.uniform(10, 600, num_samples),
+                    "sample_rate": SAMPLE_RATE,
+                    "num_speakers": rng.integers(1, 6, num_samples),
+                    "overlap_ratio": rng.uniform(0, 0.4, num_samples),
+                    "num_words": np.nan,
+                    "file_size": 0,
+                }
+            )
+        )
+        budget = 0.1 * index.total_duration
+        config = DatasetConfig(dataset_id="dummy", subset_strategy="stratified", audio_hours_budget=budget / 3600)
+        subset = config.select(index)
+
+        self.assertTrue(subset.is_stratified)
+        self.assertLess(len(subset), num_samples)
+        self.assertAlmostEqual(subset.total_duration, budget, delta=0.25 * budget)
+        self.assertEqual(subset.sample_ids, sorted(subset.sample_ids))
+        # Same seed draws the same subset
+        self.assertEqual(config.select(index).sample_ids, subset.sample_ids)
+        # Strata are weighted by their share of samples, as the per-sample mean is
+        strata = index.get_strata()
+        for stratum, stratum_df in subset.df.groupby("stratum"):
+            self.assertEqual(stratum_df["stratum_size"].iloc[0], (strata == stratum).sum())
+            self.assertAlmostEqual(stratum_df["stratum_weight"].iloc[0], (strata == stratum).mean())
+
+        # A constant metric is known exactly, a noisy one is not
+        self.assertAlmostEqual(subset.estimate_confidence_width(np.full(len(subset), 0.2)), 0.0)
+        self.assertGreater(subset.estimate_confidence_width(rng.uniform(0, 1, len(subset))), 0.0)
+
+    def test_confidence_width_single_sample_strata(self) -> None:
+        values = np.random.default_rng(0).uniform(0, 1, 8)
+
+        def create_stratified_index(num_strata: int) -> DatasetIndex:
+            # 8 samples split evenly in `num_strata` strata, each sampling a tenth of its population
+            samples_per_stratum = len(values) // num_strata
+            return DatasetIndex(
+                pd.DataFrame(
+                    {
+                        "sample_id": np.arange(len(values)),
+                        "audio_duration": 60.0,
+                        "sample_rate": SAMPLE_RATE,
+                        "num_speakers": 2,
+                        "overlap_ratio": 0.0,
+                        "num_words": np.nan,
+                        "file_size": 0,
+                        "stratum": [str(i // samples_per_stratum) for i in range(len(values))],
+                        "stratum_weight": 1 / num_strata,
+                        "stratum_size": 10 * samples_per_stratum,
+                    }
+                )
+            )
+
+        width = create_stratified_index(2).estimate_confidence_width(values)
+        self.assertGreater(width, 0.0)
+        # Strata of a single sample do not make the interval narrower
+        self.assertGreaterEqual(create_stratified_index(8).estimate_confidence_width(values), width)
+        # The variance cannot be estimated from a single result
+        self.assertTrue(
+            np.isnan(create_stratified_index(8).estimate_confidence_width(values[:1].tolist() + [np.nan] * 7))
+        )
+
+    def test_stratified_requires_budget(self) -> None:
+        with self.assertRaises(ValueError):
+            DatasetConfig(dataset_id="dummy", subset_strategy="stratified")
+
+    def test_dataset_select(self) -> None:
+        config = DatasetConfig(dataset_id="dummy", sort_by="audio_duration")
+        selected = self.dataset.select(config.select(self.index))
+        self.assertEqual(len(selected), 3)
+        self.assertEqual(selected.index.sample_ids, [0, 1, 2])
+        np.testing.assert_allclose(selected.get_audio_durations(), [1.0, 3.0, 5.0])
+        self.assertAlmostEqual(selected[0].get_audio_duration(), 1.0)
+
+    def test_load_index_persists(self) -> None:
+        config = DatasetConfig(dataset_id="org/dummy", split="test")
+        with mock.patch.object(datasets.config, "HF_DATASETS_CACHE", self.tmp_dir.name):
+            index_path = self.dataset.get_index_path(config)
+            self.dataset.load_index(config)
+            self.assertTrue(index_path.exists())
+            self.assertTrue(index_path.is_relative_to(self.tmp_dir.name))
+
+            loaded = DatasetIndex.load(index_path)
+            self.assertTrue(loaded.df.equals(self.index.df))
+
+
+if __name__ == "__main__":
+    unittest.main()
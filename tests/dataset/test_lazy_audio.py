@@ -0,0 +1,68 @@
+# For licensing see accompanying LICENSE.md file.
+# Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import datasets
+import numpy as np
+import soundfile as sf
+
+from openbench.dataset import LazyWaveform, TranscriptionDataset, iter_audio_chunks
+
+
+SAMPLE_RATE = 16000
+
+
+class TestLazyWaveform(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.audio_path = Path(self.tmp_dir.name) / "sample.wav"
+        rng = np.random.default_rng(0)
+        self.waveform = rng.uniform(-0.5, 0.5, int(2.5 * SAMPLE_RATE)).astype(np.float32)
+        sf.write(self.audio_path, self.waveform, SAMPLE_RATE, subtype="FLOAT")
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_array_compatibility(self) -> None:
+        lazy = LazyWaveform(str(self.audio_path))
+        self.assertEqual(len(lazy), len(self.waveform))
+        self.assertEqual(lazy.sample_rate, SAMPLE_RATE)
+        np.testing.assert_array_equal(np.asarray(lazy), self.waveform)
+        np.testing.assert_array_equal(lazy[100:2000], self.waveform[100:2000])
+        self.assertEqual(lazy[-1], self.waveform[-1])
+
+    def test_chunks_from_bytes(self) -> None:
+        lazy = LazyWaveform(self.audio_path.read_bytes())
+        chunks = list(iter_audio_chunks(lazy, chunk_size=SAMPLE_RATE))
+        self.assertEqual([len(chunk) for chunk in chunks], [SAMPLE_RATE, SAMPLE_RATE, SAMPLE_RATE // 2])
+        np.testing.assert_array_equal(np.concatenate(chunks), self.waveform)
+
+        array_chunks = list(iter_audio_chunks(self.waveform, chunk_size=SAMPLE_RATE))
+        for chunk, array_chunk in zip(chunks, array_chunks):
+            np.testing.assert_array_equal(chunk, array_chunk)
+
+    def test_lazy_dataset(self) -> None:
+        ds = datasets.Dataset.from_dict({"audio": [str(self.audio_path)], "transcript": [["hello", "world"]]})
+        ds = ds.cast_column("audio", datasets.Audio())
+        sample = TranscriptionDataset(ds, lazy_audio=True)[0]
+        self.assertIsInstance(sample.waveform, LazyWaveform)
+        self.assertEqual(sample.audio_name, "sample")
+        self.assertAlmostEqual(sample.get_audio_duration(), 2.5)
+
+        saved_path = sample.save_audio(Path(self.tmp_dir.name) / "saved")
+        saved, sample_rate = sf.read(saved_path, dtype="float32")
+        self.assertEqual(sample_rate, SAMPLE_RATE)
+        np.testing.assert_allclose(saved, self.waveform, atol=1e-4)
+
+        # Resampling on decoding is not supported lazily so the decoded waveform is used instead
+        resampled_ds = ds.cast_column("audio", datasets.Audio(sampling_rate=8000))
+        resampled_sample = TranscriptionDataset(resampled_ds, lazy_audio=True)[0]
+        self.assertIsInstance(resampled_sample.waveform, np.ndarray)
+        self.assertEqual(resampled_sample.sample_rate, 8000)
+
+
+if __name__ == "__main__":
+    unittest.main()
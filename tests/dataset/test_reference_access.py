@@ -0,0 +1,68 @@
+# For licensing see accompanying LICENSE.md file.
+# Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import datasets
+import numpy as np
+import soundfile as sf
+
+from openbench.dataset import DiarizationDataset
+
+
+SAMPLE_RATE = 16000
+
+
+def create_diarization_dataset(output_dir: Path, durations: list[float]) -> datasets.Dataset:
+    audio_paths = []
+    for i, duration in enumerate(durations):
+        audio_path = output_dir / f"sample_{i}.wav"
+        sf.write(audio_path, np.zeros(int(duration * SAMPLE_RATE), dtype=np.float32), SAMPLE_RATE)
+        audio_paths.append(str(audio_path))
+
+    return datasets.Dataset.from_dict(
+        {
+            "audio": audio_paths,
+            "timestamps_start": [[0.0, 0.5] for _ in durations],
+            "timestamps_end": [[0.5, 1.0] for _ in durations],
+            "speakers": [["A", "B"] for _ in durations],
+        }
+    ).cast_column("audio", datasets.Audio(sampling_rate=SAMPLE_RATE))
+
+
+class TestReferenceAccess(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.durations = [1.0, 2.5, 4.0]
+        self.dataset = DiarizationDataset(create_diarization_dataset(Path(self.tmp_dir.name), self.durations))
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_get_reference_matches_sample(self) -> None:
+        for idx in range(len(self.dataset)):
+            reference, extra_info = self.dataset.get_reference(idx)
+            sample = self.dataset[idx]
+            self.assertEqual(
+                list(reference.itertracks(yield_label=True)),
+                list(sample.reference.itertracks(yield_label=True)),
+            )
+            self.assertEqual(extra_info, sample.extra_info)
+
+    def test_iter_references_covers_dataset(self) -> None:
+        references = list(self.dataset.iter_references())
+        self.assertEqual(len(references), len(self.dataset))
+
+    def test_reference_ds_has_no_audio(self) -> None:
+        self.assertNotIn("audio", self.dataset.reference_ds.column_names)
+
+    def test_get_audio_duration_from_header(self) -> None:
+        for idx, duration in enumerate(self.durations):
+            self.assertAlmostEqual(self.dataset.get_audio_duration(idx), duration)
+            self.assertAlmostEqual(self.dataset.get_audio_duration(idx), self.dataset[idx].get_audio_duration())
+
+
+if __name__ == "__main__":
+    unittest.main()
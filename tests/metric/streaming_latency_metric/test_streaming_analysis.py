@@ -0,0 +1,73 @@
+# For licensing see accompanying LICENSE.md file.
+# Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
+
+import unittest
+
+from openbench.metric import (
+    ConfirmedStreamingLatency,
+    MetricContext,
+    ModelTimestampBasedConfirmedStreamingLatency,
+    ModelTimestampBasedStreamingLatency,
+    NumDeletions,
+    NumInsertions,
+    NumSubstitutions,
+    StreamingLatency,
+)
+from openbench.metric.streaming_latency_metrics import StreamingAnalysis
+from openbench.pipeline_prediction import StreamingTranscript, Transcript
+
+
+METRIC_CLASSES = [
+    StreamingLatency,
+    ConfirmedStreamingLatency,
+    ModelTimestampBasedStreamingLatency,
+    ModelTimestampBasedConfirmedStreamingLatency,
+    NumDeletions,
+    NumSubstitutions,
+    NumInsertions,
+]
+
+
+class TestStreamingAnalysis(unittest.TestCase):
+    def setUp(self) -> None:
+        words = ["the", "cat", "sat", "on", "the", "mat", "today"]
+        self.reference = Transcript.from_words_info(
+            words=words,
+            start=[0.5 * i for i in range(len(words))],
+            end=[0.5 * i + 0.4 for i in range(len(words))],
+        )
+        interim_results = ["the", "the cap", "the cat sat", "the cat sat on a", "the cat sat on the mat today"]
+        confirmed_interim_results = ["the cat sat", "the cat sat on the mat today"]
+        self.hypothesis = StreamingTranscript(
+            transcript=confirmed_interim_results[-1],
+            audio_cursor=[1.0, 1.5, 2.0, 2.5, 4.0],
+            interim_results=interim_results,
+            confirmed_audio_cursor=[2.0, 4.0],
+            confirmed_interim_results=confirmed_interim_results,
+            model_timestamps_hypothesis=[[{"start": 0.1 * i, "end": 0.5 * i + 0.2}] for i in range(5)],
+            model_timestamps_confirmed=[[{"start": 0.0, "end": 1.4}], [{"start": 1.5, "end": 3.4}]],
+        )
+
+    def test_metrics_share_analysis(self) -> None:
+        expected = [
+            metric_class()(reference=self.reference, hypothesis=self.hypothesis, detailed=True)
+            for metric_class in METRIC_CLASSES
+        ]
+
+        context = MetricContext()
+        results = [
+            metric_class()(reference=self.reference, hypothesis=self.hypothesis, detailed=True, context=context)
+            for metric_class in METRIC_CLASSES
+        ]
+        self.assertEqual(results, expected)
+        self.assertIsInstance(context.artifacts["streaming_analysis"], StreamingAnalysis)
+
+    def test_missing_track(self) -> None:
+        hypothesis = self.hypothesis.model_copy(update={"confirmed_interim_results": None})
+        analysis = StreamingAnalysis(self.reference, hypothesis)
+        self.assertEqual(analysis.get_latencies(confirmed=True, model_timestamps_based=False), (None, None, None))
+        self.assertIsNotNone(analysis.get_latencies(confirmed=False, model_timestamps_based=False).min_latency)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+# For licensing see accompanying LICENSE.md file.
+# Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
+
+import random
+import unittest
+
+import jiwer
+
+from openbench.metric.streaming_latency_metrics.text_alignment import IncrementalAligner
+
+
+RANDOM_SEED = 42
+VOCABULARY = ["a", "b", "c", "d", "e", "f"]
+
+
+class TestIncrementalAligner(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = random.Random(RANDOM_SEED)
+        self.truth = " ".join(rng.choice(VOCABULARY) for _ in range(60))
+        # Growing interim results with errors, as streamed by a transcription API
+        truth_words = self.truth.split()
+        self.interim_results = []
+        for end in range(1, len(truth_words) + 1, 3):
+            words = [word if rng.random() < 0.8 else rng.choice(VOCABULARY) for word in truth_words[:end]]
+            self.interim_results.append(" ".join(word for word in words if rng.random() > 0.1))
+
+    def test_alignment_matches_jiwer(self) -> None:
+        aligner = IncrementalAligner()
+        for hypothesis in self.interim_results:
+            expected = jiwer.process_words(self.truth, hypothesis).alignments[0]
+            alignment = aligner.align(self.truth, hypothesis)
+            self.assertEqual(alignment.types, [chunk.type for chunk in expected])
+
+            matched = [chunk for chunk in expected if chunk.type in ["equal", "substitute"]]
+            self.assertEqual(alignment.get_matched_ref_span(), (matched[0].ref_start_idx, matched[-1].ref_end_idx))
+            for hyp_idx in range(len(hypothesis.split()) + 1):
+                expected_ref_idx = next(
+                    (
+                        chunk.ref_start_idx + hyp_idx - chunk.hyp_start_idx
+                        for chunk in expected
+                        if chunk.hyp_start_idx <= hyp_idx < chunk.hyp_end_idx
+                    ),
+                    None,
+                )
+                self.assertEqual(alignment.map_hyp_index(hyp_idx), expected_ref_idx)
+
+    def test_edits_match_jiwer(self) -> None:
+        aligner = IncrementalAligner()
+        for previous, current in zip(self.interim_results[:-1], self.interim_results[1:]):
+            expected = jiwer.process_words(previous, current).alignments[0]
+            self.assertEqual(
+                aligner.get_edits(previous, current), [chunk for chunk in expected if chunk.type != "equal"]
+            )
+
+    def test_empty_reference(self) -> None:
+        with self.assertRaises(ValueError):
+            IncrementalAligner().align("", "a")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+# For licensing see accompanying LICENSE.md file.
+# Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
+
+import random
+import unittest
+
+from annotation_test_utils import create_annotation
+from pyannote.core import Segment, Timeline
+from pyannote.metrics import detection, diarization
+
+from openbench.metric import MetricContext
+from openbench.metric.diarization_metrics import (
+    DetectionCostFunction,
+    DetectionErrorRate,
+    DetectionPrecisionRecallFMeasure,
+    DiarizationErrorRate,
+    DiarizationHomogeneity,
+    DiarizationPurity,
+    DiarizationPurityCoverageFMeasure,
+    JaccardErrorRate,
+)
+
+
+RANDOM_SEED = 42
+RESOLUTION = 0.001
+
+METRICS = [
+    (diarization.DiarizationErrorRate, DiarizationErrorRate),
+    (diarization.JaccardErrorRate, JaccardErrorRate),
+    (diarization.DiarizationPurity, DiarizationPurity),
+    (diarization.DiarizationPurityCoverageFMeasure, DiarizationPurityCoverageFMeasure),
+    (diarization.DiarizationHomogeneity, DiarizationHomogeneity),
+    (detection.DetectionErrorRate, DetectionErrorRate),
+    (detection.DetectionCostFunction, DetectionCostFunction),
+    (detection.DetectionPrecisionRecallFMeasure, DetectionPrecisionRecallFMeasure),
+]
+
+
+class TestDiarizationFrames(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = random.Random(RANDOM_SEED)
+        self.samples = []
+        for _ in range(30):
+            reference = create_annotation(rng, ["A", "B", "C"], rng.randint(5, 20))
+            hypothesis = create_annotation(rng, [0, 1, 2, 3], rng.randint(5, 20))
+            duration = reference.get_timeline().extent().end
+            uem = Timeline([Segment(0, duration / 2), Segment(duration / 2 + 1, duration + 5)])
+            self.samples.append((reference, hypothesis, uem))
+
+    def assert_agrees_with_pyannote(self, collar: float, skip_overlap: bool) -> None:
+        for reference, hypothesis, uem in self.samples:
+            context = MetricContext()
+            for pyannote_metric_class, metric_class in METRICS:
+                expected = pyannote_metric_class(collar=collar, skip_overlap=skip_overlap)(
+                    reference, hypothesis, uem=uem, detailed=True
+                )
+                components = metric_class(
+                    collar=collar, skip_overlap=skip_overlap, engine="frames", resolution=RESOLUTION
+                )(reference, hypothesis, uem=uem, detailed=True, context=context)
+                self.assertEqual(set(components), set(expected))
+                for name, value in expected.items():
+                    # Each segment boundary moves by at most half a frame
+                    self.assertAlmostEqual(components[name], value, delta=0.05, msg=f"{metric_class.__name__} {name}")
+            # All the metrics share the discretized annotations and frames of the sample
+            self.assertEqual(len(context.artifacts), 2)
+
+    def test_agrees_with_pyannote(self) -> None:
+        self.assert_agrees_with_pyannote(collar=0.0, skip_overlap=False)
+
+    def test_agrees_with_pyannote_with_collar_and_skip_overlap(self) -> None:
+        self.assert_agrees_with_pyannote(collar=0.5, skip_overlap=True)
+
+    def test_pyannote_engine_is_default(self) -> None:
+        reference, hypothesis, uem = self.samples[0]
+        expected = diarization.DiarizationErrorRate()(reference, hypothesis, uem=uem, detailed=True)
+        self.assertEqual(DiarizationErrorRate()(reference, hypothesis, uem=uem, detailed=True), expected)
+
+    def test_unknown_engine(self) -> None:
+        with self.assertRaises(ValueError):
+            DiarizationErrorRate(engine="segments")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+# For licensing see accompanying LICENSE.md file.
+# Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
+
+import pickle
+import unittest
+
+from openbench.metric import MetricContext, WordDiarizationErrorRate, WordErrorRate
+from openbench.pipeline_prediction import Transcript
+
+
+class TestMetricContext(unittest.TestCase):
+    def setUp(self) -> None:
+        self.reference = Transcript.from_words_info(
+            words=["Hello", "there", "I", "can't", "hear", "you"],
+            speaker=["A", "A", "B", "B", "B", "B"],
+        )
+        self.hypothesis = Transcript.from_words_info(
+            words=["hello", "there", "I", "cannot", "here", "you", "now"],
+            speaker=["1", "1", "1", "2", "2", "2", "2"],
+        )
+
+    def test_artifacts_are_computed_once(self) -> None:
+        context = MetricContext()
+        calls = []
+        for _ in range(3):
+            value = context.get("key", lambda: calls.append(None) or len(calls))
+        self.assertEqual(value, 1)
+        self.assertEqual(len(calls), 1)
+
+    def test_word_error_metrics_share_alignment(self) -> None:
+        wer, wder = WordErrorRate(), WordDiarizationErrorRate()
+        expected = [
+            metric(reference=self.reference, hypothesis=self.hypothesis, detailed=True) for metric in [wer, wder]
+        ]
+
+        context = MetricContext()
+        results = [
+            metric(reference=self.reference, hypothesis=self.hypothesis, detailed=True, context=context)
+            for metric in [wer, wder]
+        ]
+        self.assertEqual(results, expected)
+        # Normalized reference and hypothesis words along with their alignment
+        self.assertEqual(len(context.artifacts), 3)
+
+    def test_word_error_metrics_pickle(self) -> None:
+        # Metrics are sent to worker processes, their normalizer caches are rebuilt empty on unpickling
+        for metric in [WordErrorRate(), WordDiarizationErrorRate()]:
+            expected = metric(reference=self.reference, hypothesis=self.hypothesis, detailed=True)
+            unpickled = pickle.loads(pickle.dumps(metric))
+            self.assertEqual(unpickled(reference=self.reference, hypothesis=self.hypothesis, detailed=True), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+# For licensing see accompanying LICENSE.md file.
+# Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
+
+import unittest
+
+from pyannote.core import Annotation, Segment, Timeline
+
+from openbench.metric import MetricContext, MetricOptions, MetricRegistry
+
+
+class TestMetricSweep(unittest.TestCase):
+    def setUp(self) -> None:
+        self.reference = Annotation()
+        self.reference[Segment(0, 4)] = "A"
+        self.reference[Segment(3, 8)] = "B"
+        self.hypothesis = Annotation()
+        self.hypothesis[Segment(0.2, 3.5)] = 0
+        self.hypothesis[Segment(3.5, 8.3)] = 1
+        self.uem = Timeline([Segment(0, 10)])
+
+    def test_without_sweep(self) -> None:
+        metrics = MetricRegistry.get_metric_variants(MetricOptions.DER, collar=0.0)
+        self.assertEqual(list(metrics), ["der"])
+
+    def test_variants_match_separate_metrics(self) -> None:
+        sweep = [{"collar": 0.0}, {"collar": 0.25}, {"collar": 0.25, "skip_overlap": True}]
+        metrics = MetricRegistry.get_metric_variants(
+            MetricOptions.DER, collar=0.0, skip_overlap=False, engine="frames", sweep=sweep
+        )
+        self.assertEqual(list(metrics), ["der[collar=0.0]", "der[collar=0.25]", "der[collar=0.25,skip_overlap=True]"])
+
+        context = MetricContext()
+        for metric in metrics.values():
+            metric(self.reference, self.hypothesis, uem=self.uem, context=context)
+        # The variants share the discretized annotations
+        self.assertEqual(len([key for key in context.artifacts if key[0] == "discretized_annotations"]), 1)
+
+        for overrides, metric in zip(sweep, metrics.values()):
+            expected = MetricRegistry.get_metric(
+                MetricOptions.DER, **{"collar": 0.0, "skip_overlap": False, "engine": "frames", **overrides}
+            )
+            expected(self.reference, self.hypothesis, uem=self.uem)
+            self.assertAlmostEqual(abs(metric), abs(expected))
+        self.assertNotAlmostEqual(abs(metrics["der[collar=0.0]"]), abs(metrics["der[collar=0.25]"]))
+
+    def test_pyannote_engine_shares_cropped_annotations(self) -> None:
+        sweep = [{"collar": 0.0}, {"collar": 0.25}]
+        metrics = list(MetricRegistry.get_metric_variants(MetricOptions.DER, sweep=sweep).values())
+        metrics += [
+            MetricRegistry.get_metric(MetricOptions.JER, collar=0.25),
+            MetricRegistry.get_metric(MetricOptions.DETECTION_ERROR_RATE, collar=0.25),
+        ]
+
+        context = MetricContext()
+        for metric in metrics:
+            expected = metric.compute_components(self.reference, self.hypothesis, uem=self.uem)
+            components = metric.compute_components(self.reference, self.hypothesis, uem=self.uem, context=context)
+            self.assertEqual(components, expected)
+        # One crop per collar, shared by the metrics with that collar
+        self.assertEqual(len([key for key in context.artifacts if key[0] == "uemified_annotations"]), 2)
+
+    def test_duplicate_variants(self) -> None:
+        with self.assertRaises(ValueError):
+            MetricRegistry.get_metric_variants(MetricOptions.JER, sweep=[{"collar": 0.25}, {"collar": 0.25}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+# For licensing see accompanying LICENSE.md file.
+# Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
+
+import random
+import unittest
+
+import numpy as np
+from annotation_test_utils import create_annotation
+from pyannote.core import Segment, Timeline
+
+from openbench.metric import TIME_RESOLVED, DiarizationErrorRate, MetricContext, StreamingLatency
+from openbench.pipeline_prediction import StreamingTranscript, Transcript
+
+
+RANDOM_SEED = 42
+WINDOW = 10.0
+
+
+class TestTimeResolvedDiarizationErrorRate(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = random.Random(RANDOM_SEED)
+        self.reference = create_annotation(rng, ["A", "B", "C"], 40)
+        self.hypothesis = create_annotation(rng, [0, 1, 2, 3], 40)
+        self.uem = Timeline([Segment(0, self.reference.get_timeline().extent().end)])
+
+    def test_windows_add_up_to_sample(self) -> None:
+        for collar, skip_overlap in [(0.0, False), (0.5, True)]:
+            metric = DiarizationErrorRate(collar=collar, skip_overlap=skip_overlap, engine="frames", window=WINDOW)
+            components = metric(self.reference, self.hypothesis, uem=self.uem, detailed=True)
+            window, windows = components[TIME_RESOLVED]
+            self.assertEqual(window, WINDOW)
+            num_windows = int(np.ceil(self.uem.extent().end / WINDOW))
+            for name in metric.components_:
+                self.assertEqual(len(windows[name]), num_windows)
+                self.assertAlmostEqual(windows[name].sum(), components[name], places=6)
+            # Only the scalar components are accumulated
+            self.assertNotIn(TIME_RESOLVED, metric.accumulated_)
+
+    def test_pyannote_engine(self) -> None:
+        components = DiarizationErrorRate(window=WINDOW)(self.reference, self.hypothesis, uem=self.uem, detailed=True)
+        _, windows = components[TIME_RESOLVED]
+        for name, values in windows.items():
+            self.assertAlmostEqual(values.sum(), components[name], delta=0.5)
+
+    def test_windows_share_frames(self) -> None:
+        context = MetricContext()
+        DiarizationErrorRate(engine="frames", window=WINDOW)(
+            self.reference, self.hypothesis, uem=self.uem, context=context
+        )
+        self.assertEqual(len(context.artifacts), 2)
+
+    def test_invalid_window(self) -> None:
+        with self.assertRaises(ValueError):
+            DiarizationErrorRate(window=0.0)
+
+
+class TestTimeResolvedStreamingLatency(unittest.TestCase):
+    def test_windows_add_up_to_sample(self) -> None:
+        words = ["the", "cat", "sat", "on", "the", "mat", "today"]
+        reference = Transcript.from_words_info(
+            words=words,
+            start=[0.5 * i for i in range(len(words))],
+            end=[0.5 * i + 0.4 for i in range(len(words))],
+        )
+        interim_results = ["the", "the cat", "the cat sat", "the cat sat on the", "the cat sat on the mat today"]
+        hypothesis = StreamingTranscript(
+            transcript=interim_results[-1],
+            audio_cursor=[1.0, 1.5, 2.0, 2.5, 4.0],
+            interim_results=interim_results,
+        )
+
+        components = StreamingLatency(window=2.0)(reference=reference, hypothesis=hypothesis, detailed=True)
+        window, windows = components.pop(TIME_RESOLVED)
+        self.assertEqual(components, StreamingLatency()(reference=reference, hypothesis=hypothesis, detailed=True))
+        self.assertEqual(window, 2.0)
+        for name in StreamingLatency.metric_components():
+            # Cursors 1.0 and 1.5 fall in the first window, 2.0 and 2.5 in the second and 4.0 in the third
+            self.assertEqual(len(windows[name]), 3)
+            self.assertAlmostEqual(windows[name].sum(), components[name])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+# For licensing see accompanying LICENSE.md file.
+# Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
+
+import random
+import unittest
+
+from openbench.metric.word_error_metrics.alignment import FastAlignmentBackend, JiwerAlignmentBackend
+
+
+RANDOM_SEED = 42
+VOCABULARY = ["a", "b", "c", "d", "e", "f"]
+
+
+class TestAlignmentBackends(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = random.Random(RANDOM_SEED)
+        self.pairs = []
+        for _ in range(200):
+            ref_words = [rng.choice(VOCABULARY) for _ in range(rng.randint(1, 30))]
+            hyp_words = [word if rng.random() < 0.7 else rng.choice(VOCABULARY) for word in ref_words]
+            hyp_words = [word for word in hyp_words if rng.random() > 0.1]
+            hyp_words += [rng.choice(VOCABULARY) for _ in range(rng.randint(0, 3))]
+            self.pairs.append((ref_words, hyp_words))
+        # Words that are empty or contain spaces are split as jiwer does
+        self.pairs.append((["a", "", "b  c", " d"], ["a b", "c"]))
+
+    def test_fast_backend_matches_jiwer(self) -> None:
+        reference_backend = JiwerAlignmentBackend()
+        fast_backend = FastAlignmentBackend()
+        expected = [reference_backend.align(ref_words, hyp_words) for ref_words, hyp_words in self.pairs]
+        self.assertEqual(fast_backend.align_batch(self.pairs), expected)
+
+    def test_empty_reference(self) -> None:
+        for backend in [JiwerAlignmentBackend(), FastAlignmentBackend()]:
+            with self.assertRaises(ValueError):
+                backend.align([], ["a"])
+
+
+if __name__ == "__main__":
+    unittest.main()
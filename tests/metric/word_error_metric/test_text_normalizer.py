@@ -1,9 +1,10 @@
 # For licensing see accompanying LICENSE.md file.
 # Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
 
+import re
 import unittest
 
-from openbench.metric.word_error_metrics.text_normalizer import EnglishTextNormalizer
+from openbench.metric.word_error_metrics.text_normalizer import EnglishTextNormalizer, get_english_text_normalizer
 
 
 class TestTextNormalizer(unittest.TestCase):
@@ -50,6 +51,49 @@ class TestTextNormalizer(unittest.TestCase):
                 f"With speakers: {words_with_speakers}",
             )
 
+    def test_single_pass_replace_matches_sequential_replace(self):
+        normalizer = EnglishTextNormalizer()
+        texts = [
+            "i can't believe y'all shoulda seen mr smith and dr jones",
+            "he'd been there and she's gone, they'd done it",
+            # Replacements creating new matches across their boundaries
+            "i'lln't go",
+            "he'd beent",
+            "mr.dr. st.john and gen.lt col",
+            "mrsr esq's",
+        ]
+        for text in texts:
+            expected = text
+            for pattern, replacement in normalizer.replacers.items():
+                expected = re.sub(pattern, replacement, expected)
+            self.assertEqual(normalizer.replace(text), expected, f"Replacements differ for input: {text}")
+
+    def test_batched_segments_match_per_segment_normalization(self):
+        normalizer = EnglishTextNormalizer(cache_size=0)
+        segments_list = [
+            ("twenty", "five dollars", "'s been there"),
+            # Symbols at turn boundaries are handled as at the start/end of a transcript
+            ("it costs $", "% of it", "5 %"),
+            # Brackets spanning turns and "and a half" fall back to one pass per turn
+            ("[laughs", "okay]", "two"),
+            ("and a half", "three and a half"),
+            ("hmm", "mr. smith", "(noise)"),
+        ]
+        for segments in segments_list:
+            expected = [normalizer.process_transcript(segment).split() for segment in segments]
+            self.assertEqual(normalizer.process_segments(segments), expected, f"Segments differ for: {segments}")
+
+    def test_shared_normalizer(self):
+        self.assertIs(get_english_text_normalizer(), get_english_text_normalizer(None))
+        self.assertIs(
+            get_english_text_normalizer({"colour": "color"}), get_english_text_normalizer({"colour": "color"})
+        )
+        self.assertIsNot(get_english_text_normalizer(), get_english_text_normalizer({"colour": "color"}))
+
+        normalizer = EnglishTextNormalizer(cache_size=None)
+        self.assertEqual(normalizer.process_transcript("The colour"), normalizer.process_transcript("The colour"))
+        self.assertEqual(normalizer._cached_process_transcript.cache_info().hits, 1)
+
 
 if __name__ == "__main__":
     unittest.main()
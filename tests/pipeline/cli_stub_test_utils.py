@@ -0,0 +1,50 @@
+# For licensing see accompanying LICENSE.md file.
+# Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
+
+"""Fixture shared by the tests of the pipelines running a stand-in CLI from `stubs`."""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import datasets
+import numpy as np
+
+
+SAMPLE_RATE = 16000
+NUM_SAMPLES = 3
+STUBS_DIR = Path(__file__).parent / "stubs"
+
+
+class CliStubTestCase(unittest.TestCase):
+    """Test case with a temporary directory holding the HuggingFace datasets cache and the CLI outputs.
+
+    `waveforms` are random waveforms of 1, 2, ... seconds at `SAMPLE_RATE`, from which subclasses build their
+    samples. Environment variables in `env` are set for the duration of each test.
+    """
+
+    env: dict[str, str] = {}
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.tmp_path = Path(self.tmp_dir.name)
+        for patcher in [
+            mock.patch.object(datasets.config, "HF_DATASETS_CACHE", str(self.tmp_path / "cache")),
+            mock.patch.dict(os.environ, self.env),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        rng = np.random.default_rng(0)
+        self.waveforms = [rng.uniform(-0.5, 0.5, SAMPLE_RATE * (i + 1)).astype(np.float32) for i in range(NUM_SAMPLES)]
+
+    def assertInvocations(self, log_path: str | Path, num_files: list[int]) -> None:
+        """Check the number of files of every CLI invocation, as appended by the stubs to `invocations.log`."""
+        self.assertEqual([int(line) for line in Path(log_path).read_text().split()], num_files)
+
+    def assertNoTempAudio(self, temp_audio_dir: str | Path) -> None:
+        """Check that the audio files saved for the CLI were all removed."""
+        self.assertEqual(list(Path(temp_audio_dir).iterdir()), [])
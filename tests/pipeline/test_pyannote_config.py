@@ -0,0 +1,40 @@
+# For licensing see accompanying LICENSE.md file.
+# Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
+
+import unittest
+from unittest import mock
+
+import torch
+from pydantic import ValidationError
+
+from openbench.pipeline.diarization.pyannote import pipeline as pyannote_pipeline
+from openbench.pipeline.diarization.pyannote.pipeline import PyAnnotePipelineConfig, set_torch_threads
+
+
+class TestPyAnnotePipelineConfig(unittest.TestCase):
+    def test_threads_split_across_cpu_workers(self) -> None:
+        with mock.patch("os.cpu_count", return_value=16):
+            config = PyAnnotePipelineConfig(device="cpu", num_worker_processes=8)
+            self.assertEqual(config.num_threads, 2)
+            # Explicit settings are kept
+            config = PyAnnotePipelineConfig(device="cpu", num_worker_processes=8, num_threads=4)
+            self.assertEqual(config.num_threads, 4)
+            # Sequential runs keep the torch default
+            self.assertIsNone(PyAnnotePipelineConfig(device="cpu").num_threads)
+
+    def test_quantization_requires_cpu(self) -> None:
+        self.assertTrue(PyAnnotePipelineConfig(device="cpu", quantize_embedding=True).quantize_embedding)
+        with self.assertRaises(ValidationError):
+            PyAnnotePipelineConfig(device="cuda", quantize_embedding=True)
+
+    def test_torch_threads_set_once_per_process(self) -> None:
+        num_threads = torch.get_num_threads()
+        with mock.patch.object(pyannote_pipeline, "_threads_set_pid", None):
+            with mock.patch("torch.set_num_threads") as set_num_threads:
+                set_torch_threads(num_threads, None)
+                set_torch_threads(num_threads, None)
+            set_num_threads.assert_called_once_with(num_threads)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+# For licensing see accompanying LICENSE.md file.
+# Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
+
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from cli_stub_test_utils import SAMPLE_RATE, STUBS_DIR, CliStubTestCase
+from pyannote.core import Annotation, Segment
+
+from openbench.dataset import DiarizationSample
+from openbench.pipeline.diarization.speakerkit import SpeakerKitPipeline, SpeakerKitPipelineConfig
+from openbench.pipeline_prediction import DiarizationAnnotation
+from openbench.runner.utils import change_directory
+
+
+STUB_CLI_PATH = STUBS_DIR / "speakerkit-cli"
+
+
+class TestSpeakerKitBatch(CliStubTestCase):
+    env = {"SPEAKERKIT_API_KEY": "key"}
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.samples = []
+        for i, waveform in enumerate(self.waveforms):
+            annotation = Annotation()
+            annotation[Segment(0, i + 1)] = "A"
+            self.samples.append(
+                DiarizationSample(
+                    audio_name=f"sample_{i}",
+                    waveform=waveform,
+                    sample_rate=SAMPLE_RATE,
+                    reference=DiarizationAnnotation.from_pyannote_annotation(annotation),
+                )
+            )
+
+    def run_pipeline(self, batch_mode: bool) -> list:
+        pipeline = SpeakerKitPipeline(SpeakerKitPipelineConfig(cli_path=str(STUB_CLI_PATH), batch_mode=batch_mode))
+        pipeline.prepare(self.samples)
+        return [pipeline(sample) for sample in self.samples]
+
+    def test_batch_mode(self) -> None:
+        with change_directory(self.tmp_path):
+            outputs = self.run_pipeline(batch_mode=True)
+
+            # All the samples are diarized by a single invocation loading the models once
+            self.assertInvocations("invocations.log", [3])
+            for i, output in enumerate(outputs):
+                self.assertEqual(output.prediction.num_speakers, 1)
+                self.assertAlmostEqual(output.prediction.timestamps_end[0], i + 1)
+                self.assertAlmostEqual(output.prediction_time, (i + 1) / 100)
+            self.assertNoTempAudio("audio_temp")
+
+    def test_batch_mode_without_timings(self) -> None:
+        with change_directory(self.tmp_path), mock.patch.dict("os.environ", {"SPEAKERKIT_STUB_NO_TIMINGS": "1"}):
+            outputs = self.run_pipeline(batch_mode=True)
+
+            # Files without a prediction time in the report are diarized again alone
+            self.assertInvocations("invocations.log", [3, 1, 1, 1])
+            for i, output in enumerate(outputs):
+                self.assertAlmostEqual(output.prediction.timestamps_end[0], i + 1)
+                self.assertAlmostEqual(output.prediction_time, (i + 1) / 100)
+            self.assertNoTempAudio("audio_temp")
+
+    def test_empty_batch(self) -> None:
+        with change_directory(self.tmp_path):
+            pipeline = SpeakerKitPipeline(SpeakerKitPipelineConfig(cli_path=str(STUB_CLI_PATH), batch_mode=True))
+            pipeline.prepare([])
+            self.assertFalse(Path("invocations.log").exists())
+
+    def test_batch_mode_matches_per_file_mode(self) -> None:
+        with change_directory(self.tmp_path / "batch"):
+            batch_outputs = self.run_pipeline(batch_mode=True)
+        with change_directory(self.tmp_path / "per_file"):
+            outputs = self.run_pipeline(batch_mode=False)
+            self.assertInvocations("invocations.log", [1, 1, 1])
+
+        for batch_output, output in zip(batch_outputs, outputs):
+            self.assertEqual(batch_output.prediction, output.prediction)
+            self.assertAlmostEqual(batch_output.prediction_time, output.prediction_time)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+# For licensing see accompanying LICENSE.md file.
+# Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
+
+import unittest
+from unittest import mock
+
+from cli_stub_test_utils import SAMPLE_RATE, STUBS_DIR, CliStubTestCase
+
+from openbench.dataset import TranscriptionSample
+from openbench.pipeline.transcription.whisperkit import WhisperKitTranscriptionConfig, WhisperKitTranscriptionPipeline
+from openbench.pipeline_prediction import Transcript
+from openbench.runner.utils import change_directory
+
+
+STUB_CLI_PATH = STUBS_DIR / "whisperkit-cli"
+
+
+class TestWhisperKitBatch(CliStubTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.samples = [
+            TranscriptionSample(
+                audio_name=f"sample_{i}",
+                waveform=waveform,
+                sample_rate=SAMPLE_RATE,
+                reference=Transcript.from_words_info(words=[f"sample_{i}"]),
+            )
+            for i, waveform in enumerate(self.waveforms)
+        ]
+
+    def create_pipeline(self, batch_mode: bool) -> WhisperKitTranscriptionPipeline:
+        config = WhisperKitTranscriptionConfig(
+            cli_path=str(STUB_CLI_PATH), batch_mode=batch_mode, report_path="report"
+        )
+        return WhisperKitTranscriptionPipeline(config)
+
+    def test_batch_mode(self) -> None:
+        with change_directory(self.tmp_path):
+            pipeline = self.create_pipeline(batch_mode=True)
+            pipeline.prepare(self.samples)
+            outputs = [pipeline(sample) for sample in self.samples]
+
+            # All the samples are transcribed by a single invocation loading the model once
+            self.assertInvocations("report/invocations.log", [3])
+            self.assertEqual(pipeline.engine.model_load_time, 2.0)
+            for i, (sample, output) in enumerate(zip(self.samples, outputs)):
+                self.assertEqual(output.prediction.get_words(), [sample.audio_name])
+                self.assertAlmostEqual(output.prediction_time, (i + 1) / 10)
+            self.assertNoTempAudio("temp_audio")
+
+    def test_batch_mode_without_timings(self) -> None:
+        with change_directory(self.tmp_path), mock.patch.dict("os.environ", {"WHISPERKIT_STUB_NO_TIMINGS": "1"}):
+            pipeline = self.create_pipeline(batch_mode=True)
+            pipeline.prepare(self.samples)
+            outputs = [pipeline(sample) for sample in self.samples]
+
+            # Files without a prediction time in their report are transcribed again alone and timed
+            self.assertInvocations("report/invocations.log", [3, 1, 1, 1])
+            for sample, output in zip(self.samples, outputs):
+                self.assertEqual(output.prediction.get_words(), [sample.audio_name])
+                self.assertGreater(output.prediction_time, 0.0)
+            self.assertNoTempAudio("temp_audio")
+
+    def test_per_file_mode(self) -> None:
+        with change_directory(self.tmp_path):
+            pipeline = self.create_pipeline(batch_mode=False)
+            pipeline.prepare(self.samples)
+            outputs = [pipeline(sample) for sample in self.samples]
+
+            self.assertInvocations("report/invocations.log", [1, 1, 1])
+            self.assertEqual(
+                [output.prediction.get_words() for output in outputs], [["sample_0"], ["sample_1"], ["sample_2"]]
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
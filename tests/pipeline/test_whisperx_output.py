@@ -0,0 +1,61 @@
+# For licensing see accompanying LICENSE.md file.
+# Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
+
+import unittest
+from unittest import mock
+
+from openbench.metric import WordDiarizationErrorRate
+from openbench.pipeline.orchestration import whisperx
+from openbench.pipeline.orchestration.whisperx import WhisperXPipeline, WhisperXPipelineConfig
+from openbench.pipeline_prediction import Transcript
+
+
+# Output of `whisperx.assign_word_speakers`, numerals are not aligned and "uh" is outside of any turn
+WHISPERX_OUTPUT = {
+    "segments": [
+        {
+            "speaker": "SPEAKER_00",
+            "words": [
+                {"word": "we", "start": 0.0, "end": 0.2, "speaker": "SPEAKER_00"},
+                {"word": "have", "start": 0.3, "end": 0.5, "speaker": "SPEAKER_00"},
+                {"word": "2"},
+                {"word": "cats", "start": 0.8, "end": 1.1, "speaker": "SPEAKER_00"},
+            ],
+        },
+        {
+            "words": [
+                {"word": "uh", "start": 1.5, "end": 1.6},
+                {"word": "me", "start": 2.0, "end": 2.2, "speaker": "SPEAKER_01"},
+                {"word": "too", "start": 2.3, "end": 2.5, "speaker": "SPEAKER_01"},
+            ],
+        },
+    ]
+}
+
+
+class TestWhisperXOutput(unittest.TestCase):
+    def setUp(self) -> None:
+        # Models are not needed to parse the output
+        with mock.patch.object(whisperx, "WhisperX"):
+            self.pipeline = WhisperXPipeline(WhisperXPipelineConfig())
+
+    def test_words_without_speaker(self) -> None:
+        prediction = self.pipeline.parse_output(WHISPERX_OUTPUT).prediction
+        self.assertEqual(prediction.get_words(), ["we", "have", "2", "cats", "uh", "me", "too"])
+        self.assertEqual(
+            prediction.get_speakers(),
+            ["SPEAKER_00", "SPEAKER_00", "SPEAKER_00", "SPEAKER_00", "SPEAKER_00", "SPEAKER_01", "SPEAKER_01"],
+        )
+        self.assertEqual((prediction.words[2].start, prediction.words[2].end), (None, None))
+
+    def test_word_diarization_error_rate(self) -> None:
+        prediction = self.pipeline.parse_output(WHISPERX_OUTPUT).prediction
+        reference = Transcript.from_words_info(
+            words=["we", "have", "two", "cats", "me", "too"],
+            speaker=["A", "A", "A", "A", "B", "B"],
+        )
+        self.assertEqual(WordDiarizationErrorRate()(reference=reference, hypothesis=prediction), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
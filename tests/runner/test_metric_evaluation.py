@@ -0,0 +1,148 @@
+# For licensing see accompanying LICENSE.md file.
+# Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
+
+import random
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Callable
+from unittest import mock
+
+import datasets
+import numpy as np
+import soundfile as sf
+from annotation_test_utils import create_annotation
+from pyannote.core import Segment, Timeline
+
+from openbench.dataset import TranscriptionDataset
+from openbench.metric import MetricOptions, MetricRegistry
+from openbench.pipeline.transcription.whisperkit import WhisperKitTranscriptionConfig, WhisperKitTranscriptionPipeline
+from openbench.pipeline_prediction import Transcript
+from openbench.runner import BenchmarkConfig, BenchmarkRunner, WandbConfig
+from openbench.runner.metric_evaluation import MetricEvaluationStage, accumulate_components, evaluate_metrics
+from openbench.runner.utils import change_directory
+
+
+RANDOM_SEED = 42
+SAMPLE_RATE = 16000
+WHISPERKIT_STUB_CLI_PATH = Path(__file__).parents[1] / "pipeline" / "stubs" / "whisperkit-cli"
+WORDS = ["hello", "there", "I", "can't", "hear", "you", "now", "the", "colour", "grey"]
+
+
+def get_diarization_metrics() -> dict:
+    return {
+        MetricOptions.DER.value: MetricRegistry.get_metric(MetricOptions.DER),
+        MetricOptions.JER.value: MetricRegistry.get_metric(MetricOptions.JER),
+        MetricOptions.SCER.value: MetricRegistry.get_metric(MetricOptions.SCER),
+    }
+
+
+def get_word_error_metrics() -> dict:
+    return {
+        MetricOptions.WER.value: MetricRegistry.get_metric(MetricOptions.WER),
+        MetricOptions.WDER.value: MetricRegistry.get_metric(MetricOptions.WDER),
+    }
+
+
+def create_transcript(rng: random.Random, speakers: list) -> Transcript:
+    num_words = rng.randint(3, 12)
+    return Transcript.from_words_info(
+        words=[rng.choice(WORDS) for _ in range(num_words)],
+        speaker=[rng.choice(speakers) for _ in range(num_words)],
+    )
+
+
+class TestMetricEvaluationStage(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = random.Random(RANDOM_SEED)
+        self.diarization_samples = []
+        for _ in range(8):
+            reference = create_annotation(rng, ["A", "B", "C"], rng.randint(3, 10))
+            hypothesis = create_annotation(rng, [0, 1], rng.randint(3, 10))
+            extra_info = {"uem": Timeline([Segment(0, 40)])}
+            self.diarization_samples.append((reference, hypothesis, extra_info))
+        self.transcription_samples = [
+            (create_transcript(rng, ["A", "B"]), create_transcript(rng, ["1", "2"]), {}) for _ in range(8)
+        ]
+
+    def check_matches_inline_evaluation(self, get_metrics: Callable[[], dict], samples: list) -> None:
+        inline_metrics = get_metrics()
+        inline_outputs = [
+            evaluate_metrics(inline_metrics, reference, hypothesis, extra_info)
+            for reference, hypothesis, extra_info in samples
+        ]
+
+        # Metrics are pickled to the spawned workers
+        metrics = get_metrics()
+        with MetricEvaluationStage(metrics, num_workers=2, max_pending=3) as stage:
+            for sample_id, (reference, hypothesis, extra_info) in enumerate(samples):
+                stage.submit(sample_id, reference, hypothesis, extra_info)
+            outputs = stage.collect()
+
+        self.assertEqual(sorted(outputs), list(range(len(samples))))
+        for sample_id in sorted(outputs):
+            self.assertEqual(outputs[sample_id], inline_outputs[sample_id])
+            for output in outputs[sample_id]:
+                accumulate_components(metrics[output.metric_name], output)
+
+        for name, metric in metrics.items():
+            self.assertEqual(metric.accumulated_, inline_metrics[name].accumulated_)
+            self.assertEqual(metric.results_, inline_metrics[name].results_)
+            self.assertEqual(abs(metric), abs(inline_metrics[name]))
+
+    def test_matches_inline_evaluation(self) -> None:
+        self.check_matches_inline_evaluation(get_diarization_metrics, self.diarization_samples)
+
+    def test_word_error_metrics_match_inline_evaluation(self) -> None:
+        self.check_matches_inline_evaluation(get_word_error_metrics, self.transcription_samples)
+
+
+class TestParallelTranscriptionRun(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.tmp_path = Path(self.tmp_dir.name)
+        patcher = mock.patch.object(datasets.config, "HF_DATASETS_CACHE", str(self.tmp_path / "cache"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        rng = np.random.default_rng(0)
+        audio_paths = []
+        for i in range(4):
+            audio_path = self.tmp_path / f"sample_{i}.wav"
+            sf.write(audio_path, rng.uniform(-0.5, 0.5, SAMPLE_RATE * (i + 1)).astype(np.float32), SAMPLE_RATE)
+            audio_paths.append(str(audio_path))
+        # The stub CLI transcribes every file as its name
+        ds = datasets.Dataset.from_dict(
+            {"audio": audio_paths, "transcript": [[Path(path).stem] for path in audio_paths]}
+        ).cast_column("audio", datasets.Audio())
+        self.dataset = TranscriptionDataset(ds)
+
+    def run_pipeline(self, num_metric_workers: int | None) -> list:
+        config = BenchmarkConfig(
+            wandb_config=WandbConfig(project_name="test", is_active=False),
+            metrics={MetricOptions.WER: {}},
+            datasets={},
+            num_metric_workers=num_metric_workers,
+        )
+        pipeline = WhisperKitTranscriptionPipeline(
+            WhisperKitTranscriptionConfig(
+                cli_path=str(WHISPERKIT_STUB_CLI_PATH), report_path="report", num_worker_processes=2
+            )
+        )
+        runner = BenchmarkRunner(config, [pipeline])
+        return runner._run_pipeline_on_dataset_parallel(pipeline, self.dataset, "dataset")
+
+    def test_word_error_rate_with_metric_workers(self) -> None:
+        for num_metric_workers in [None, 2]:
+            with change_directory(self.tmp_path / f"metric_workers_{num_metric_workers}"):
+                _, task_results, global_results = self.run_pipeline(num_metric_workers)
+
+            self.assertEqual([task_result.sample_id for task_result in task_results], [0, 1, 2, 3])
+            self.assertEqual([task_result.result for task_result in task_results], [0.0] * 4)
+            self.assertEqual([global_result.metric_name for global_result in global_results], ["wer"])
+            self.assertEqual(global_results[0].global_result, 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+# For licensing see accompanying LICENSE.md file.
+# Copyright (C) 2025 Argmax, Inc. All Rights Reserved.
+
+import unittest
+
+from openbench.runner.data_models import GlobalResult
+from openbench.runner.wandb_logger import DiarizationWandbLogger
+
+
+def create_global_result(metric_name: str, global_result: float) -> GlobalResult:
+    return GlobalResult(
+        dataset_name="dataset",
+        pipeline_name="pipeline",
+        metric_name=metric_name,
+        global_result=global_result,
+        detailed_result={"false alarm": 1.0, "missed detection": 2.0, "confusion": 3.0, "total": 20.0},
+        avg_result=global_result,
+        upper_bound=None,
+        lower_bound=None,
+    )
+
+
+class TestDiarizationWandbLogger(unittest.TestCase):
+    def setUp(self) -> None:
+        self.logger = DiarizationWandbLogger()
+
+    def test_der_components_of_sweep(self) -> None:
+        global_results = [
+            create_global_result("der[collar=0.0]", 0.3),
+            create_global_result("der[collar=0.25]", 0.2),
+            create_global_result("jer", 0.4),
+            create_global_result("derivative", 0.5),
+        ]
+        table = self.logger.get_der_components(global_results)["dataset/der_breakdown_table"]
+        df = table.get_dataframe()
+        self.assertEqual(df["metric_name"].tolist(), ["der[collar=0.0]", "der[collar=0.25]"])
+        self.assertEqual(df["der"].tolist(), [0.3, 0.2])
+        self.assertEqual(df["confusion_rate"].tolist(), [0.15, 0.15])
+
+    def test_der_components(self) -> None:
+        table = self.logger.get_der_components([create_global_result("der", 0.3)])["dataset/der_breakdown_table"]
+        self.assertEqual(table.get_dataframe()["metric_name"].tolist(), ["der"])
+
+    def test_duplicate_der_results(self) -> None:
+        with self.assertRaises(ValueError):
+            self.logger.get_der_components([create_global_result("der", 0.3), create_global_result("der", 0.2)])
+
+
+if __name__ == "__main__":
+    unittest.main()